@@ -72,7 +72,7 @@ async def get_specific_account_overview(account_id: int, db: Session = Depends(g
         
         # Calculate positions value for this specific account
         from services.asset_calculator import calc_positions_value
-        positions_value = float(calc_positions_value(db, account.id) or 0.0)
+        positions_value = float(calc_positions_value(db, account.id, allow_stale=True) or 0.0)
         
         # Count positions and pending orders for this account
         positions_count = db.query(Position).filter(
@@ -118,7 +118,7 @@ async def get_account_overview(db: Session = Depends(get_db)):
         
         # Calculate positions value
         from services.asset_calculator import calc_positions_value
-        positions_value = float(calc_positions_value(db, account.id) or 0.0)
+        positions_value = float(calc_positions_value(db, account.id, allow_stale=True) or 0.0)
         
         # Count positions and pending orders
         positions_count = db.query(Position).filter(
@@ -342,12 +342,12 @@ async def get_asset_curve_by_timeframe(
             } for account in accounts]
         
         # Fetch kline data for all symbols (20 points)
-        from services.market_data import get_kline_data
+        from services.market_data import get_kline_data_async
         
         symbol_klines = {}
         for symbol, market in unique_symbols:
             try:
-                klines = get_kline_data(symbol, market, period, 20)
+                klines = await get_kline_data_async(symbol, market, period, 20)
                 if klines:
                     symbol_klines[(symbol, market)] = klines
                     logger.info(f"Fetched {len(klines)} klines for {symbol}.{market}")
@@ -432,7 +432,7 @@ async def get_asset_curve_by_timeframe(
                 # For the last timestamp, use actual Position table data
                 if is_last_timestamp:
                     from services.asset_calculator import calc_positions_market_value
-                    positions_value = calc_positions_market_value(db, account.id)
+                    positions_value = calc_positions_market_value(db, account.id, allow_stale=True)
                 else:
                     # For historical points, reconstruct from trades
                     for (symbol, market), quantity in position_quantities.items():
@@ -5,7 +5,7 @@ from fastapi import APIRouter, HTTPException
 from typing import List, Dict, Any
 import logging
 
-from services.market_data import get_all_symbols, get_last_price, get_market_status
+from services.market_data import get_all_symbols, get_last_price_with_age_async, get_last_prices_async, get_market_status
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/crypto", tags=["crypto"])
@@ -26,11 +26,12 @@ async def get_crypto_symbols() -> List[str]:
 async def get_crypto_price(symbol: str) -> Dict[str, Any]:
     """Get current price for a crypto symbol"""
     try:
-        price = get_last_price(symbol, "CRYPTO")
+        price, age = await get_last_price_with_age_async(symbol, "CRYPTO")
         return {
             "symbol": symbol,
             "price": price,
-            "market": "CRYPTO"
+            "market": "CRYPTO",
+            "age_seconds": round(age, 3)
         }
     except Exception as e:
         logger.error(f"Error getting price for {symbol}: {e}")
@@ -53,18 +54,19 @@ async def get_popular_cryptos() -> List[Dict[str, Any]]:
     """Get popular crypto trading pairs with current prices"""
     popular_symbols = ["BTC", "ETH", "SOL", "DOGE", "BNB", "XRP"]
     
+    prices = await get_last_prices_async(popular_symbols, "CRYPTO", allow_stale=True)
+
     results = []
     for symbol in popular_symbols:
-        try:
-            price = get_last_price(symbol, "CRYPTO")
-            results.append({
-                "symbol": symbol,
-                "name": symbol.split("/")[0],  # Extract base currency
-                "price": price,
-                "market": "CRYPTO"
-            })
-        except Exception as e:
-            logger.warning(f"Could not get price for {symbol}: {e}")
+        price = prices.get(symbol)
+        if price is None:
+            logger.warning(f"Could not get price for {symbol}")
             continue
+        results.append({
+            "symbol": symbol,
+            "name": symbol.split("/")[0],  # Extract base currency
+            "price": price,
+            "market": "CRYPTO"
+        })
     
     return results
\ No newline at end of file
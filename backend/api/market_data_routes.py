@@ -7,13 +7,25 @@ from fastapi import APIRouter, HTTPException
 from typing import List, Dict, Any, Optional
 from pydantic import BaseModel
 import logging
+import time
 
-from services.market_data import get_last_price, get_kline_data, get_market_status
+from services.market_data import get_last_price_async, get_last_price_with_age_async, get_last_prices_async, get_kline_data_async, get_market_status, get_tickers_async
+from services.circuit_breaker import get_circuit_breaker_states
+from services.kline_ingestion import get_kline_ingestion_status
+from services.kline_rollup import get_kline_rollup_stats
+from services.rate_limiter import get_rate_limiter_stats
+from services.shared_price_table import get_shared_price_table_status
+from services.tick_buffer import get_recent_ticks
+from services.tick_log import TickLogReader, tick_log
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/market", tags=["market_data"])
 
+# Tick log audits scan whole days of memory-mapped records, ranges are capped
+TICK_LOG_DEFAULT_RANGE_SECONDS = 3600
+TICK_LOG_MAX_RANGE_SECONDS = 86400
+
 
 class PriceResponse(BaseModel):
     """Price response model"""
@@ -23,6 +35,31 @@ class PriceResponse(BaseModel):
     timestamp: int
 
 
+class TickerResponse(BaseModel):
+    """Full ticker response model, fields the exchange does not report are null"""
+    symbol: str
+    last: float
+    bid: Optional[float] = None
+    ask: Optional[float] = None
+    spread: Optional[float] = None
+    mark: Optional[float] = None
+    index: Optional[float] = None
+    volume_24h: Optional[float] = None
+    change_24h_percent: Optional[float] = None
+    funding_rate: Optional[float] = None
+    open_interest: Optional[float] = None
+    timestamp: Optional[float] = None
+
+
+class TickHistoryResponse(BaseModel):
+    """Recent tick history model, timestamps in seconds, oldest first"""
+    symbol: str
+    market: str
+    count: int
+    timestamps: List[float]
+    prices: List[float]
+
+
 class KlineItem(BaseModel):
     """K-line data item model"""
     timestamp: int
@@ -68,14 +105,14 @@ async def get_crypto_price(symbol: str, market: str = "US"):
         Response containing latest price
     """
     try:
-        price = get_last_price(symbol, market)
+        price, age = await get_last_price_with_age_async(symbol, market)
         
         import time
         return PriceResponse(
             symbol=symbol,
             market=market,
             price=price,
-            timestamp=int(time.time() * 1000)
+            timestamp=int((time.time() - age) * 1000)  # When the price was observed
         )
     except Exception as e:
         logger.error(f"Failed to get crypto price: {e}")
@@ -103,18 +140,20 @@ async def get_multiple_prices(symbols: str, market: str = "hyperliquid"):
         import time
         current_timestamp = int(time.time() * 1000)
         
+        # One bulk upstream request for all uncached symbols
+        prices = await get_last_prices_async(symbol_list, market, allow_stale=True)
         for symbol in symbol_list:
-            try:
-                price = get_last_price(symbol, market)
-                results.append(PriceResponse(
-                    symbol=symbol,
-                    market=market,
-                    price=price,
-                    timestamp=current_timestamp
-                ))
-            except Exception as e:
-                logger.warning(f"Failed to get {symbol} price: {e}")
+            price = prices.get(symbol)
+            if price is None:
                 # Continue processing other cryptos without interrupting the entire request
+                logger.warning(f"Failed to get {symbol} price")
+                continue
+            results.append(PriceResponse(
+                symbol=symbol,
+                market=market,
+                price=price,
+                timestamp=current_timestamp
+            ))
                 
         return results
     except HTTPException:
@@ -124,6 +163,107 @@ async def get_multiple_prices(symbols: str, market: str = "hyperliquid"):
         raise HTTPException(status_code=500, detail=f"Failed to batch get crypto prices: {str(e)}")
 
 
+@router.get("/tickers", response_model=List[TickerResponse])
+async def get_multiple_tickers(symbols: str, market: str = "CRYPTO"):
+    """
+    Get full tickers (bid/ask/mark/volume/funding) for multiple cryptos in batch
+
+    Returns:
+        Response list containing one ticker per available symbol
+    """
+    try:
+        symbol_list = [s.strip() for s in symbols.split(',') if s.strip()]
+
+        if not symbol_list:
+            raise HTTPException(status_code=400, detail="crypto symbol list cannot be empty")
+
+        if len(symbol_list) > 20:
+            raise HTTPException(status_code=400, detail="Maximum 20 crypto symbols supported")
+
+        # Cached tickers are served as-is, misses share one bulk upstream request
+        tickers = await get_tickers_async(symbol_list, market)
+        missing = [s for s in symbol_list if s not in tickers]
+        if missing:
+            logger.warning(f"Failed to get tickers for {missing}")
+
+        return [TickerResponse(**tickers[s].to_dict()) for s in symbol_list if s in tickers]
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to batch get crypto tickers: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to batch get crypto tickers: {str(e)}")
+
+
+@router.get("/ticks/{symbol}", response_model=TickHistoryResponse)
+async def get_recent_crypto_ticks(symbol: str, market: str = "CRYPTO", limit: int = 500,
+                                  since: Optional[float] = None):
+    """
+    Get recent prices observed by the market data layer, served from memory
+
+    Args:
+        limit: Maximum number of ticks, newest kept
+        since: Only ticks at or after this time (seconds)
+
+    Returns:
+        Columnar tick history, empty when the symbol has not been priced yet
+    """
+    if limit <= 0:
+        raise HTTPException(status_code=400, detail="limit must be positive")
+
+    timestamps, prices = get_recent_ticks(symbol, market, limit, since)
+    return TickHistoryResponse(
+        symbol=symbol,
+        market=market,
+        count=len(prices),
+        timestamps=timestamps.tolist(),
+        prices=prices.tolist(),
+    )
+
+
+@router.get("/tick-log/{symbol}")
+def get_logged_crypto_ticks(symbol: str, market: str = "CRYPTO", start: Optional[float] = None,
+                            end: Optional[float] = None, at: Optional[float] = None, limit: int = 1000):
+    """
+    Audit prices from the on-disk tick log
+
+    A sync route, FastAPI runs it in the threadpool so the flush and the
+    memory-mapped scans never block the event loop.
+
+    Args:
+        start: Only ticks at or after this time (seconds), defaults to an hour before end
+        end: Only ticks before this time (seconds), defaults to now
+        at: Instead of a range, return the last price observed at or before this time
+        limit: Maximum number of ticks returned from a range, earliest kept
+
+    Returns:
+        The price in effect at `at`, or the logged ticks in the range
+    """
+    tick_log.flush()
+    reader = TickLogReader(tick_log.directory)
+
+    if at is not None:
+        observed = reader.price_at(symbol, market, at, lookback=TICK_LOG_MAX_RANGE_SECONDS)
+        if observed is None:
+            raise HTTPException(status_code=404, detail=f"No logged price for {symbol}.{market} at or before {at}")
+        return {"symbol": symbol, "market": market, "at": at, "timestamp": observed[0], "price": observed[1]}
+
+    if limit <= 0:
+        raise HTTPException(status_code=400, detail="limit must be positive")
+    if end is None:
+        end = time.time()
+    if start is None:
+        start = end - TICK_LOG_DEFAULT_RANGE_SECONDS
+    if not 0 < end - start <= TICK_LOG_MAX_RANGE_SECONDS:
+        raise HTTPException(status_code=400,
+                            detail=f"start must be before end and at most {TICK_LOG_MAX_RANGE_SECONDS}s earlier")
+    ticks = []
+    for timestamp, _, _, price in reader.iter_ticks(start, end, [symbol], market):
+        ticks.append({"timestamp": timestamp, "price": price})
+        if len(ticks) >= limit:
+            break
+    return {"symbol": symbol, "market": market, "start": start, "end": end, "count": len(ticks), "ticks": ticks}
+
+
 @router.get("/kline/{symbol}", response_model=KlineResponse)
 async def get_crypto_kline(
     symbol: str, 
@@ -156,7 +296,7 @@ async def get_crypto_kline(
             raise HTTPException(status_code=400, detail="Data count must be between 1-500")
         
         # Get K-line data
-        kline_data = get_kline_data(symbol, market, period, count)
+        kline_data = await get_kline_data_async(symbol, market, period, count)
         
         # Convert data format
         kline_items = []
@@ -225,7 +365,7 @@ async def market_data_health():
     """
     try:
         # Test getting a price to check if service is running normally
-        test_price = get_last_price("MSFT", "US")
+        test_price = await get_last_price_async("MSFT", "US")
         
         import time
         return {
@@ -244,4 +384,58 @@ async def market_data_health():
             "timestamp": int(time.time() * 1000),
             "error": str(e),
             "message": "Market data service abnormal"
-        }
\ No newline at end of file
+        }
+
+@router.get("/rate-limit")
+async def get_upstream_rate_limit():
+    """
+    Upstream rate limiter state
+
+    Returns:
+        Token bucket level plus queue depth and wait times per priority class
+    """
+    return get_rate_limiter_stats()
+
+
+@router.get("/circuit-breakers")
+async def get_circuit_breakers():
+    """
+    Circuit breaker state for upstream symbols and endpoints
+
+    Returns:
+        Per-breaker state (closed/open/half_open), failures, next probe time and last error
+    """
+    return get_circuit_breaker_states()
+
+
+@router.get("/shared-price-table")
+async def get_shared_price_table():
+    """
+    Shared price table state for multi-worker deployments
+
+    Returns:
+        Whether this worker is the leader feeding prices and how many symbols are published
+    """
+    return get_shared_price_table_status()
+
+
+@router.get("/kline-rollup")
+async def get_kline_rollup():
+    """
+    Candle rollup state
+
+    Returns:
+        Rolled-up periods, tracked symbols, buffered 1m candles and requests served locally
+    """
+    return get_kline_rollup_stats()
+
+
+@router.get("/kline-ingestion")
+async def get_kline_ingestion():
+    """
+    Scheduled kline ingestion state
+
+    Returns:
+        Ingested periods, symbols with a watermark and the outcome of the last run
+    """
+    return get_kline_ingestion_status()
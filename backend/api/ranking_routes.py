@@ -2,19 +2,34 @@
 Ranking API routes for factor-based crypto rankings
 """
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import List, Optional
+import numpy as np
 import pandas as pd
 import requests
-from datetime import datetime, timedelta
+from datetime import datetime, time, timedelta, timezone
 
 from database.connection import get_db
-from database.models import CryptoKline
+from repositories.kline_column_repo import kline_columns
 from factors import compute_all_factors, compute_selected_factors, list_factors
 
 router = APIRouter(prefix="/api/ranking", tags=["ranking"])
 
 
+def _day_range(start_date, end_date):
+    """Kline timestamp range [start_date, end_date) in UTC seconds"""
+    start_ts = int(datetime.combine(start_date, time.min, tzinfo=timezone.utc).timestamp())
+    end_ts = int(datetime.combine(end_date, time.min, tzinfo=timezone.utc).timestamp())
+    return start_ts, end_ts
+
+
+async def _ensure_columns_loaded(db: Session, period: str):
+    """Seed the columnar store from the crypto_klines table the first time a period is read"""
+    if not kline_columns.is_imported(period):
+        await run_in_threadpool(kline_columns.ensure_imported, db, period)
+
+
 @router.get("/factors")
 async def get_available_factors():
     """Get list of available factors"""
@@ -59,47 +74,33 @@ async def get_ranking_table(
     # Calculate date range
     end_date = datetime.now().date()
     start_date = end_date - timedelta(days=days)
-    
-    # Query K-line data for the specified period
-    kline_query = db.query(CryptoKline).filter(
-        CryptoKline.period == "1d",
-        CryptoKline.datetime_str >= start_date.strftime("%Y-%m-%d"),
-        CryptoKline.datetime_str <= end_date.strftime("%Y-%m-%d")
-    ).order_by(CryptoKline.symbol, CryptoKline.timestamp)
-    
-    kline_data = kline_query.all()
-    
-    if not kline_data:
+    start_ts, end_ts = _day_range(start_date, end_date)
+
+    # Read daily candles from the columnar store, seeded from the database once
+    await _ensure_columns_loaded(db, "1d")
+    symbols = kline_columns.symbols("1d", start_ts, end_ts)
+
+    if not symbols:
         return {
             "success": True,
             "data": [],
             "message": "No K-line data found for the specified period"
         }
-    
-    # Group data by symbol
-    history = {}
-    for kline in kline_data:
-        symbol = kline.symbol
-        if symbol not in history:
-            history[symbol] = []
-        
-        history[symbol].append({
-            "Date": kline.datetime_str,
-            "Open": float(kline.open_price) if kline.open_price else 0,
-            "High": float(kline.high_price) if kline.high_price else 0,
-            "Low": float(kline.low_price) if kline.low_price else 0,
-            "Close": float(kline.close_price) if kline.close_price else 0,
-            "Volume": float(kline.volume) if kline.volume else 0,
-            "Amount": float(kline.amount) if kline.amount else 0,
-        })
-    
-    # Convert to DataFrames
+
+    # Build DataFrames straight from the column arrays
     history_dfs = {}
-    for symbol, data in history.items():
-        if len(data) >= 10:  # Minimum data requirement
-            df = pd.DataFrame(data)
-            df["Date"] = pd.to_datetime(df["Date"], format='mixed')
-            history_dfs[symbol] = df.sort_values("Date")
+    for symbol in symbols:
+        candles = kline_columns.read_range(symbol, "1d", start_ts, end_ts)
+        if candles.size >= 10:  # Minimum data requirement
+            history_dfs[symbol] = pd.DataFrame({
+                "Date": pd.to_datetime(candles.timestamp, unit="s"),
+                "Open": np.nan_to_num(candles.open),
+                "High": np.nan_to_num(candles.high),
+                "Low": np.nan_to_num(candles.low),
+                "Close": np.nan_to_num(candles.close),
+                "Volume": np.nan_to_num(candles.volume),
+                "Amount": np.nan_to_num(candles.amount),
+            })
     
     if not history_dfs:
         return {
@@ -156,15 +157,11 @@ async def get_available_symbols(
     """Get list of symbols with sufficient K-line data"""
     end_date = datetime.now().date()
     start_date = end_date - timedelta(days=days)
-    
-    # Query symbols with data in the specified period
-    symbols_query = db.query(CryptoKline.symbol).filter(
-        CryptoKline.period == "1d",
-        CryptoKline.datetime_str >= start_date.strftime("%Y-%m-%d"),
-        CryptoKline.datetime_str <= end_date.strftime("%Y-%m-%d")
-    ).distinct()
-    
-    symbols = [row.symbol for row in symbols_query.all()]
+    start_ts, end_ts = _day_range(start_date, end_date)
+
+    # Symbols with data in the specified period, answered from the columnar store index
+    await _ensure_columns_loaded(db, "1d")
+    symbols = kline_columns.symbols("1d", start_ts, end_ts)
     
     return {
         "success": True,
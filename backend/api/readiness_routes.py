@@ -0,0 +1,20 @@
+"""
+Readiness API routes
+"""
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from services.readiness import get_readiness_status
+
+router = APIRouter(prefix="/api", tags=["readiness"])
+
+
+@router.get("/ready")
+async def get_ready():
+    """
+    Market data readiness with per-symbol prefetch status
+
+    Returns 200 once all trading symbols have prices, 503 until then.
+    """
+    status = get_readiness_status()
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
@@ -1,6 +1,7 @@
 from fastapi import WebSocket, WebSocketDisconnect
 from sqlalchemy.orm import Session
-from typing import Dict, Set
+from typing import Dict, Optional, Set, Tuple
+import asyncio
 import json
 
 from database.connection import SessionLocal
@@ -9,7 +10,7 @@ from repositories.account_repo import get_or_create_default_account, get_account
 from repositories.order_repo import list_orders
 from repositories.position_repo import list_positions
 from services.asset_calculator import calc_positions_value, calc_positions_market_value
-from services.market_data import get_last_price
+from services.market_data import get_last_prices_async
 from services.scheduler import add_account_snapshot_job, remove_account_snapshot_job
 from database.models import Trade, User, Account, CryptoPrice, AIDecisionLog
 from sqlalchemy import func
@@ -76,9 +77,8 @@ manager = ConnectionManager()
 
 async def broadcast_asset_curve_update(timeframe: str = "1h"):
     """Broadcast asset curve updates to all connected clients"""
-    db = SessionLocal()
     try:
-        asset_curves = get_all_asset_curves_data(db, timeframe)
+        asset_curves = await _get_asset_curves_async(timeframe)
         await manager.broadcast_to_all({
             "type": "asset_curve_update",
             "timeframe": timeframe,
@@ -86,8 +86,6 @@ async def broadcast_asset_curve_update(timeframe: str = "1h"):
         })
     except Exception as e:
         logging.error(f"Failed to broadcast asset curve update: {e}")
-    finally:
-        db.close()
 
 
 def get_all_asset_curves_data(db: Session, timeframe: str = "1h"):
@@ -104,6 +102,55 @@ def get_all_asset_curves_data(db: Session, timeframe: str = "1h"):
 manager = ConnectionManager()
 
 
+def _get_asset_curves(timeframe: str):
+    # Runs in a worker thread, Sessions are not shared across threads
+    db = SessionLocal()
+    try:
+        return get_all_asset_curves_data(db, timeframe)
+    finally:
+        db.close()
+
+
+async def _get_asset_curves_async(timeframe: str = "1h"):
+    """Build asset curves in a worker thread, kline fetching is blocking I/O"""
+    return await asyncio.to_thread(_get_asset_curves, timeframe)
+
+
+def _value_positions(account_id: int) -> Tuple[float, float]:
+    # Runs in a worker thread, symbols the warm-up missed fall back to a blocking lookup
+    db = SessionLocal()
+    try:
+        return (calc_positions_market_value(db, account_id, allow_stale=True),
+                calc_positions_value(db, account_id, allow_stale=True))
+    finally:
+        db.close()
+
+
+async def _value_positions_async(account_id: int) -> Tuple[float, float]:
+    """(market value, notional value) of an account's positions, computed off the event loop"""
+    return await asyncio.to_thread(_value_positions, account_id)
+
+
+async def _get_position_prices(positions) -> Tuple[Dict[Tuple[str, str], float], Optional[str]]:
+    """Fetch display prices for positions with one bulk request per market, stale entries allowed"""
+    symbols_by_market: Dict[str, Set[str]] = {}
+    for p in positions:
+        symbols_by_market.setdefault(p.market, set()).add(p.symbol)
+
+    prices = {}
+    price_error_message = None
+    for market, symbols in symbols_by_market.items():
+        try:
+            for symbol, price in (await get_last_prices_async(list(symbols), market, allow_stale=True)).items():
+                prices[(symbol, market)] = price
+        except Exception as e:
+            # Collect price retrieval error messages, especially cookie-related errors
+            error_msg = str(e)
+            if "cookie" in error_msg.lower() and price_error_message is None:
+                price_error_message = error_msg
+    return prices, price_error_message
+
+
 async def _send_snapshot_optimized(db: Session, account_id: int):
     """Optimized version of snapshot that reduces expensive operations"""
     account = get_account(db, account_id)
@@ -119,9 +166,11 @@ async def _send_snapshot_optimized(db: Session, account_id: int):
         db.query(AIDecisionLog).filter(AIDecisionLog.account_id == account_id).order_by(AIDecisionLog.decision_time.desc()).limit(10).all()  # Reduced from 20 to 10
     )
     
+    # Warm the price cache with one bulk request so the valuations below are served from memory
+    price_cache, price_error_message = await _get_position_prices(positions)
+
     # Calculate positions MARKET VALUE (equity) and NOTIONAL VALUE (exposure)
-    positions_market_value = calc_positions_market_value(db, account_id)
-    positions_notional_value = calc_positions_value(db, account_id)
+    positions_market_value, positions_notional_value = await _value_positions_async(account_id)
 
     # Total assets = cash + market value (NOT notional!)
     total_assets = positions_market_value + float(account.current_cash)
@@ -147,22 +196,6 @@ async def _send_snapshot_optimized(db: Session, account_id: int):
     
     # Optimize position enrichment - batch price fetching
     enriched_positions = []
-    price_error_message = None
-    
-    # Group positions by symbol to reduce API calls
-    unique_symbols = set((p.symbol, p.market) for p in positions)
-    price_cache = {}
-    
-    # Fetch all unique prices in one go
-    for symbol, market in unique_symbols:
-        try:
-            price = get_last_price(symbol, market)
-            price_cache[(symbol, market)] = price
-        except Exception as e:
-            price_cache[(symbol, market)] = None
-            error_msg = str(e)
-            if "cookie" in error_msg.lower() and price_error_message is None:
-                price_error_message = error_msg
 
     for p in positions:
         price = price_cache.get((p.symbol, p.market))
@@ -244,7 +277,7 @@ async def _send_snapshot_optimized(db: Session, account_id: int):
     current_second = int(datetime.now().timestamp()) % 60
     if current_second < 10:  # First 10 seconds of each minute
         try:
-            response_data["all_asset_curves"] = get_all_asset_curves_data(db, "1h")
+            response_data["all_asset_curves"] = await _get_asset_curves_async("1h")
             response_data["type"] = "snapshot_full"  # Indicate this includes full data
         except Exception as e:
             logger.error(f"Failed to get asset curves: {e}")
@@ -271,9 +304,11 @@ async def _send_snapshot(db: Session, account_id: int):
         db.query(AIDecisionLog).filter(AIDecisionLog.account_id == account_id).order_by(AIDecisionLog.decision_time.desc()).limit(20).all()
     )
     
+    # Warm the price cache with one bulk request so the valuations below are served from memory
+    price_cache, price_error_message = await _get_position_prices(positions)
+
     # Calculate positions MARKET VALUE (equity) and NOTIONAL VALUE (exposure)
-    positions_market_value = calc_positions_market_value(db, account_id)
-    positions_notional_value = calc_positions_value(db, account_id)
+    positions_market_value, positions_notional_value = await _value_positions_async(account_id)
 
     # Total assets = cash + market value (NOT notional!)
     total_assets = positions_market_value + float(account.current_cash)
@@ -298,18 +333,9 @@ async def _send_snapshot(db: Session, account_id: int):
     }
     # enrich positions with latest price and market value
     enriched_positions = []
-    price_error_message = None
 
     for p in positions:
-        try:
-            price = get_last_price(p.symbol, p.market)
-        except Exception as e:
-            price = None
-            # Collect price retrieval error messages, especially cookie-related errors
-            error_msg = str(e)
-            if "cookie" in error_msg.lower() and price_error_message is None:
-                price_error_message = error_msg
-
+        price = price_cache.get((p.symbol, p.market))
         enriched_positions.append({
             "id": p.id,
             "account_id": p.account_id,
@@ -380,7 +406,7 @@ async def _send_snapshot(db: Session, account_id: int):
             }
             for d in ai_decisions
         ],
-        "all_asset_curves": get_all_asset_curves_data(db, "1h"),
+        "all_asset_curves": await _get_asset_curves_async("1h"),
     }
 
     if price_error_message:
@@ -537,7 +563,7 @@ async def websocket_endpoint(websocket: WebSocket):
                         await websocket.send_text(json.dumps({"type": "error", "message": "Invalid timeframe. Must be 5m, 1h, or 1d"}))
                         continue
                     
-                    asset_curves = get_all_asset_curves_data(db, timeframe)
+                    asset_curves = await _get_asset_curves_async(timeframe)
                     await websocket.send_text(json.dumps({
                         "type": "asset_curve_data",
                         "timeframe": timeframe,
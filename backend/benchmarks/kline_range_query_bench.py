@@ -0,0 +1,172 @@
+"""
+Kline range query benchmark
+Compares the old ranking queries (datetime_str string bounds, no supporting
+index) with the integer timestamp range queries of KlineRepository on the
+(period, market, timestamp, symbol) index, on a scratch SQLite database of
+mostly 1m candles plus a year of daily candles per symbol
+
+Also checks the query plans and exits non-zero when the range queries do not
+use the index, --check runs only that on a small table.
+
+Usage (from backend/):
+    python -m benchmarks.kline_range_query_bench --rows 20000000
+    python -m benchmarks.kline_range_query_bench --check
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.orm import sessionmaker
+
+from database.models import CryptoKline
+from repositories.kline_repo import KlineRepository, _range_filter
+
+INDEX_NAME = "ix_crypto_klines_period_market_timestamp"
+MARKET = "CRYPTO"
+DAY = 86400
+END = 1_760_000_000 - 1_760_000_000 % DAY
+DAYS = 365
+RANKING_DAYS = 100
+BATCH = 200_000
+
+
+def _rows(symbols: int, minute_rows: int):
+    """Daily candles for DAYS days, then 1m candles up to minute_rows, per symbol"""
+    minutes = max(minute_rows // symbols, 1)
+    for s in range(symbols):
+        symbol = f"SYM{s:04d}"
+        for d in range(DAYS):
+            ts = END - (DAYS - d) * DAY
+            yield (symbol, MARKET, "1d", ts, datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%d %H:%M:%S"),
+                   100.0 + d, 101.0 + d, 99.0 + d, 100.5 + d, 10.0, 1005.0)
+        for m in range(minutes):
+            ts = END - (minutes - m) * 60
+            yield (symbol, MARKET, "1m", ts, datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%d %H:%M:%S"),
+                   100.0, 101.0, 99.0, 100.5, 1.0, 100.5)
+
+
+def build_table(path: str, symbols: int, rows: int):
+    """Create crypto_klines without the range index and load rows into it"""
+    engine = create_engine(f"sqlite:///{path}")
+    table = CryptoKline.__table__
+    range_index = next(index for index in table.indexes if index.name == INDEX_NAME)
+    table.indexes.discard(range_index)
+    try:
+        table.create(engine)
+    finally:
+        table.indexes.add(range_index)
+
+    insert = ("INSERT INTO crypto_klines (symbol, market, period, timestamp, datetime_str, open_price, high_price, "
+              "low_price, close_price, volume, amount) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)")
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        cursor.execute("PRAGMA journal_mode=OFF")
+        cursor.execute("PRAGMA synchronous=OFF")
+        batch = []
+        for row in _rows(symbols, rows - symbols * DAYS):
+            batch.append(row)
+            if len(batch) >= BATCH:
+                cursor.executemany(insert, batch)
+                batch = []
+        if batch:
+            cursor.executemany(insert, batch)
+        raw.commit()
+    finally:
+        raw.close()
+    return engine, range_index
+
+
+def legacy_queries(db, start_date: str, end_date: str):
+    """The ranking table and symbol listing queries as they filtered before, same columns as the new ones"""
+    ranking = db.query(CryptoKline.symbol, CryptoKline.timestamp, CryptoKline.open_price, CryptoKline.high_price,
+                       CryptoKline.low_price, CryptoKline.close_price, CryptoKline.volume, CryptoKline.amount).filter(
+        CryptoKline.period == "1d",
+        CryptoKline.datetime_str >= start_date,
+        CryptoKline.datetime_str <= end_date
+    ).order_by(CryptoKline.symbol, CryptoKline.timestamp)
+    symbols = db.query(CryptoKline.symbol).filter(
+        CryptoKline.period == "1d",
+        CryptoKline.datetime_str >= start_date,
+        CryptoKline.datetime_str <= end_date
+    ).distinct()
+    return ranking, symbols
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def query_plan(engine, statement) -> str:
+    compiled = statement.compile(engine, compile_kwargs={"literal_binds": True})
+    with engine.connect() as conn:
+        return "; ".join(row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {compiled}")))
+
+
+def check_plans(engine, start: int, end: int) -> bool:
+    """Whether the range and symbol queries are answered through the range index"""
+    table = CryptoKline.__table__
+    ranking = _range_filter(select(table.c.symbol, table.c.timestamp, table.c.close_price), "1d", start, end, MARKET)
+    ranking = ranking.order_by(table.c.symbol, table.c.timestamp)
+    symbols = _range_filter(select(table.c.symbol).distinct(), "1d", start, end, MARKET)
+    ok = True
+    for name, statement, expected in (("range", ranking, f"INDEX {INDEX_NAME}"),
+                                      ("symbols", symbols, f"COVERING INDEX {INDEX_NAME}")):
+        plan = query_plan(engine, statement)
+        used = expected in plan
+        ok &= used
+        print(f"plan {name:<8} {'ok  ' if used else 'FAIL'} {plan}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20_000_000, help="total candles in the table")
+    parser.add_argument("--symbols", type=int, default=200, help="distinct symbols")
+    parser.add_argument("--check", action="store_true", help="only verify the query plans on a small table")
+    args = parser.parse_args()
+    if args.check:
+        args.rows, args.symbols = 50_000, 20
+
+    end_day = datetime.fromtimestamp(END, timezone.utc).date()
+    start_day = end_day - timedelta(days=RANKING_DAYS)
+    start_ts = END - RANKING_DAYS * DAY
+
+    with tempfile.TemporaryDirectory() as directory:
+        load_s, (engine, range_index) = _timed(lambda: build_table(os.path.join(directory, "klines.db"),
+                                                                   args.symbols, args.rows))
+        print(f"loaded {args.rows:,} rows in {load_s:.1f}s")
+        db = sessionmaker(bind=engine)()
+
+        if not args.check:
+            ranking, symbols = legacy_queries(db, start_day.strftime("%Y-%m-%d"), end_day.strftime("%Y-%m-%d"))
+            ranking_s, ranking_rows = _timed(ranking.all)
+            symbols_s, symbol_rows = _timed(symbols.all)
+            print(f"legacy ranking query   {ranking_s:8.3f}s  {len(ranking_rows):>8} rows")
+            print(f"legacy symbols query   {symbols_s:8.3f}s  {len(symbol_rows):>8} symbols")
+            db.close()
+
+        index_s, _ = _timed(lambda: range_index.create(engine))
+        print(f"created {INDEX_NAME} in {index_s:.1f}s")
+        ok = check_plans(engine, start_ts, END)
+
+        if not args.check:
+            repo = KlineRepository(sessionmaker(bind=engine)())
+            range_s, range_rows = _timed(lambda: repo.get_kline_range("1d", start_ts, END, MARKET))
+            symbols_s, symbol_rows = _timed(lambda: repo.get_symbols_in_range("1d", start_ts, END, MARKET))
+            print(f"timestamp range query  {range_s:8.3f}s  {len(range_rows):>8} rows")
+            print(f"symbols in range query {symbols_s:8.3f}s  {len(symbol_rows):>8} symbols")
+        engine.dispose()
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
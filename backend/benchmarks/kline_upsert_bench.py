@@ -0,0 +1,97 @@
+"""
+Kline upsert benchmark
+Compares KlineRepository.save_kline_data (set-based upsert) with the previous
+per-candle SELECT + ORM add/update on a scratch SQLite database
+
+Usage (from backend/):
+    python -m benchmarks.kline_upsert_bench --rows 100000 --legacy-rows 5000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from sqlalchemy import and_, create_engine
+from sqlalchemy.orm import sessionmaker
+
+from database.models import CryptoKline
+from repositories.kline_repo import KlineRepository, _to_row
+
+SYMBOL, MARKET, PERIOD = "BTC", "CRYPTO", "1m"
+
+
+def make_klines(rows: int, start: int = 1_700_000_000):
+    return [
+        {
+            'timestamp': start + i * 60,
+            'datetime_str': f"t{i}",
+            'open': 100.0 + i % 7,
+            'high': 101.0 + i % 7,
+            'low': 99.0 + i % 7,
+            'close': 100.5 + i % 7,
+            'volume': 10.0 + i % 3,
+            'amount': 1005.0,
+            'change': 0.5,
+            'percent': 0.5,
+        }
+        for i in range(rows)
+    ]
+
+
+def legacy_save(db, klines) -> None:
+    """The per-candle write path save_kline_data used before"""
+    for item in klines:
+        row = _to_row(SYMBOL, MARKET, PERIOD, item)
+        existing = db.query(CryptoKline).filter(
+            and_(
+                CryptoKline.symbol == SYMBOL,
+                CryptoKline.market == MARKET,
+                CryptoKline.period == PERIOD,
+                CryptoKline.timestamp == row['timestamp']
+            )
+        ).first()
+        if existing:
+            for key, value in row.items():
+                setattr(existing, key, value)
+        else:
+            db.add(CryptoKline(**row))
+    db.commit()
+
+
+def _session(directory: str, name: str):
+    engine = create_engine(f"sqlite:///{os.path.join(directory, name)}")
+    CryptoKline.__table__.create(engine)
+    return sessionmaker(bind=engine)()
+
+
+def _timed(fn, *args) -> float:
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000, help="candles for the bulk upsert")
+    parser.add_argument("--legacy-rows", type=int, default=5_000, help="candles for the per-row baseline")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        klines = make_klines(args.rows)
+        repo = KlineRepository(_session(directory, "bulk.db"))
+        insert_s = _timed(repo.save_kline_data, SYMBOL, MARKET, PERIOD, klines)
+        update_s = _timed(repo.save_kline_data, SYMBOL, MARKET, PERIOD, klines)
+        print(f"bulk upsert    {args.rows:>8} rows  insert {insert_s:7.2f}s ({args.rows / insert_s:>10,.0f} rows/s)"
+              f"  update {update_s:7.2f}s ({args.rows / update_s:>10,.0f} rows/s)")
+
+        legacy = make_klines(args.legacy_rows)
+        db = _session(directory, "legacy.db")
+        insert_s = _timed(legacy_save, db, legacy)
+        update_s = _timed(legacy_save, db, legacy)
+        print(f"per-row legacy {args.legacy_rows:>8} rows  insert {insert_s:7.2f}s ({args.legacy_rows / insert_s:>10,.0f} rows/s)"
+              f"  update {update_s:7.2f}s ({args.legacy_rows / update_s:>10,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
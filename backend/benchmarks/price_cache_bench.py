@@ -0,0 +1,59 @@
+"""
+PriceCache micro-benchmark
+Measures hit and miss throughput from many threads
+
+Usage (from backend/):
+    python -m benchmarks.price_cache_bench --threads 1 4 16 --ops 200000
+"""
+
+import argparse
+import threading
+import time
+
+from services.price_cache import PriceCache
+
+SYMBOLS = [f"SYM{i}" for i in range(200)]
+
+
+def _worker(cache: PriceCache, symbols, ops: int, barrier: threading.Barrier):
+    barrier.wait()
+    n = len(symbols)
+    for i in range(ops):
+        cache.get(symbols[i % n], "CRYPTO")
+
+
+def run(threads: int, ops: int, hit: bool) -> float:
+    """Return lookups per second across all threads"""
+    cache = PriceCache()
+    if hit:
+        for symbol in SYMBOLS:
+            cache.set(symbol, "CRYPTO", 1.0)
+        symbols = SYMBOLS
+    else:
+        symbols = [f"MISS{i}" for i in range(len(SYMBOLS))]
+
+    barrier = threading.Barrier(threads + 1)
+    workers = [threading.Thread(target=_worker, args=(cache, symbols, ops, barrier)) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    return threads * ops / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--ops", type=int, default=200000, help="lookups per thread")
+    args = parser.parse_args()
+
+    print(f"{'threads':>8} {'hit ops/s':>14} {'miss ops/s':>14}")
+    for threads in args.threads:
+        print(f"{threads:>8} {run(threads, args.ops, True):>14,.0f} {run(threads, args.ops, False):>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
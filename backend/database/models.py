@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DECIMAL, TIMESTAMP, ForeignKey, UniqueConstraint, Float, Date, DateTime
+from sqlalchemy import Column, Integer, String, DECIMAL, TIMESTAMP, ForeignKey, UniqueConstraint, Index, Float, Date, DateTime
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import datetime
@@ -218,7 +218,12 @@ class CryptoKline(Base):
     percent = Column(DECIMAL(10, 4), nullable=True)
     created_at = Column(TIMESTAMP, server_default=func.current_timestamp())
 
-    __table_args__ = (UniqueConstraint('symbol', 'market', 'period', 'timestamp'),)
+    __table_args__ = (
+        UniqueConstraint('symbol', 'market', 'period', 'timestamp'),
+        # Time-range reads across symbols (rankings, column store imports);
+        # symbol is included so symbol listings never touch the table
+        Index('ix_crypto_klines_period_market_timestamp', 'period', 'market', 'timestamp', 'symbol'),
+    )
 
 
 class AIDecisionLog(Base):
@@ -36,6 +36,10 @@ if os.path.exists(static_dir):
 def on_startup():
     # Create tables
     Base.metadata.create_all(bind=engine)
+    # create_all skips existing tables, add indexes introduced since they were created
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
     # Seed trading configs if empty
     db: Session = SessionLocal()
     try:
@@ -123,6 +127,13 @@ def on_shutdown():
     shutdown_services()
 
 
+@app.on_event("shutdown")
+async def on_shutdown_async():
+    # Close async market data sessions (must run on the event loop)
+    from services.market_data import close_async_clients
+    await close_async_clients()
+
+
 # API routes
 from api.market_data_routes import router as market_data_router
 from api.order_routes import router as order_router
@@ -130,6 +141,8 @@ from api.account_routes import router as account_router
 from api.config_routes import router as config_router
 from api.ranking_routes import router as ranking_router
 from api.crypto_routes import router as crypto_router
+from api.metrics_routes import router as metrics_router
+from api.readiness_routes import router as readiness_router
 # Removed: AI account routes merged into account_routes (unified AI trader accounts)
 
 app.include_router(market_data_router)
@@ -138,6 +151,8 @@ app.include_router(account_router)
 app.include_router(config_router)
 app.include_router(ranking_router)
 app.include_router(crypto_router)
+app.include_router(metrics_router)
+app.include_router(readiness_router)
 # app.include_router(ai_account_router, prefix="/api")  # Removed - merged into account_router
 
 # WebSocket endpoint
@@ -0,0 +1,263 @@
+"""
+Columnar kline repository
+Keeps candles on disk in one append-only, memory-mapped file per
+(market, period, symbol) so analytics reads get NumPy arrays for a time range
+without building ORM objects or converting DECIMAL columns
+"""
+
+import fcntl
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+KLINE_COLUMNS_DIR = os.environ.get("KLINE_COLUMNS_DIR", "./kline_columns")
+
+MAGIC = b"KLINECOL"
+HEADER_SIZE = 64
+# Fixed-width candle record, timestamps in seconds and sorted ascending
+RECORD_DTYPE = np.dtype([
+    ("timestamp", "<i8"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("volume", "<f8"),
+    ("amount", "<f8"),
+])
+INDEX_FILE = "index.json"
+LOCK_FILE = ".lock"
+# Present once a period's crypto_klines history has been imported
+IMPORTED_FILE = ".imported"
+
+
+class KlineColumns(NamedTuple):
+    """Candles of one symbol as read-only arrays, views into the memory-mapped file"""
+    timestamp: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    amount: np.ndarray
+
+    @property
+    def size(self) -> int:
+        return len(self.timestamp)
+
+
+def _columns(records: np.ndarray) -> KlineColumns:
+    return KlineColumns(*(records[name] for name in RECORD_DTYPE.names))
+
+
+def _to_record(item: Dict[str, Any]) -> Tuple:
+    def value(key: str) -> float:
+        v = item.get(key)
+        return float(v) if v is not None else np.nan
+
+    return (int(item['timestamp']), value('open'), value('high'), value('low'),
+            value('close'), value('volume'), value('amount'))
+
+
+class KlineColumnRepository:
+    """
+    Append-only candle files with a small per-period index
+
+    Each file is a 64-byte header followed by fixed-width records. Candles
+    newer than the last stored one are appended; a candle with the last
+    stored timestamp (the still-forming bar) is overwritten in place. Older
+    candles are never rewritten. index.json in each period directory keeps
+    count and time span per symbol so listings do not open every file.
+
+    Writers hold a file lock per period directory, so several worker
+    processes can append to the same store; each process reloads index.json
+    when another one has replaced it.
+    """
+
+    def __init__(self, directory: str = KLINE_COLUMNS_DIR):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._maps: Dict[str, np.memmap] = {}
+        # (market, period) -> (index.json mtime, index)
+        self._indexes: Dict[Tuple[str, str], Tuple[float, Dict[str, Dict[str, float]]]] = {}
+
+    def _period_dir(self, market: str, period: str) -> str:
+        return os.path.join(self.directory, market, period)
+
+    def _path(self, symbol: str, market: str, period: str) -> str:
+        return os.path.join(self._period_dir(market, period), f"{symbol.replace('/', '_')}.klc")
+
+    def _index(self, market: str, period: str) -> Dict[str, Dict[str, float]]:
+        """The period's index, reloaded whenever index.json changed on disk"""
+        key = (market, period)
+        path = os.path.join(self._period_dir(market, period), INDEX_FILE)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        cached = self._indexes.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        try:
+            with open(path) as f:
+                index = json.load(f)
+        except (FileNotFoundError, ValueError):
+            index = {}
+        self._indexes[key] = (mtime, index)
+        return index
+
+    def _write_index(self, market: str, period: str, index: Dict[str, Dict[str, float]]):
+        directory = self._period_dir(market, period)
+        path = os.path.join(directory, INDEX_FILE)
+        tmp_path = f"{path}.tmp.{os.getpid()}"
+        with open(tmp_path, "w") as f:
+            json.dump(index, f)
+        os.replace(tmp_path, path)
+        self._indexes[(market, period)] = (os.stat(path).st_mtime_ns, index)
+
+    @contextmanager
+    def _write_lock(self, market: str, period: str):
+        """Exclusive write access to a period directory across threads and processes"""
+        directory = self._period_dir(market, period)
+        os.makedirs(directory, exist_ok=True)
+        with self._lock, open(os.path.join(directory, LOCK_FILE), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _records(self, path: str) -> np.ndarray:
+        """Memory map of all complete records in a file, reused until the file grows"""
+        try:
+            size = os.path.getsize(path) - HEADER_SIZE
+        except FileNotFoundError:
+            return np.empty(0, dtype=RECORD_DTYPE)
+        count = size // RECORD_DTYPE.itemsize if size > 0 else 0
+        mapped = self._maps.get(path)
+        if mapped is not None and len(mapped) == count:
+            return mapped
+        if count == 0:
+            return np.empty(0, dtype=RECORD_DTYPE)
+        mapped = np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=HEADER_SIZE, shape=(count,))
+        self._maps[path] = mapped
+        return mapped
+
+    def append(self, symbol: str, period: str, klines: List[Dict[str, Any]], market: str = "CRYPTO") -> int:
+        """
+        Store candles in kline format, returns how many were appended
+
+        Args:
+            klines: Candles with timestamp (seconds) and open/high/low/close/volume/amount
+        """
+        candles = sorted((k for k in klines if k.get('timestamp')), key=lambda k: int(k['timestamp']))
+        if not candles:
+            return 0
+
+        path = self._path(symbol, market, period)
+        with self._write_lock(market, period):
+            existing = self._records(path)
+            last = int(existing["timestamp"][-1]) if len(existing) else None
+
+            appended = [c for c in candles if last is None or int(c['timestamp']) > last]
+            forming = [c for c in candles if last is not None and int(c['timestamp']) == last]
+            with open(path, "r+b" if os.path.exists(path) else "w+b") as f:
+                if f.seek(0, os.SEEK_END) == 0:
+                    f.write(MAGIC.ljust(HEADER_SIZE, b"\0"))
+                if forming:
+                    f.seek(HEADER_SIZE + (len(existing) - 1) * RECORD_DTYPE.itemsize)
+                    f.write(np.array([_to_record(forming[-1])], dtype=RECORD_DTYPE).tobytes())
+                if appended:
+                    # Drop a torn trailing record before appending behind it
+                    f.truncate(HEADER_SIZE + len(existing) * RECORD_DTYPE.itemsize)
+                    f.seek(0, os.SEEK_END)
+                    records = {int(c['timestamp']): _to_record(c) for c in appended}
+                    f.write(np.array(list(records.values()), dtype=RECORD_DTYPE).tobytes())
+            self._maps.pop(path, None)
+
+            records = self._records(path)
+            index = dict(self._index(market, period))
+            index[symbol] = {
+                "count": len(records),
+                "first": int(records["timestamp"][0]),
+                "last": int(records["timestamp"][-1]),
+                "synced_at": time.time(),
+            }
+            self._write_index(market, period, index)
+            return len(appended)
+
+    def read_range(self, symbol: str, period: str, start: Optional[int] = None, end: Optional[int] = None,
+                   market: str = "CRYPTO") -> KlineColumns:
+        """
+        Candles with start <= timestamp < end as zero-copy read-only arrays
+
+        Range bounds are found by binary search on the timestamp column, so
+        only the pages holding the range are read.
+        """
+        records = self._records(self._path(symbol, market, period))
+        timestamps = records["timestamp"]
+        lo = int(np.searchsorted(timestamps, start, side="left")) if start is not None else 0
+        hi = int(np.searchsorted(timestamps, end, side="left")) if end is not None else len(records)
+        return _columns(records[lo:hi])
+
+    def latest(self, symbol: str, period: str, count: int, market: str = "CRYPTO") -> KlineColumns:
+        """The newest count candles as zero-copy read-only arrays"""
+        records = self._records(self._path(symbol, market, period))
+        return _columns(records[max(len(records) - count, 0):])
+
+    def symbols(self, period: str, start: Optional[int] = None, end: Optional[int] = None,
+                market: str = "CRYPTO") -> List[str]:
+        """Symbols with candles overlapping [start, end), answered from the index"""
+        return sorted(
+            symbol for symbol, span in self._index(market, period).items()
+            if (start is None or span["last"] >= start) and (end is None or span["first"] < end)
+        )
+
+    def synced_at(self, symbol: str, period: str, market: str = "CRYPTO") -> Optional[float]:
+        """When candles for symbol were last stored, None if never"""
+        span = self._index(market, period).get(symbol)
+        return span.get("synced_at") if span else None
+
+    def is_imported(self, period: str, market: str = "CRYPTO") -> bool:
+        """Whether the period's crypto_klines history has been imported"""
+        return os.path.exists(os.path.join(self._period_dir(market, period), IMPORTED_FILE))
+
+    def import_from_db(self, db, period: str, market: str = "CRYPTO", start: Optional[int] = None,
+                       end: Optional[int] = None) -> int:
+        """Load a period's candles in [start, end) from the crypto_klines table, returns how many were appended"""
+        from repositories.kline_repo import KlineRepository
+
+        rows = KlineRepository(db).get_kline_range(period, start, end, market)
+
+        by_symbol: Dict[str, List[Dict[str, Any]]] = {}
+        for symbol, timestamp, open_, high, low, close, volume, amount in rows:
+            by_symbol.setdefault(symbol, []).append({
+                'timestamp': timestamp, 'open': open_, 'high': high, 'low': low,
+                'close': close, 'volume': volume, 'amount': amount,
+            })
+        appended = sum(self.append(symbol, period, klines, market) for symbol, klines in by_symbol.items())
+        if start is None:
+            with self._write_lock(market, period):
+                open(os.path.join(self._period_dir(market, period), IMPORTED_FILE), "a").close()
+        logger.info(f"Imported {appended} {market} {period} candles for {len(by_symbol)} symbols into the columnar store")
+        return appended
+
+    def ensure_imported(self, db, period: str, market: str = "CRYPTO") -> int:
+        """Import the period's crypto_klines history unless that already happened"""
+        if self.is_imported(period, market):
+            return 0
+        return self.import_from_db(db, period, market)
+
+
+# Global columnar kline store, a copy of crypto_klines
+kline_columns = KlineColumnRepository()
+
+# Candles asset curves fetch for themselves, kept apart from the crypto_klines copy
+curve_kline_columns = KlineColumnRepository(os.path.join(KLINE_COLUMNS_DIR, "curves"))
@@ -4,85 +4,143 @@ Provides K-line data database operations
 """
 
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from typing import List, Optional
-from database.models import cryptoKline
+from sqlalchemy import and_, func, select
+from typing import Dict, List, Optional
+from database.models import CryptoKline
 from database.connection import get_db
+from repositories.kline_column_repo import kline_columns
+
+# Rows per upsert batch, also the size of the IN (...) list that counts
+# existing rows, kept well below SQLite's bound variable limit
+UPSERT_CHUNK_SIZE = 500
+
+_KEY_COLUMNS = ('symbol', 'market', 'period', 'timestamp')
+_VALUE_COLUMNS = ('datetime_str', 'open_price', 'high_price', 'low_price', 'close_price',
+                  'volume', 'amount', 'change', 'percent')
+
+
+def _insert_for(db: Session):
+    """INSERT construct with ON CONFLICT support for the session's database"""
+    if db.get_bind().dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
+
+
+def _to_row(symbol: str, market: str, period: str, item: dict) -> dict:
+    """Map a kline item (market data or API format) to a crypto_klines row"""
+    change = item.get('change')
+    datetime_str = item.get('datetime_str') or item.get('datetime') or ''
+    return {
+        'symbol': symbol,
+        'market': market,
+        'period': period,
+        'timestamp': int(item['timestamp']),
+        'datetime_str': datetime_str if isinstance(datetime_str, str) else datetime_str.isoformat(),
+        'open_price': item.get('open'),
+        'high_price': item.get('high'),
+        'low_price': item.get('low'),
+        'close_price': item.get('close'),
+        'volume': item.get('volume'),
+        'amount': item.get('amount'),
+        'change': change if change is not None else item.get('chg'),
+        'percent': item.get('percent'),
+    }
+
+
+def _range_filter(query, period: str, start: Optional[int], end: Optional[int], market: str):
+    """Restrict a crypto_klines select to one period and a [start, end) timestamp range"""
+    table = CryptoKline.__table__
+    query = query.where(table.c.period == period, table.c.market == market)
+    if start is not None:
+        query = query.where(table.c.timestamp >= start)
+    if end is not None:
+        query = query.where(table.c.timestamp < end)
+    return query
 
 
 class KlineRepository:
     def __init__(self, db: Session):
         self.db = db
 
-    def save_kline_data(self, symbol: str, market: str, period: str, kline_data: List[dict]) -> dict:
+    def save_kline_data(self, symbol: str, market: str, period: str, kline_data: List[dict],
+                        chunk_size: int = UPSERT_CHUNK_SIZE) -> dict:
         """
         Save K-line data to database (using upsert mode)
 
+        Candles are written in chunks. Each chunk runs one prepared INSERT ...
+        ON CONFLICT(symbol, market, period, timestamp) DO UPDATE for all of its
+        rows, plus one query to tell inserts from updates. Items without a
+        timestamp are skipped, and for repeated timestamps the last item wins.
+
         Args:
             symbol: Stock symbol
             market: Market symbol
             period: Time period
             kline_data: K-line data list
+            chunk_size: Rows per statement
 
         Returns:
             Save result dict, contains inserted and updated counts
         """
-        inserted_count = 0
-        updated_count = 0
-        
+        rows: Dict[int, dict] = {}
         for item in kline_data:
-            timestamp = item.get('timestamp')
-            if not timestamp:
+            if not item.get('timestamp'):
                 continue
-                
-            # Check if record with same timestamp already exists
-            existing = self.db.query(cryptoKline).filter(
-                and_(
-                    cryptoKline.symbol == symbol,
-                    cryptoKline.market == market,
-                    cryptoKline.period == period,
-                    cryptoKline.timestamp == timestamp
-                )
-            ).first()
-            
-            kline_data_dict = {
-                'symbol': symbol,
-                'market': market,
-                'period': period,
-                'timestamp': timestamp,
-                'datetime_str': item.get('datetime', ''),
-                'open_price': item.get('open'),
-                'high_price': item.get('high'),
-                'low_price': item.get('low'),
-                'close_price': item.get('close'),
-                'volume': item.get('volume'),
-                'amount': item.get('amount'),
-                'change': item.get('chg'),
-                'percent': item.get('percent')
-            }
-            
-            if existing:
-                # Update existing record
-                for key, value in kline_data_dict.items():
-                    if key not in ['symbol', 'market', 'period', 'timestamp']:  # Don't update primary key fields
-                        setattr(existing, key, value)
-                updated_count += 1
-            else:
-                # Insert new record
-                kline_record = cryptoKline(**kline_data_dict)
-                self.db.add(kline_record)
-                inserted_count += 1
-        
-        if inserted_count > 0 or updated_count > 0:
-            self.db.commit()
-            
+            row = _to_row(symbol, market, period, item)
+            rows[row['timestamp']] = row
+        rows = list(rows.values())
+
+        table = CryptoKline.__table__
+        stmt = _insert_for(self.db)(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c[name] for name in _KEY_COLUMNS],
+            set_={name: stmt.excluded[name] for name in _VALUE_COLUMNS},
+        )
+        inserted_count = 0
+        updated_count = 0
+
+        try:
+            for start in range(0, len(rows), chunk_size):
+                chunk = rows[start:start + chunk_size]
+                timestamps = [row['timestamp'] for row in chunk]
+
+                existing = self.db.execute(
+                    select(func.count()).select_from(table).where(
+                        and_(
+                            table.c.symbol == symbol,
+                            table.c.market == market,
+                            table.c.period == period,
+                            table.c.timestamp.in_(timestamps)
+                        )
+                    )
+                ).scalar_one()
+
+                # executemany of one prepared statement, no per-chunk SQL compilation
+                self.db.execute(stmt, chunk)
+
+                updated_count += existing
+                inserted_count += len(chunk) - existing
+
+            if rows:
+                self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        # Keep the columnar copy used by analytics reads in step, until its
+        # first import the rows reach it from the table instead
+        if kline_columns.is_imported(period, market):
+            kline_columns.append(symbol, period, kline_data, market)
+
         return {
             'inserted': inserted_count,
             'updated': updated_count,
             'total': inserted_count + updated_count
         }
 
-    def get_kline_data(self, symbol: str, market: str, period: str, limit: int = 100) -> List[cryptoKline]:
+    def get_kline_data(self, symbol: str, market: str, period: str, limit: int = 100) -> List[CryptoKline]:
         """
         Get K-line data
 
@@ -95,15 +153,49 @@ class KlineRepository:
         Returns:
             K-line data list
         """
-        return self.db.query(cryptoKline).filter(
+        return self.db.query(CryptoKline).filter(
             and_(
-                cryptoKline.symbol == symbol,
-                cryptoKline.market == market,
-                cryptoKline.period == period
+                CryptoKline.symbol == symbol,
+                CryptoKline.market == market,
+                CryptoKline.period == period
             )
-        ).order_by(cryptoKline.timestamp.desc()).limit(limit).all()
+        ).order_by(CryptoKline.timestamp.desc()).limit(limit).all()
+
+    def get_kline_range(self, period: str, start: Optional[int] = None, end: Optional[int] = None,
+                        market: str = "CRYPTO", symbols: Optional[List[str]] = None) -> List[tuple]:
+        """
+        Candles of all symbols with start <= timestamp < end, ordered by symbol and timestamp
 
-    def delete_old_kline_data(self, symbol: str, market: str, period: str, keep_days: int = 30):
+        Filters on the integer timestamp so the (period, market, timestamp)
+        index bounds the scan; rows are plain tuples of (symbol, timestamp,
+        open, high, low, close, volume, amount).
+        """
+        table = CryptoKline.__table__
+        query = select(table.c.symbol, table.c.timestamp, table.c.open_price, table.c.high_price,
+                       table.c.low_price, table.c.close_price, table.c.volume, table.c.amount)
+        query = _range_filter(query, period, start, end, market)
+        if symbols is not None:
+            query = query.where(table.c.symbol.in_(symbols))
+        return self.db.execute(query.order_by(table.c.symbol, table.c.timestamp)).all()
+
+    def get_symbols_in_range(self, period: str, start: Optional[int] = None, end: Optional[int] = None,
+                             market: str = "CRYPTO") -> List[str]:
+        """Symbols with candles in [start, end), answered from the index alone"""
+        table = CryptoKline.__table__
+        query = _range_filter(select(table.c.symbol).distinct(), period, start, end, market)
+        return sorted(self.db.execute(query).scalars().all())
+
+    def get_latest_timestamps(self, period: str, market: str = "CRYPTO") -> Dict[str, int]:
+        """Newest stored candle timestamp per symbol for a period"""
+        table = CryptoKline.__table__
+        rows = self.db.execute(
+            select(table.c.symbol, func.max(table.c.timestamp))
+            .where(table.c.period == period, table.c.market == market)
+            .group_by(table.c.symbol)
+        ).all()
+        return {symbol: timestamp for symbol, timestamp in rows}
+
+    def delete_old_kline_data(self, symbol: str, market: str, period: str, keep_days: int = 30) -> int:
         """
         Delete old K-line data
 
@@ -112,17 +204,22 @@ class KlineRepository:
             market: Market symbol
             period: Time period
             keep_days: Days to keep
+
+        Returns:
+            Number of deleted rows
         """
         import time
-        cutoff_timestamp = int((time.time() - keep_days * 24 * 3600) * 1000)
-        
-        self.db.query(cryptoKline).filter(
+        # Kline timestamps are stored in seconds
+        cutoff_timestamp = int(time.time() - keep_days * 24 * 3600)
+
+        deleted = self.db.query(CryptoKline).filter(
             and_(
-                cryptoKline.symbol == symbol,
-                cryptoKline.market == market,
-                cryptoKline.period == period,
-                cryptoKline.timestamp < cutoff_timestamp
+                CryptoKline.symbol == symbol,
+                CryptoKline.market == market,
+                CryptoKline.period == period,
+                CryptoKline.timestamp < cutoff_timestamp
             )
-        ).delete()
-        
-        self.db.commit()
\ No newline at end of file
+        ).delete(synchronize_session=False)
+
+        self.db.commit()
+        return deleted
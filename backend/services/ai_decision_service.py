@@ -23,6 +23,7 @@ except ImportError:
 
 from database.models import Position, Account, AIDecisionLog
 from services.asset_calculator import calc_positions_value
+from services.price_snapshot import PriceSnapshot
 from services.news_feed import fetch_latest_news
 
 
@@ -175,8 +176,8 @@ def _call_bedrock_api(account: Account, prompt: str) -> Optional[str]:
         return None
 
 
-def _get_portfolio_data(db: Session, account: Account) -> Dict:
-    """Get current portfolio positions and values"""
+def _get_portfolio_data(db: Session, account: Account, prices: Optional[PriceSnapshot] = None) -> Dict:
+    """Get current portfolio positions and values, valued at the cycle's price snapshot when given"""
     positions = db.query(Position).filter(
         Position.account_id == account.id,
         Position.market == "CRYPTO"
@@ -197,7 +198,7 @@ def _get_portfolio_data(db: Session, account: Account) -> Dict:
         "cash": float(account.current_cash),
         "frozen_cash": float(account.frozen_cash),
         "positions": portfolio,
-        "total_assets": float(account.current_cash) + calc_positions_value(db, account.id)
+        "total_assets": float(account.current_cash) + calc_positions_value(db, account.id, snapshot=prices)
     }
 
 
@@ -1,10 +1,12 @@
 from decimal import Decimal
+from typing import Optional
 from sqlalchemy.orm import Session
 from database.models import Position
-from .market_data import get_last_price
+from .price_snapshot import PriceSnapshot, snapshot_price
 
 
-def calc_positions_market_value(db: Session, account_id: int) -> float:
+def calc_positions_market_value(db: Session, account_id: int, allow_stale: bool = False,
+                                snapshot: Optional[PriceSnapshot] = None) -> float:
     """
     Calculate total equity in positions (for leveraged positions: margin + unrealized P&L).
     
@@ -17,6 +19,8 @@ def calc_positions_market_value(db: Session, account_id: int) -> float:
     Args:
         db: Database session
         account_id: Account ID
+        allow_stale: Serve stale cached prices (display paths only)
+        snapshot: Price snapshot of the current cycle, looked up when it lacks a symbol
 
     Returns:
         Total equity in positions, returns 0 if price cannot be obtained
@@ -26,7 +30,7 @@ def calc_positions_market_value(db: Session, account_id: int) -> float:
     
     for p in positions:
         try:
-            price = Decimal(str(get_last_price(p.symbol, p.market)))
+            price = Decimal(str(snapshot_price(snapshot, p.symbol, p.market, allow_stale=allow_stale)))
             quantity = Decimal(str(p.quantity))
             avg_cost = Decimal(str(p.avg_cost))
             leverage = Decimal(str(p.leverage)) if p.leverage and p.leverage > 0 else Decimal("1")
@@ -56,7 +60,8 @@ def calc_positions_market_value(db: Session, account_id: int) -> float:
     return float(total)
 
 
-def calc_positions_value(db: Session, account_id: int) -> float:
+def calc_positions_value(db: Session, account_id: int, allow_stale: bool = False,
+                         snapshot: Optional[PriceSnapshot] = None) -> float:
     """
     计算所有仓位的名义总价值 (sum(quantity * price * leverage))。
     
@@ -66,6 +71,8 @@ def calc_positions_value(db: Session, account_id: int) -> float:
     Args:
         db: Database session
         account_id: Account ID
+        allow_stale: Serve stale cached prices (display paths only)
+        snapshot: Price snapshot of the current cycle, looked up when it lacks a symbol
 
     Returns:
         Total notional value of positions, returns 0 if price cannot be obtained
@@ -75,7 +82,7 @@ def calc_positions_value(db: Session, account_id: int) -> float:
     
     for p in positions:
         try:
-            price = Decimal(str(get_last_price(p.symbol, p.market)))
+            price = Decimal(str(snapshot_price(snapshot, p.symbol, p.market, allow_stale=allow_stale)))
             total += price * Decimal(str(p.quantity)) * Decimal(str(p.leverage))
         except Exception as e:
             import logging
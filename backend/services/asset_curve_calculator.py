@@ -8,8 +8,10 @@ from sqlalchemy.orm import Session
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime, timezone
 import logging
+import time
 
-from database.models import Trade, Account, CryptoKline
+from database.models import Trade, Account
+from repositories.kline_column_repo import curve_kline_columns
 from services.market_data import get_kline_data
 
 
@@ -61,7 +63,7 @@ def get_all_asset_curves_data_new(db: Session, timeframe: str = "1h") -> List[Di
         symbol_klines = {}
         for symbol, market in unique_symbols:
             try:
-                klines = get_kline_data(symbol, market, timeframe, 20)
+                klines = _get_recent_klines(symbol, market, timeframe, 20)
                 if klines:
                     symbol_klines[(symbol, market)] = klines
                     logging.info(f"Fetched {len(klines)} klines for {symbol}.{market}")
@@ -113,6 +115,32 @@ def get_all_asset_curves_data_new(db: Session, timeframe: str = "1h") -> List[Di
         return []
 
 
+# Columnar candles stored within this many seconds are used for curves as-is
+CURVE_KLINE_MAX_AGE = 60
+
+
+def _get_recent_klines(symbol: str, market: str, timeframe: str, count: int) -> List[Dict]:
+    """
+    Latest candles from the columnar store when they were stored recently,
+    otherwise fetched from market data and appended to the store
+    """
+    candles = curve_kline_columns.latest(symbol, timeframe, count, market)
+    synced_at = curve_kline_columns.synced_at(symbol, timeframe, market)
+    if candles.size < count or synced_at is None or time.time() - synced_at >= CURVE_KLINE_MAX_AGE:
+        klines = get_kline_data(symbol, market, timeframe, count)
+        curve_kline_columns.append(symbol, timeframe, klines, market)
+        return klines
+
+    return [
+        {
+            "timestamp": int(ts),
+            "datetime_str": datetime.fromtimestamp(int(ts), tz=timezone.utc).isoformat(),
+            "close": None if close != close else float(close),
+        }
+        for ts, close in zip(candles.timestamp.tolist(), candles.close.tolist())
+    ]
+
+
 def _create_account_timeline(
     db: Session, 
     account: Account, 
@@ -326,7 +354,7 @@ def get_account_asset_curve(db: Session, account_id: int, timeframe: str = "1h")
         symbol_klines = {}
         for symbol, market in unique_symbols:
             try:
-                klines = get_kline_data(symbol, market, timeframe, 20)
+                klines = _get_recent_klines(symbol, market, timeframe, 20)
                 if klines:
                     symbol_klines[(symbol, market)] = klines
             except Exception as e:
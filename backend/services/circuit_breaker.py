@@ -0,0 +1,169 @@
+"""
+Circuit breakers for upstream market data
+A breaker opens after repeated failures and fails callers fast while open
+(negative caching of the last error). Once the open period expires a single
+probe call is let through; failing probes double the open period up to a cap.
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+from .metrics import registry
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling upstream while a breaker is open"""
+
+
+class CircuitBreaker:
+    """Failure-counting breaker with exponential recovery probes"""
+
+    def __init__(self, name: str, failure_threshold: int = 3,
+                 base_open_seconds: float = 1.0, max_open_seconds: float = 60.0):
+        """
+        Args:
+            name: Breaker key, used in errors and state reports
+            failure_threshold: Consecutive failures that open the breaker
+            base_open_seconds: First open period, doubled on every failed probe
+            max_open_seconds: Upper bound for the open period
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_open_seconds = base_open_seconds
+        self.max_open_seconds = max_open_seconds
+        self.state = CLOSED
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._trips = 0
+        self._open_until = 0.0
+        self._probing = False
+        self._last_error: Optional[str] = None
+        self.rejected = 0
+
+    def before_call(self):
+        """Raise CircuitOpenError unless a call may go upstream now"""
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            now = time.monotonic()
+            if self.state == OPEN and now >= self._open_until:
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+            self.rejected += 1
+            retry_in = max(self._open_until - now, 0.0)
+            last_error = self._last_error
+        raise CircuitOpenError(f"{self.name} is failing, next probe in {retry_in:.1f}s: {last_error}")
+
+    def cancel_call(self):
+        """Release an allowed call that never reached upstream"""
+        with self._lock:
+            self._probing = False
+
+    def record_success(self):
+        with self._lock:
+            if self.state != CLOSED:
+                logger.info(f"Circuit {self.name} closed after recovery")
+            self.state = CLOSED
+            self._failures = 0
+            self._trips = 0
+            self._probing = False
+            self._last_error = None
+
+    def record_failure(self, error: object):
+        with self._lock:
+            self._failures += 1
+            self._last_error = str(error)
+            self._probing = False
+            if self.state == HALF_OPEN or self._failures >= self.failure_threshold:
+                open_for = min(self.base_open_seconds * (2 ** self._trips), self.max_open_seconds)
+                self._trips += 1
+                self._open_until = time.monotonic() + open_for
+                if self.state != OPEN:
+                    logger.warning(f"Circuit {self.name} opened for {open_for:.1f}s: {error}")
+                self.state = OPEN
+
+    def get_state(self) -> Dict:
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self._failures,
+                "trips": self._trips,
+                "retry_in_seconds": round(max(self._open_until - time.monotonic(), 0.0), 3)
+                if self.state != CLOSED else 0.0,
+                "rejected": self.rejected,
+                "last_error": self._last_error,
+            }
+
+
+class CircuitBreakerGroup:
+    """Breakers created on demand per key with shared settings"""
+
+    def __init__(self, prefix: str, failure_threshold: int, base_open_seconds: float, max_open_seconds: float):
+        self.prefix = prefix
+        self.failure_threshold = failure_threshold
+        self.base_open_seconds = base_open_seconds
+        self.max_open_seconds = max_open_seconds
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> CircuitBreaker:
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.get(key)
+                if breaker is None:
+                    breaker = CircuitBreaker(f"{self.prefix}:{key}", self.failure_threshold,
+                                             self.base_open_seconds, self.max_open_seconds)
+                    self._breakers[key] = breaker
+        return breaker
+
+    def is_open(self, key: str) -> bool:
+        breaker = self._breakers.get(key)
+        return breaker is not None and breaker.state != CLOSED
+
+    def get_states(self) -> Dict[str, Dict]:
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {key: breaker.get_state() for key, breaker in breakers.items()}
+
+
+# An unknown or delisted symbol fails on the first call, cache that briefly
+symbol_breakers = CircuitBreakerGroup("symbol", failure_threshold=1, base_open_seconds=2.0, max_open_seconds=60.0)
+
+# Exchange-wide outages show up as repeated failures of one endpoint
+endpoint_breakers = CircuitBreakerGroup("endpoint", failure_threshold=3, base_open_seconds=1.0, max_open_seconds=30.0)
+
+
+_BREAKER_OPEN = registry.gauge("circuit_breaker_open", "1 while a circuit breaker is open or probing", ("breaker",))
+_BREAKER_REJECTED = registry.counter("circuit_breaker_rejected_total", "Calls failed fast by a breaker", ("breaker",))
+
+
+def _collect_breaker_metrics():
+    open_states = {}
+    for group in (symbol_breakers, endpoint_breakers):
+        for key, state in group.get_states().items():
+            name = f"{group.prefix}:{key}"
+            open_states[(name,)] = 0 if state["state"] == CLOSED else 1
+            _BREAKER_REJECTED.set_total(state["rejected"], name)
+    _BREAKER_OPEN.replace(open_states)
+
+
+registry.add_collector(_collect_breaker_metrics)
+
+
+def get_circuit_breaker_states() -> Dict[str, Dict[str, Dict]]:
+    """Get the state of every breaker"""
+    return {
+        "symbols": symbol_breakers.get_states(),
+        "endpoints": endpoint_breakers.get_states(),
+    }
@@ -2,16 +2,235 @@
 Hyperliquid market data service using CCXT
 """
 import ccxt
+import ccxt.async_support as ccxt_async
 import logging
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timezone
+import threading
 import time
 
+from .circuit_breaker import CircuitOpenError, endpoint_breakers
+from .market_data_source import MarketDataSource
+from .metrics import observe_upstream
+from .rate_limiter import RateLimitExceeded, upstream_limiter
+from .ticker_cache import Ticker
+
 logger = logging.getLogger(__name__)
 
-class HyperliquidClient:
-    def __init__(self):
+# Map period to CCXT timeframe
+TIMEFRAME_MAP = {
+    '1m': '1m',
+    '5m': '5m',
+    '15m': '15m',
+    '30m': '30m',
+    '1h': '1h',
+    '1d': '1d',
+}
+
+
+def _convert_ohlcv(ohlcv: List[List[Any]]) -> List[Dict[str, Any]]:
+    """Convert CCXT OHLCV candles to our kline format"""
+    klines = []
+    for candle in ohlcv:
+        timestamp_ms = candle[0]
+        open_price = candle[1]
+        high_price = candle[2]
+        low_price = candle[3]
+        close_price = candle[4]
+        volume = candle[5]
+        
+        # Calculate change
+        change = close_price - open_price if open_price else 0
+        percent = (change / open_price * 100) if open_price else 0
+        
+        klines.append({
+            'timestamp': int(timestamp_ms / 1000),  # Convert to seconds
+            'datetime_str': datetime.fromtimestamp(timestamp_ms / 1000, tz=timezone.utc).isoformat(),
+            'open': float(open_price) if open_price else None,
+            'high': float(high_price) if high_price else None,
+            'low': float(low_price) if low_price else None,
+            'close': float(close_price) if close_price else None,
+            'volume': float(volume) if volume else None,
+            'amount': float(volume * close_price) if volume and close_price else None,
+            'change': float(change),
+            'percent': float(percent),
+        })
+    return klines
+
+
+# Errors about the request itself, the endpoint is healthy
+_REQUEST_ERRORS = (ccxt.BadSymbol, ccxt.BadRequest)
+
+
+def _request(endpoint: str, fn, *args, **kwargs):
+    """Run one upstream call behind the endpoint breaker, the rate limiter and metrics"""
+    breaker = endpoint_breakers.get(endpoint)
+    breaker.before_call()
+    try:
+        upstream_limiter.acquire()
+    except RateLimitExceeded:
+        # Shed locally, says nothing about upstream health
+        breaker.cancel_call()
+        raise
+    try:
+        with observe_upstream(endpoint):
+            result = fn(*args, **kwargs)
+    except _REQUEST_ERRORS:
+        breaker.record_success()
+        raise
+    except Exception as e:
+        breaker.record_failure(e)
+        raise
+    except BaseException:
+        breaker.cancel_call()
+        raise
+    breaker.record_success()
+    return result
+
+
+async def _request_async(endpoint: str, fn, *args, **kwargs):
+    """Awaitable _request for the async client"""
+    breaker = endpoint_breakers.get(endpoint)
+    breaker.before_call()
+    try:
+        await upstream_limiter.acquire_async()
+    except RateLimitExceeded:
+        # Shed locally, says nothing about upstream health
+        breaker.cancel_call()
+        raise
+    try:
+        with observe_upstream(endpoint):
+            result = await fn(*args, **kwargs)
+    except _REQUEST_ERRORS:
+        breaker.record_success()
+        raise
+    except Exception as e:
+        breaker.record_failure(e)
+        raise
+    except BaseException:
+        breaker.cancel_call()
+        raise
+    breaker.record_success()
+    return result
+
+
+def _float(value: Any) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _normalize_ticker(symbol: str, raw: Dict[str, Any]) -> Optional[Ticker]:
+    """Convert a CCXT Hyperliquid ticker into a Ticker, None without a usable last price"""
+    last = _float(raw.get('last')) or _float(raw.get('close'))
+    if not last:
+        return None
+    info = raw.get('info') or {}
+    timestamp = raw.get('timestamp')
+    return Ticker(
+        symbol=symbol,
+        last=last,
+        bid=_float(raw.get('bid')),
+        ask=_float(raw.get('ask')),
+        mark=_float(raw.get('markPrice')) or _float(info.get('markPx')),
+        index=_float(raw.get('indexPrice')) or _float(info.get('oraclePx')),
+        volume_24h=_float(raw.get('quoteVolume')) or _float(info.get('dayNtlVlm')),
+        change_24h_percent=_float(raw.get('percentage')),
+        funding_rate=_float(info.get('funding')),
+        open_interest=_float(info.get('openInterest')),
+        timestamp=timestamp / 1000 if timestamp else time.time(),
+    )
+
+
+def _map_requested(symbols: List[str], markets: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Map CCXT symbols back to the requested symbols, dropping unknown markets
+    so a single bad symbol does not fail the whole batch
+    """
+    requested = {}
+    for symbol in symbols:
+        formatted_symbol = _format_symbol(symbol)
+        if formatted_symbol in markets:
+            requested[formatted_symbol] = symbol
+        else:
+            logger.warning(f"Skipping unknown market {formatted_symbol} in bulk ticker request")
+    return requested
+
+
+def _normalize_tickers(raw: Dict[str, Dict[str, Any]], requested: Dict[str, str]) -> Dict[str, Ticker]:
+    tickers = {}
+    for formatted_symbol, raw_ticker in raw.items():
+        symbol = requested.get(formatted_symbol)
+        if symbol is None:
+            continue
+        ticker = _normalize_ticker(symbol, raw_ticker)
+        if ticker is not None:
+            tickers[symbol] = ticker
+    return tickers
+
+
+# Markets metadata changes rarely (listings/delistings), refresh hourly
+MARKETS_REFRESH_SECONDS = 3600
+
+
+class MarketIndex:
+    """Precomputed lookup tables over the exchange market list"""
+
+    def __init__(self, markets: Dict[str, Dict[str, Any]]):
+        self.loaded_at = time.time()
+        # Canonical CCXT symbol -> market info
+        self.by_symbol: Dict[str, Dict[str, Any]] = dict(markets)
+        # Base currency -> canonical symbols
+        self.by_base: Dict[str, List[str]] = {}
+        for symbol, market_info in self.by_symbol.items():
+            base = market_info.get('base')
+            if base:
+                self.by_base.setdefault(base, []).append(symbol)
+
+        # Filter for USDC pairs (both spot and perpetual)
+        self.usdc_symbols: List[str] = [s for s in self.by_symbol if '/USDC' in s]
+
+        # Prioritize mainstream cryptos (perpetual swaps) and popular spot pairs
+        mainstream_perps = [s for s in self.usdc_symbols if any(crypto in s for crypto in ['BTC/', 'ETH/', 'SOL/', 'DOGE/', 'BNB/', 'XRP/'])]
+        mainstream_set = set(mainstream_perps)
+        other_symbols = [s for s in self.usdc_symbols if s not in mainstream_set]
+        # Mainstream first, then others
+        self.ranked_symbols: List[str] = mainstream_perps + other_symbols[:50]
+
+    def age(self) -> float:
+        return time.time() - self.loaded_at
+
+
+def _format_symbol(symbol: str) -> str:
+    """Format symbol for CCXT (e.g., 'BTC' -> 'BTC/USDC:USDC')"""
+    if '/' in symbol and ':' in symbol:
+        return symbol
+    elif '/' in symbol:
+        # If it's BTC/USDC, convert to BTC/USDC:USDC for Hyperliquid
+        return f"{symbol}:USDC"
+    
+    # For single symbols like 'BTC', check if it's a mainstream crypto
+    symbol_upper = symbol.upper()
+    mainstream_cryptos = ['BTC', 'ETH', 'SOL', 'DOGE', 'BNB', 'XRP']
+    
+    if symbol_upper in mainstream_cryptos:
+        # Use perpetual swap format for mainstream cryptos
+        return f"{symbol_upper}/USDC:USDC"
+    else:
+        # Use spot format for other cryptos
+        return f"{symbol_upper}/USDC"
+
+
+class HyperliquidClient(MarketDataSource):
+    name = "hyperliquid"
+
+    def __init__(self, markets_refresh_seconds: int = MARKETS_REFRESH_SECONDS):
         self.exchange = None
+        self.markets_refresh_seconds = markets_refresh_seconds
+        self._market_index: Optional[MarketIndex] = None
+        self._market_index_lock = threading.Lock()
+        self._market_index_refreshing = False
         self._initialize_exchange()
     
     def _initialize_exchange(self):
@@ -26,8 +245,48 @@ class HyperliquidClient:
             logger.error(f"Failed to initialize Hyperliquid exchange: {e}")
             raise
 
-    def get_last_price(self, symbol: str) -> Optional[float]:
-        """Get the last price for a symbol"""
+    def get_market_index(self) -> MarketIndex:
+        """
+        Get the cached market index
+
+        The first call loads markets synchronously. Once loaded, a stale index keeps
+        being served while a background thread reloads it, so callers never wait
+        on the exchange after warm-up.
+        """
+        index = self._market_index
+        if index is None:
+            with self._market_index_lock:
+                if self._market_index is None:
+                    self._market_index = self._load_market_index(reload=False)
+                return self._market_index
+
+        if index.age() >= self.markets_refresh_seconds:
+            with self._market_index_lock:
+                start_refresh = not self._market_index_refreshing
+                self._market_index_refreshing = True
+            if start_refresh:
+                threading.Thread(target=self._refresh_market_index, name="markets_refresh", daemon=True).start()
+
+        return index
+
+    def _load_market_index(self, reload: bool) -> MarketIndex:
+        if not self.exchange:
+            self._initialize_exchange()
+        markets = _request("load_markets", self.exchange.load_markets, reload=reload)
+        index = MarketIndex(markets)
+        logger.info(f"Loaded market index: {len(index.by_symbol)} markets, {len(index.usdc_symbols)} USDC pairs")
+        return index
+
+    def _refresh_market_index(self):
+        try:
+            self._market_index = self._load_market_index(reload=True)
+        except Exception as e:
+            logger.warning(f"Failed to refresh market index, keeping previous one: {e}")
+        finally:
+            self._market_index_refreshing = False
+
+    def get_ticker(self, symbol: str) -> Optional[Ticker]:
+        """Get the full normalized ticker for a symbol"""
         try:
             if not self.exchange:
                 self._initialize_exchange()
@@ -35,82 +294,81 @@ class HyperliquidClient:
             # Ensure symbol is in CCXT format (e.g., 'BTC/USD')
             formatted_symbol = self._format_symbol(symbol)
             
-            ticker = self.exchange.fetch_ticker(formatted_symbol)
-            price = ticker['last']
+            ticker = _normalize_ticker(symbol, _request("fetch_ticker", self.exchange.fetch_ticker, formatted_symbol))
             
-            logger.info(f"Got price for {formatted_symbol}: {price}")
-            return float(price) if price else None
+            logger.info(f"Got ticker for {formatted_symbol}: {ticker.last if ticker else None}")
+            return ticker
             
+        except (RateLimitExceeded, CircuitOpenError):
+            # Shed or short-circuited requests say nothing about the symbol
+            raise
         except Exception as e:
             logger.error(f"Error fetching price for {symbol}: {e}")
             return None
 
-    def get_kline_data(self, symbol: str, period: str = '1d', count: int = 100) -> List[Dict[str, Any]]:
-        """Get kline/candlestick data for a symbol"""
+    def get_tickers(self, symbols: List[str]) -> Dict[str, Ticker]:
+        """Get full tickers for several symbols with a single bulk ticker request"""
         try:
-            if not self.exchange:
-                self._initialize_exchange()
-            
-            formatted_symbol = self._format_symbol(symbol)
-            
-            # Map period to CCXT timeframe
-            timeframe_map = {
-                '1m': '1m',
-                '5m': '5m', 
-                '15m': '15m',
-                '30m': '30m',
-                '1h': '1h',
-                '1d': '1d',
-            }
-            timeframe = timeframe_map.get(period, '1d')
-            
-            # Fetch OHLCV data
-            ohlcv = self.exchange.fetch_ohlcv(formatted_symbol, timeframe, limit=count)
-            
-            # Convert to our format
-            klines = []
-            for candle in ohlcv:
-                timestamp_ms = candle[0]
-                open_price = candle[1]
-                high_price = candle[2]
-                low_price = candle[3]
-                close_price = candle[4]
-                volume = candle[5]
-                
-                # Calculate change
-                change = close_price - open_price if open_price else 0
-                percent = (change / open_price * 100) if open_price else 0
-                
-                klines.append({
-                    'timestamp': int(timestamp_ms / 1000),  # Convert to seconds
-                    'datetime_str': datetime.fromtimestamp(timestamp_ms / 1000, tz=timezone.utc).isoformat(),
-                    'open': float(open_price) if open_price else None,
-                    'high': float(high_price) if high_price else None,
-                    'low': float(low_price) if low_price else None,
-                    'close': float(close_price) if close_price else None,
-                    'volume': float(volume) if volume else None,
-                    'amount': float(volume * close_price) if volume and close_price else None,
-                    'change': float(change),
-                    'percent': float(percent),
-                })
-            
-            logger.info(f"Got {len(klines)} klines for {formatted_symbol}")
-            return klines
-            
+            markets = self.get_market_index().by_symbol
+            requested = _map_requested(symbols, markets)
+            if not requested:
+                return {}
+
+            raw = _request("fetch_tickers", self.exchange.fetch_tickers, list(requested.keys()))
+            tickers = _normalize_tickers(raw, requested)
+
+            logger.info(f"Got {len(tickers)}/{len(symbols)} tickers from one bulk ticker request")
+            return tickers
+
+        except (RateLimitExceeded, CircuitOpenError):
+            # Shed or short-circuited requests say nothing about the symbols
+            raise
+        except Exception as e:
+            logger.error(f"Error fetching prices for {symbols}: {e}")
+            return {}
+
+    def get_last_price(self, symbol: str) -> Optional[float]:
+        """Get the last price for a symbol"""
+        ticker = self.get_ticker(symbol)
+        return ticker.last if ticker else None
+
+    def get_last_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """Get the last prices for several symbols with a single bulk ticker request"""
+        return {symbol: ticker.last for symbol, ticker in self.get_tickers(symbols).items()}
+
+    def get_kline_data(self, symbol: str, period: str = '1d', count: int = 100,
+                       since: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get kline/candlestick data for a symbol, optionally starting at since (seconds)"""
+        try:
+            return self.fetch_kline_data(symbol, period, count, since)
         except Exception as e:
             logger.error(f"Error fetching klines for {symbol}: {e}")
             return []
 
+    def fetch_kline_data(self, symbol: str, period: str = '1d', count: int = 100,
+                         since: Optional[int] = None) -> List[Dict[str, Any]]:
+        """get_kline_data that raises upstream errors, for callers that count failures"""
+        if not self.exchange:
+            self._initialize_exchange()
+
+        formatted_symbol = self._format_symbol(symbol)
+        timeframe = TIMEFRAME_MAP.get(period, '1d')
+
+        # Fetch OHLCV data
+        ohlcv = _request("fetch_ohlcv", self.exchange.fetch_ohlcv, formatted_symbol, timeframe,
+                         since=since * 1000 if since else None, limit=count)
+        klines = _convert_ohlcv(ohlcv)
+
+        logger.info(f"Got {len(klines)} klines for {formatted_symbol}")
+        return klines
+
     def get_market_status(self, symbol: str) -> Dict[str, Any]:
         """Get market status for a symbol"""
         try:
-            if not self.exchange:
-                self._initialize_exchange()
-            
             formatted_symbol = self._format_symbol(symbol)
             
             # Hyperliquid is 24/7, but we can check if the market exists
-            markets = self.exchange.load_markets()
+            markets = self.get_market_index().by_symbol
             market_exists = formatted_symbol in markets
             
             status = {
@@ -129,7 +387,7 @@ class HyperliquidClient:
                     'active': market_info.get('active', True),
                 })
             
-            logger.info(f"Market status for {formatted_symbol}: {status['market_status']}")
+            logger.debug(f"Market status for {formatted_symbol}: {status['market_status']}")
             return status
             
         except Exception as e:
@@ -142,52 +400,147 @@ class HyperliquidClient:
 
     def get_all_symbols(self) -> List[str]:
         """Get all available trading symbols"""
+        try:
+            index = self.get_market_index()
+            result = list(index.ranked_symbols)
+            
+            logger.debug(f"Found {len(index.usdc_symbols)} USDC trading pairs, returning {len(result)}")
+            return result
+            
+        except Exception as e:
+            logger.error(f"Error getting symbols: {e}")
+            return ['BTC/USD', 'ETH/USD', 'SOL/USD']  # Fallback popular pairs
+
+    async def get_last_price_async(self, symbol: str) -> Optional[float]:
+        return await async_hyperliquid_client.get_last_price(symbol)
+
+    async def get_last_prices_async(self, symbols: List[str]) -> Dict[str, float]:
+        return await async_hyperliquid_client.get_last_prices(symbols)
+
+    async def get_ticker_async(self, symbol: str) -> Optional[Ticker]:
+        return await async_hyperliquid_client.get_ticker(symbol)
+
+    async def get_tickers_async(self, symbols: List[str]) -> Dict[str, Ticker]:
+        return await async_hyperliquid_client.get_tickers(symbols)
+
+    async def get_kline_data_async(self, symbol: str, period: str = '1d', count: int = 100,
+                                   since: Optional[int] = None) -> List[Dict[str, Any]]:
+        return await async_hyperliquid_client.get_kline_data(symbol, period, count, since)
+
+    async def close(self):
+        await async_hyperliquid_client.close()
+
+    def _format_symbol(self, symbol: str) -> str:
+        """Format symbol for CCXT (e.g., 'BTC' -> 'BTC/USDC:USDC')"""
+        return _format_symbol(symbol)
+
+
+class AsyncHyperliquidClient:
+    """Asyncio-native Hyperliquid client built on CCXT async support
+
+    Used from async routes and the WebSocket handler so market data I/O and
+    rate-limit sleeps never block the event loop.
+    """
+
+    def __init__(self):
+        self.exchange = None
+
+    def _initialize_exchange(self):
+        """Initialize CCXT async Hyperliquid exchange (binds to the running loop on first request)"""
+        try:
+            self.exchange = ccxt_async.hyperliquid({
+                'sandbox': False,  # Set to True for testnet
+                'enableRateLimit': True,
+            })
+            logger.info("Async Hyperliquid exchange initialized successfully")
+        except Exception as e:
+            logger.error(f"Failed to initialize async Hyperliquid exchange: {e}")
+            raise
+
+    async def get_ticker(self, symbol: str) -> Optional[Ticker]:
+        """Get the full normalized ticker for a symbol"""
         try:
             if not self.exchange:
                 self._initialize_exchange()
             
-            markets = self.exchange.load_markets()
-            symbols = list(markets.keys())
+            formatted_symbol = _format_symbol(symbol)
+            raw = await _request_async("fetch_ticker", self.exchange.fetch_ticker, formatted_symbol)
+            ticker = _normalize_ticker(symbol, raw)
             
-            # Filter for USDC pairs (both spot and perpetual)
-            usdc_symbols = [s for s in symbols if '/USDC' in s]
+            logger.info(f"Got ticker for {formatted_symbol}: {ticker.last if ticker else None}")
+            return ticker
             
-            # Prioritize mainstream cryptos (perpetual swaps) and popular spot pairs
-            mainstream_perps = [s for s in usdc_symbols if any(crypto in s for crypto in ['BTC/', 'ETH/', 'SOL/', 'DOGE/', 'BNB/', 'XRP/'])]
-            other_symbols = [s for s in usdc_symbols if s not in mainstream_perps]
+        except (RateLimitExceeded, CircuitOpenError):
+            # Shed or short-circuited requests say nothing about the symbol
+            raise
+        except Exception as e:
+            logger.error(f"Error fetching price for {symbol}: {e}")
+            return None
+
+    async def get_tickers(self, symbols: List[str]) -> Dict[str, Ticker]:
+        """Get full tickers for several symbols with a single bulk ticker request"""
+        try:
+            if not self.exchange:
+                self._initialize_exchange()
+
+            markets = await _request_async("load_markets", self.exchange.load_markets)
+            requested = _map_requested(symbols, markets)
+            if not requested:
+                return {}
+
+            raw = await _request_async("fetch_tickers", self.exchange.fetch_tickers, list(requested.keys()))
+            tickers = _normalize_tickers(raw, requested)
+
+            logger.info(f"Got {len(tickers)}/{len(symbols)} tickers from one bulk ticker request")
+            return tickers
+
+        except (RateLimitExceeded, CircuitOpenError):
+            # Shed or short-circuited requests say nothing about the symbols
+            raise
+        except Exception as e:
+            logger.error(f"Error fetching prices for {symbols}: {e}")
+            return {}
+
+    async def get_last_price(self, symbol: str) -> Optional[float]:
+        """Get the last price for a symbol"""
+        ticker = await self.get_ticker(symbol)
+        return ticker.last if ticker else None
+
+    async def get_last_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """Get the last prices for several symbols with a single bulk ticker request"""
+        return {symbol: ticker.last for symbol, ticker in (await self.get_tickers(symbols)).items()}
+
+    async def get_kline_data(self, symbol: str, period: str = '1d', count: int = 100,
+                             since: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get kline/candlestick data for a symbol, optionally starting at since (seconds)"""
+        try:
+            if not self.exchange:
+                self._initialize_exchange()
             
-            # Return mainstream first, then others
-            result = mainstream_perps + other_symbols[:50]
+            formatted_symbol = _format_symbol(symbol)
+            timeframe = TIMEFRAME_MAP.get(period, '1d')
             
-            logger.info(f"Found {len(usdc_symbols)} USDC trading pairs, returning {len(result)}")
-            return result
+            ohlcv = await _request_async("fetch_ohlcv", self.exchange.fetch_ohlcv, formatted_symbol, timeframe,
+                                         since=since * 1000 if since else None, limit=count)
+            klines = _convert_ohlcv(ohlcv)
+            
+            logger.info(f"Got {len(klines)} klines for {formatted_symbol}")
+            return klines
             
         except Exception as e:
-            logger.error(f"Error getting symbols: {e}")
-            return ['BTC/USD', 'ETH/USD', 'SOL/USD']  # Fallback popular pairs
+            logger.error(f"Error fetching klines for {symbol}: {e}")
+            return []
 
-    def _format_symbol(self, symbol: str) -> str:
-        """Format symbol for CCXT (e.g., 'BTC' -> 'BTC/USDC:USDC')"""
-        if '/' in symbol and ':' in symbol:
-            return symbol
-        elif '/' in symbol:
-            # If it's BTC/USDC, convert to BTC/USDC:USDC for Hyperliquid
-            return f"{symbol}:USDC"
-        
-        # For single symbols like 'BTC', check if it's a mainstream crypto
-        symbol_upper = symbol.upper()
-        mainstream_cryptos = ['BTC', 'ETH', 'SOL', 'DOGE', 'BNB', 'XRP']
-        
-        if symbol_upper in mainstream_cryptos:
-            # Use perpetual swap format for mainstream cryptos
-            return f"{symbol_upper}/USDC:USDC"
-        else:
-            # Use spot format for other cryptos
-            return f"{symbol_upper}/USDC"
+    async def close(self):
+        """Close the underlying HTTP session"""
+        if self.exchange:
+            await self.exchange.close()
+            self.exchange = None
 
 
-# Global client instance
+# Global client instances
 hyperliquid_client = HyperliquidClient()
+async_hyperliquid_client = AsyncHyperliquidClient()
 
 
 def get_last_price_from_hyperliquid(symbol: str) -> Optional[float]:
@@ -195,9 +548,15 @@ def get_last_price_from_hyperliquid(symbol: str) -> Optional[float]:
     return hyperliquid_client.get_last_price(symbol)
 
 
-def get_kline_data_from_hyperliquid(symbol: str, period: str = '1d', count: int = 100) -> List[Dict[str, Any]]:
+def get_last_prices_from_hyperliquid(symbols: List[str]) -> Dict[str, float]:
+    """Get last prices for several symbols from Hyperliquid in one request"""
+    return hyperliquid_client.get_last_prices(symbols)
+
+
+def get_kline_data_from_hyperliquid(symbol: str, period: str = '1d', count: int = 100,
+                                    since: Optional[int] = None) -> List[Dict[str, Any]]:
     """Get kline data from Hyperliquid"""
-    return hyperliquid_client.get_kline_data(symbol, period, count)
+    return hyperliquid_client.get_kline_data(symbol, period, count, since)
 
 
 def get_market_status_from_hyperliquid(symbol: str) -> Dict[str, Any]:
@@ -0,0 +1,215 @@
+"""
+Scheduled kline ingestion
+Fetches newly closed candles of every symbol from get_all_symbols for the
+configured periods and upserts them into crypto_klines (and through it the
+columnar store), so rankings have data without ad-hoc writes
+"""
+
+import contextvars
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from database.connection import SessionLocal
+from repositories.kline_column_repo import kline_columns
+from repositories.kline_repo import KlineRepository
+
+from .kline_store import PERIOD_SECONDS
+from .metrics import registry
+
+logger = logging.getLogger(__name__)
+
+KLINE_INGEST_PERIODS = [p.strip() for p in os.environ.get("KLINE_INGEST_PERIODS", "1d").split(",") if p.strip()]
+KLINE_INGEST_INTERVAL_SECONDS = int(os.environ.get("KLINE_INGEST_INTERVAL_SECONDS", "60"))
+KLINE_INGEST_CONCURRENCY = int(os.environ.get("KLINE_INGEST_CONCURRENCY", "4"))
+# Candles fetched for a symbol without stored data
+KLINE_INGEST_BACKFILL = int(os.environ.get("KLINE_INGEST_BACKFILL", "200"))
+KLINE_INGEST_JOB_ID = "kline_ingestion"
+
+_CANDLES = registry.counter("kline_ingest_candles_total", "Closed candles upserted by the ingestion job", ("period",))
+_FAILURES = registry.counter("kline_ingest_failures_total", "Symbol ingestions that failed", ("period",))
+
+
+class KlineIngestionService:
+    """
+    Upserts closed candles for a symbol universe
+
+    A watermark per (symbol, period) holds the open time of the newest
+    stored candle, loaded from the database on the first run. A symbol is
+    only fetched once a candle newer than its watermark has closed; the
+    fetch starts at the watermark itself so a candle stored while it was
+    still forming is rewritten with its final values. A symbol whose fetch
+    for the last closed period succeeded is not fetched again until the next
+    period closes, even when upstream had no new candle for it.
+    """
+
+    def __init__(self, periods: List[str] = KLINE_INGEST_PERIODS, market: str = "CRYPTO",
+                 concurrency: int = KLINE_INGEST_CONCURRENCY, backfill: int = KLINE_INGEST_BACKFILL,
+                 max_candles: int = 1000):
+        """
+        Args:
+            periods: Periods to ingest, each must be in PERIOD_SECONDS
+            concurrency: Symbols fetched at the same time
+            backfill: Candles fetched for a symbol seen for the first time
+            max_candles: Candles fetched per symbol and run, larger gaps are filled over several runs
+        """
+        unknown = [p for p in periods if p not in PERIOD_SECONDS]
+        if unknown:
+            raise ValueError(f"Unsupported kline ingestion periods: {unknown}")
+        self.periods = periods
+        self.market = market
+        self.concurrency = concurrency
+        self.backfill = backfill
+        self.max_candles = max_candles
+        self._watermarks: Dict[str, Dict[str, int]] = {}
+        # period -> symbol -> last closed candle time the symbol was fetched up to
+        self._checked: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+        self._run_lock = threading.Lock()
+        # SQLite takes one writer at a time, fetches still overlap
+        self._write_lock = threading.Lock()
+        self.last_run: Optional[Dict[str, Any]] = None
+
+    def _load_watermarks(self, period: str) -> Dict[str, int]:
+        with self._lock:
+            watermarks = self._watermarks.get(period)
+        if watermarks is not None:
+            return watermarks
+
+        db = SessionLocal()
+        try:
+            # Candles already in the table reach the columnar store before new ones are appended
+            kline_columns.ensure_imported(db, period, self.market)
+            watermarks = KlineRepository(db).get_latest_timestamps(period, self.market)
+        finally:
+            db.close()
+        with self._lock:
+            return self._watermarks.setdefault(period, watermarks)
+
+    def plan_fetch(self, symbol: str, period: str, now: Optional[float] = None) -> Optional[Tuple[int, int]]:
+        """(since, limit) of the closed candles to fetch, None when nothing new has closed"""
+        period_seconds = PERIOD_SECONDS[period]
+        now = int(now if now is not None else time.time())
+        last_closed = now - now % period_seconds - period_seconds
+        with self._lock:
+            watermark = self._watermarks.get(period, {}).get(symbol)
+            checked = self._checked.get(period, {}).get(symbol)
+        if checked is not None and checked >= last_closed:
+            return None
+        if watermark is None:
+            since = last_closed - (self.backfill - 1) * period_seconds
+        elif watermark >= last_closed:
+            return None
+        else:
+            since = watermark
+        return since, min((last_closed - since) // period_seconds + 1, self.max_candles)
+
+    def ingest_symbol(self, symbol: str, period: str) -> int:
+        """Fetch and upsert the new closed candles of one symbol, returns how many were written"""
+        now = time.time()
+        plan = self.plan_fetch(symbol, period, now)
+        if plan is None:
+            return 0
+        since, limit = plan
+
+        from .market_data import get_market_data_source
+        # Upstream errors propagate and are counted as failures by run
+        klines = get_market_data_source().fetch_kline_data(symbol, period, limit, since)
+        period_seconds = PERIOD_SECONDS[period]
+        last_closed = int(now) - int(now) % period_seconds - period_seconds
+        # The forming candle is left for a later run
+        klines = [k for k in klines if k.get('timestamp') and since <= k['timestamp'] <= last_closed]
+
+        if klines:
+            with self._write_lock:
+                db = SessionLocal()
+                try:
+                    KlineRepository(db).save_kline_data(symbol, self.market, period, klines)
+                finally:
+                    db.close()
+        # Only a complete fetch covers the period, a capped one continues next run
+        complete = limit < self.max_candles or since + (limit - 1) * period_seconds >= last_closed
+        with self._lock:
+            if klines:
+                watermarks = self._watermarks.setdefault(period, {})
+                watermarks[symbol] = max(watermarks.get(symbol, 0), max(k['timestamp'] for k in klines))
+            if complete:
+                self._checked.setdefault(period, {})[symbol] = last_closed
+        if not klines:
+            return 0
+        _CANDLES.inc(period, amount=len(klines))
+        return len(klines)
+
+    def run(self, symbols: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Ingest every configured period for symbols, all symbols from
+        get_all_symbols when None; overlapping runs are skipped
+        """
+        if not self._run_lock.acquire(blocking=False):
+            logger.info("Kline ingestion still running, skipping this run")
+            return {"skipped": True}
+        try:
+            if symbols is None:
+                from .market_data import get_all_symbols
+                symbols = get_all_symbols()
+            started = time.time()
+            written: Dict[str, int] = {}
+            failed: Dict[str, int] = {}
+            with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="kline_ingest") as pool:
+                for period in self.periods:
+                    self._load_watermarks(period)
+                    futures = {symbol: pool.submit(contextvars.copy_context().run, self.ingest_symbol, symbol, period)
+                               for symbol in symbols}
+                    written[period] = 0
+                    failed[period] = 0
+                    for symbol, future in futures.items():
+                        try:
+                            written[period] += future.result()
+                        except Exception as e:
+                            failed[period] += 1
+                            _FAILURES.inc(period)
+                            logger.warning(f"Kline ingestion failed for {symbol}.{self.market} {period}: {e}")
+
+            self.last_run = {
+                "started_at": started,
+                "duration": time.time() - started,
+                "symbols": len(symbols),
+                "candles": written,
+                "failures": failed,
+            }
+            if any(written.values()) or any(failed.values()):
+                logger.info(f"Kline ingestion for {len(symbols)} symbols: candles {written}, failures {failed}")
+            return self.last_run
+        finally:
+            self._run_lock.release()
+
+    def get_status(self) -> Dict[str, Any]:
+        with self._lock:
+            watermarks = {period: len(marks) for period, marks in self._watermarks.items()}
+        return {
+            "periods": self.periods,
+            "market": self.market,
+            "concurrency": self.concurrency,
+            "symbols_with_watermark": watermarks,
+            "last_run": self.last_run,
+        }
+
+
+# Global ingestion service for the configured periods
+kline_ingestion = KlineIngestionService()
+
+
+def run_kline_ingestion():
+    """Scheduler entry point, ingest new closed candles for all symbols"""
+    try:
+        kline_ingestion.run()
+    except Exception as e:
+        logger.error(f"Kline ingestion run failed: {e}")
+
+
+def get_kline_ingestion_status() -> Dict[str, Any]:
+    """Get ingestion configuration, watermark counts and the last run"""
+    return kline_ingestion.get_status()
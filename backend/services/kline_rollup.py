@@ -0,0 +1,233 @@
+"""
+Candle rollup pipeline
+Ingests 1m candles of tracked symbols and aggregates them into the higher
+periods (5m, 15m, 30m, 1h, 1d) of the kline store, so those timeframes are
+served locally instead of being fetched from the exchange one by one
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from .kline_store import PERIOD_SECONDS, kline_store
+
+logger = logging.getLogger(__name__)
+
+MINUTE = PERIOD_SECONDS['1m']
+ROLLUP_PERIODS = tuple(period for period, seconds in PERIOD_SECONDS.items() if seconds > MINUTE)
+# 1m candles kept per symbol: the current and the previous UTC day
+RETAINED_SECONDS = 2 * PERIOD_SECONDS['1d']
+
+
+def _bucket(timestamp: int, period_seconds: int) -> int:
+    return timestamp - timestamp % period_seconds
+
+
+def _values(candles: List[Dict[str, Any]], key: str) -> List[float]:
+    return [c[key] for c in candles if c.get(key) is not None]
+
+
+def aggregate_candles(bucket_start: int, candles: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine consecutive 1m candles into one candle opening at bucket_start"""
+    opens, closes = _values(candles, 'open'), _values(candles, 'close')
+    highs, lows = _values(candles, 'high'), _values(candles, 'low')
+    volumes, amounts = _values(candles, 'volume'), _values(candles, 'amount')
+    open_price = opens[0] if opens else None
+    close_price = closes[-1] if closes else None
+    change = close_price - open_price if open_price and close_price is not None else 0
+
+    return {
+        'timestamp': bucket_start,
+        'datetime_str': datetime.fromtimestamp(bucket_start, tz=timezone.utc).isoformat(),
+        'open': open_price,
+        'high': max(highs) if highs else None,
+        'low': min(lows) if lows else None,
+        'close': close_price,
+        'volume': sum(volumes) if volumes else None,
+        'amount': sum(amounts) if amounts else None,
+        'change': float(change),
+        'percent': float(change / open_price * 100) if open_price else 0.0,
+    }
+
+
+class _MinuteSeries:
+    """Recent 1m candles of one symbol"""
+
+    __slots__ = ("candles", "covered_since", "ingested_at")
+
+    def __init__(self):
+        self.candles: Dict[int, Dict[str, Any]] = {}
+        # Every minute from here to the newest candle has been ingested
+        self.covered_since: Optional[int] = None
+        self.ingested_at = 0.0
+
+
+class KlineRollup:
+    """
+    Rolls 1m candles up into the higher periods of the kline store
+
+    Each ingest only rebuilds the buckets its candles fall into. The newest
+    bucket of every period is the partial bar: it is rebuilt from the
+    minutes seen so far and keeps changing until its period closes. A bucket
+    is only built once every minute since its start has been ingested, so
+    rolled-up candles never miss their opening minutes.
+    """
+
+    def __init__(self, max_age_seconds: float = 90.0, idle_seconds: float = 1800.0):
+        """
+        Args:
+            max_age_seconds: Rolled-up periods are served while the last ingest is at most this old
+            idle_seconds: Requested symbols stop being ingested after this long without a request
+        """
+        self.max_age_seconds = max_age_seconds
+        self.idle_seconds = idle_seconds
+        self._series: Dict[Tuple[str, str], _MinuteSeries] = {}
+        # (symbol, market) -> last request time, None for configured symbols that never expire
+        self._tracked: Dict[Tuple[str, str], Optional[float]] = {}
+        self._lock = threading.Lock()
+        self.ingested_candles = 0
+        self.local_hits = 0
+
+    def track(self, symbol: str, market: str = "CRYPTO", pinned: bool = False):
+        """
+        Include a symbol in the next ingest cycles
+
+        Pinned symbols are ingested for good, others until they go
+        idle_seconds without being tracked again.
+        """
+        key = (symbol, market)
+        with self._lock:
+            if pinned or self._tracked.get(key, 0) is None:
+                self._tracked[key] = None
+            else:
+                self._tracked[key] = time.time()
+
+    def tracked(self, market: str = "CRYPTO") -> List[str]:
+        """Symbols to ingest, dropping idle ones and their candles"""
+        cutoff = time.time() - self.idle_seconds
+        with self._lock:
+            for key in [k for k, seen in self._tracked.items() if seen is not None and seen < cutoff]:
+                del self._tracked[key]
+                self._series.pop(key, None)
+            return sorted(symbol for symbol, m in self._tracked if m == market)
+
+    def plan_fetch(self, symbol: str, market: str = "CRYPTO") -> Tuple[int, int]:
+        """
+        (since, limit) of the 1m candles to fetch next: from the newest known
+        minute, which may still have been forming, or from the start of the
+        current UTC day on the first ingest
+        """
+        now = int(time.time())
+        with self._lock:
+            series = self._series.get((symbol, market))
+            since = max(series.candles) if series and series.candles else _bucket(now, PERIOD_SECONDS['1d'])
+        return since, (now - since) // MINUTE + 1
+
+    def ingest(self, symbol: str, market: str, candles: List[Dict[str, Any]]) -> int:
+        """
+        Add 1m candles and rebuild the higher-period buckets they touch
+
+        Returns:
+            Number of rolled-up candles written to the kline store
+        """
+        candles = sorted((c for c in candles if c.get('timestamp')), key=lambda c: c['timestamp'])
+        if not candles:
+            return 0
+
+        with self._lock:
+            if (symbol, market) not in self._tracked:
+                # Evicted while its candles were being fetched
+                return 0
+            series = self._series.setdefault((symbol, market), _MinuteSeries())
+            first = int(candles[0]['timestamp'])
+            newest = max(series.candles) if series.candles else None
+            if newest is None or first > newest + MINUTE:
+                # Nothing before first is known to be complete
+                series.candles = {}
+                series.covered_since = first
+            for candle in candles:
+                series.candles[int(candle['timestamp'])] = candle
+            newest = max(series.candles)
+
+            cutoff = _bucket(newest, PERIOD_SECONDS['1d']) - RETAINED_SECONDS + PERIOD_SECONDS['1d']
+            if series.covered_since < cutoff:
+                series.candles = {ts: c for ts, c in series.candles.items() if ts >= cutoff}
+                series.covered_since = cutoff
+            series.ingested_at = time.time()
+            self.ingested_candles += len(candles)
+
+            rolled_up = {}
+            for period in ROLLUP_PERIODS:
+                period_seconds = PERIOD_SECONDS[period]
+                start = max(_bucket(first, period_seconds), series.covered_since)
+                if start % period_seconds:
+                    start += period_seconds - start % period_seconds
+                bars = []
+                for bucket_start in range(start, newest + 1, period_seconds):
+                    minutes = [series.candles[ts] for ts in range(bucket_start, bucket_start + period_seconds, MINUTE)
+                               if ts in series.candles]
+                    if minutes:
+                        bars.append(aggregate_candles(bucket_start, minutes))
+                rolled_up[period] = bars
+
+        written = 0
+        for period, bars in rolled_up.items():
+            if bars:
+                kline_store.merge(symbol, period, bars, fetched=False)
+                written += len(bars)
+        return written
+
+    def is_live(self, symbol: str, market: str, period: str) -> bool:
+        """Whether the current bucket of period is being kept up to date from 1m candles"""
+        if period not in ROLLUP_PERIODS:
+            return False
+        with self._lock:
+            series = self._series.get((symbol, market))
+            return (series is not None and series.covered_since is not None
+                    and series.covered_since <= _bucket(int(time.time()), PERIOD_SECONDS[period])
+                    and time.time() - series.ingested_at < self.max_age_seconds)
+
+    def get_klines(self, symbol: str, market: str, period: str, count: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Last count candles of a rolled-up period served locally, None when the
+        rollup does not cover them and they must be fetched
+        """
+        if period not in ROLLUP_PERIODS:
+            return None
+        if not self.is_live(symbol, market, period):
+            return None
+        candles = kline_store.snapshot(symbol, period, count)
+        if len(candles) < count:
+            # Older candles have to come from upstream once
+            return None
+        with self._lock:
+            self.local_hits += 1
+            if self._tracked.get((symbol, market)) is not None:
+                self._tracked[(symbol, market)] = time.time()
+        return candles
+
+    def clear(self):
+        """Drop all ingested candles, tracked symbols are kept"""
+        with self._lock:
+            self._series.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "periods": list(ROLLUP_PERIODS),
+                "tracked_symbols": len(self._tracked),
+                "minute_candles": sum(len(s.candles) for s in self._series.values()),
+                "ingested_candles": self.ingested_candles,
+                "local_hits": self.local_hits,
+            }
+
+
+# Global rollup feeding the kline store
+kline_rollup = KlineRollup()
+
+
+def get_kline_rollup_stats() -> Dict[str, Any]:
+    """Get global rollup statistics"""
+    return kline_rollup.get_stats()
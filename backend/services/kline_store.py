@@ -0,0 +1,157 @@
+"""
+Incremental local kline store
+Keeps candles per (symbol, period) in memory and only fetches the tail since
+the last closed candle, so repeated curve and ranking requests cost almost no
+upstream traffic
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PERIOD_SECONDS = {
+    '1m': 60,
+    '5m': 300,
+    '15m': 900,
+    '30m': 1800,
+    '1h': 3600,
+    '1d': 86400,
+}
+
+# (symbol, period, count, since) -> klines
+KlineFetcher = Callable[[str, str, int, Optional[int]], List[Dict[str, Any]]]
+
+
+class _Series:
+    """Candles of one (symbol, period), ordered by timestamp"""
+
+    __slots__ = ("candles", "last_closed", "synced_at")
+
+    def __init__(self):
+        self.candles: List[Dict[str, Any]] = []
+        self.last_closed: Optional[int] = None  # open timestamp of the newest closed candle
+        self.synced_at = 0.0
+
+
+class KlineStore:
+    """In-memory kline store keyed by (symbol, period)"""
+
+    def __init__(self, max_candles: int = 1000, min_refresh_seconds: float = 5.0):
+        """
+        Args:
+            max_candles: Candles retained per series, older ones are dropped
+            min_refresh_seconds: Serve from memory without checking upstream within this window
+        """
+        self.max_candles = max_candles
+        self.min_refresh_seconds = min_refresh_seconds
+        self._series: Dict[Tuple[str, str], _Series] = {}
+        self._lock = threading.Lock()
+        self.full_fetches = 0
+        self.tail_fetches = 0
+        self.memory_hits = 0
+
+    def get_fresh(self, symbol: str, period: str, count: int) -> Optional[List[Dict[str, Any]]]:
+        """Return the last count candles if the series was synced recently enough"""
+        with self._lock:
+            series = self._series.get((symbol, period))
+            if (series is None or len(series.candles) < count
+                    or time.time() - series.synced_at >= self.min_refresh_seconds):
+                return None
+            self.memory_hits += 1
+            return series.candles[-count:]
+
+    def plan_fetch(self, symbol: str, period: str, count: int) -> Tuple[Optional[int], int]:
+        """
+        Work out what to ask upstream for
+
+        Returns:
+            (since, limit), since is None when the full count must be fetched
+        """
+        period_seconds = PERIOD_SECONDS.get(period, PERIOD_SECONDS['1d'])
+        with self._lock:
+            series = self._series.get((symbol, period))
+            if series is None or series.last_closed is None or len(series.candles) < count:
+                return None, count
+
+            since = series.last_closed + period_seconds
+            missing = int((time.time() - since) // period_seconds) + 1
+            if missing > min(count, self.max_candles):
+                # Gap is larger than what the caller needs, a plain fetch is cheaper
+                return None, count
+            return since, max(missing, 1)
+
+    def merge(self, symbol: str, period: str, klines: List[Dict[str, Any]], replace: bool = False,
+              fetched: bool = True):
+        """
+        Merge candles into the series, newer data wins on equal timestamps
+
+        Args:
+            fetched: The candles came from upstream, False for locally built ones
+        """
+        period_seconds = PERIOD_SECONDS.get(period, PERIOD_SECONDS['1d'])
+        now = time.time()
+        with self._lock:
+            series = self._series.setdefault((symbol, period), _Series())
+            if replace:
+                series.candles = []
+            if fetched:
+                if replace:
+                    self.full_fetches += 1
+                else:
+                    self.tail_fetches += 1
+
+            if klines:
+                first_ts = klines[0]['timestamp']
+                # Fetched candles are contiguous, everything from first_ts on is superseded
+                kept = [c for c in series.candles if c['timestamp'] < first_ts]
+                series.candles = (kept + klines)[-self.max_candles:]
+
+            closed = [c['timestamp'] for c in series.candles if c['timestamp'] + period_seconds <= now]
+            series.last_closed = closed[-1] if closed else None
+            series.synced_at = now
+
+    def get_klines(self, symbol: str, period: str, count: int, fetch: KlineFetcher) -> List[Dict[str, Any]]:
+        """Get the last count candles, fetching only what is not known locally"""
+        cached = self.get_fresh(symbol, period, count)
+        if cached is not None:
+            return cached
+
+        since, limit = self.plan_fetch(symbol, period, count)
+        klines = fetch(symbol, period, limit, since)
+        if since is not None or klines:
+            self.merge(symbol, period, klines, replace=since is None)
+        return self.snapshot(symbol, period, count)
+
+    def snapshot(self, symbol: str, period: str, count: int) -> List[Dict[str, Any]]:
+        """Last count candles currently held for the series"""
+        with self._lock:
+            series = self._series.get((symbol, period))
+            return series.candles[-count:] if series else []
+
+    def clear(self):
+        """Drop all series"""
+        with self._lock:
+            self._series.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get store statistics"""
+        with self._lock:
+            return {
+                "series": len(self._series),
+                "candles": sum(len(s.candles) for s in self._series.values()),
+                "full_fetches": self.full_fetches,
+                "tail_fetches": self.tail_fetches,
+                "memory_hits": self.memory_hits,
+            }
+
+
+# Global kline store instance
+kline_store = KlineStore()
+
+
+def get_kline_store_stats() -> Dict[str, int]:
+    """Get global kline store statistics"""
+    return kline_store.get_stats()
@@ -1,61 +1,465 @@
-from typing import Dict, List, Any
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Dict, List, Any, Set, Tuple
 import logging
-from .hyperliquid_market_data import (
-    get_last_price_from_hyperliquid,
-    get_kline_data_from_hyperliquid,
-    get_market_status_from_hyperliquid,
-    get_all_symbols_from_hyperliquid,
-    hyperliquid_client,
+from .hyperliquid_market_data import hyperliquid_client
+from .market_data_source import MarketDataSource
+
+from .price_cache import (
+    MaxAge,
+    cache_price,
+    get_cached_price,
+    get_cached_price_with_age,
+    price_cache,
+    resolve_max_age,
 )
+from .circuit_breaker import CircuitOpenError, symbol_breakers
+from .rate_limiter import RateLimitExceeded
+from .kline_store import kline_store
+from .kline_rollup import ROLLUP_PERIODS, kline_rollup
+from .ticker_cache import Ticker, ticker_cache
+from .tick_buffer import tick_buffers
+from .single_flight import SingleFlight, AsyncSingleFlight
+from .metrics import registry
 
 logger = logging.getLogger(__name__)
 
+# Upstream every lookup goes through, replaced by a replay source for offline runs
+_source: MarketDataSource = hyperliquid_client
+
+# Concurrent cache misses for the same (symbol, market) share one upstream fetch
+_price_flight = SingleFlight()
+_async_price_flight = AsyncSingleFlight()
+
+# Background revalidation of stale cache entries
+_refresh_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="price_refresh")
+_refresh_pending: Set[Tuple[str, str]] = set()
+_refresh_lock = Lock()
+
+
+def set_market_data_source(source: MarketDataSource):
+    """Switch the upstream market data source, dropping data cached from the previous one"""
+    global _source
+    _source = source
+    price_cache.clear()
+    ticker_cache.clear()
+    tick_buffers.clear()
+    kline_store.clear()
+    kline_rollup.clear()
+    logger.info(f"Market data source set to {source.name}")
+
+
+def get_market_data_source() -> MarketDataSource:
+    return _source
+
+
+def get_last_price(symbol: str, market: str = "CRYPTO", allow_stale: bool = False, max_age: MaxAge = None) -> float:
+    """
+    Get latest price for a symbol
+
+    Args:
+        max_age: Freshness the caller needs, in seconds or as a named class from
+            PRICE_FRESHNESS ("margin", "execution", "trading", "display").
+            All callers share the same cache entry, it is only refreshed when it
+            is older than what this caller accepts. Defaults to the cache TTL.
+        allow_stale: Return a stale cached price (within the cache's max staleness)
+            immediately and refresh it in the background. Display paths only.
+    """
+    if allow_stale:
+        return get_last_price_with_age(symbol, market)[0]
 
-def get_last_price(symbol: str, market: str = "CRYPTO") -> float:
-    key = f"{symbol}.{market}"
-    
     # Check cache first
-    from .price_cache import get_cached_price, cache_price
-    cached_price = get_cached_price(symbol, market)
+    cached_price = get_cached_price(symbol, market, max_age)
     if cached_price is not None:
-        logger.debug(f"Using cached price for {key}: {cached_price}")
         return cached_price
-    
+
+    return _price_flight.do((symbol, market), _fetch_last_price, symbol, market)
+
+
+def get_last_price_with_age(symbol: str, market: str = "CRYPTO") -> Tuple[float, float]:
+    """
+    Stale-while-revalidate price lookup
+
+    Returns (price, age_seconds). Fresh and stale entries are served from memory,
+    stale ones also schedule a background refresh. Beyond the max staleness bound
+    the call blocks on upstream and raises if that fails.
+    """
+    entry = get_cached_price_with_age(symbol, market)
+    if entry is not None:
+        price, age = entry
+        if age >= price_cache.ttl_seconds:
+            _schedule_refresh(symbol, market)
+        return price, age
+
+    return get_last_price(symbol, market), 0.0
+
+
+def _schedule_refresh(symbol: str, market: str):
+    """Refresh a stale cache entry in the background, at most once at a time per key"""
+    key = (symbol, market)
+    with _refresh_lock:
+        if key in _refresh_pending:
+            return
+        _refresh_pending.add(key)
+    # Carry the caller's upstream priority into the refresh thread
+    _refresh_executor.submit(contextvars.copy_context().run, _refresh_price, symbol, market)
+
+
+def _refresh_price(symbol: str, market: str):
+    try:
+        _price_flight.do((symbol, market), _fetch_last_price, symbol, market)
+    except Exception as e:
+        logger.warning(f"Background price refresh failed for {symbol}.{market}: {e}")
+    finally:
+        with _refresh_lock:
+            _refresh_pending.discard((symbol, market))
+
+
+def _fetch_last_price(symbol: str, market: str) -> float:
+    """Fetch a price from upstream and cache it (single-flight leader only)"""
+    key = f"{symbol}.{market}"
+
+    # Fails fast while this symbol's recent failure is negatively cached
+    breaker = symbol_breakers.get(key)
+    breaker.before_call()
+
     logger.info(f"Getting real-time price for {key} from API...")
 
     try:
-        price = get_last_price_from_hyperliquid(symbol)
+        ticker = _source.get_ticker(symbol)
+        price = ticker.last if ticker else None
         if price and price > 0:
-            logger.info(f"Got real-time price for {key} from Hyperliquid: {price}")
-            # Cache the price
+            logger.info(f"Got real-time price for {key} from {_source.name}: {price}")
+            # Cache the full ticker alongside the price, both come from one fetch
+            ticker_cache.set(market, ticker)
             cache_price(symbol, market, price)
+            breaker.record_success()
             return price
-        raise Exception(f"Hyperliquid returned invalid price: {price}")
+        raise Exception(f"{_source.name} returned invalid price: {price}")
+    except (RateLimitExceeded, CircuitOpenError):
+        # The request never reached upstream, not a failure of this symbol
+        breaker.cancel_call()
+        raise
     except Exception as hl_err:
-        logger.error(f"Failed to get price from Hyperliquid: {hl_err}")
+        breaker.record_failure(hl_err)
+        logger.error(f"Failed to get price from {_source.name}: {hl_err}")
         raise Exception(f"Unable to get real-time price for {key}: {hl_err}")
 
 
+def _split_cached(symbols: List[str], market: str, allow_stale: bool,
+                  max_age: MaxAge = None) -> Tuple[Dict[str, float], List[str]]:
+    """Split symbols into cached prices and misses, scheduling refreshes for stale hits"""
+
+    fresh_age = resolve_max_age(max_age)
+    if fresh_age is None:
+        fresh_age = price_cache.ttl_seconds
+
+    prices: Dict[str, float] = {}
+    missing: List[str] = []
+    for symbol in dict.fromkeys(symbols):
+        entry = get_cached_price_with_age(symbol, market)
+        if entry is not None and entry[1] < fresh_age:
+            prices[symbol] = entry[0]
+        elif entry is not None and allow_stale:
+            prices[symbol] = entry[0]
+            _schedule_refresh(symbol, market)
+        else:
+            missing.append(symbol)
+    return prices, missing
+
+
+def _admit_fetch(missing: List[str], market: str) -> List[str]:
+    """Drop symbols whose breaker is open, they are omitted from the result without a request"""
+    admitted = []
+    for symbol in missing:
+        try:
+            symbol_breakers.get(f"{symbol}.{market}").before_call()
+            admitted.append(symbol)
+        except CircuitOpenError:
+            pass
+    return admitted
+
+
+def _cancel_fetch(missing: List[str], market: str):
+    """Release the breakers admitted by _admit_fetch without recording an outcome"""
+    for symbol in missing:
+        symbol_breakers.get(f"{symbol}.{market}").cancel_call()
+
+
+def _cache_fetched(fetched: Dict[str, Ticker], missing: List[str], market: str, prices: Dict[str, float]):
+    """Cache bulk-fetched tickers, merge their prices into prices and settle the symbols' breakers"""
+
+    for symbol, ticker in fetched.items():
+        if ticker.last and ticker.last > 0:
+            ticker_cache.set(market, ticker)
+            cache_price(symbol, market, ticker.last)
+            prices[symbol] = ticker.last
+
+    for symbol in missing:
+        breaker = symbol_breakers.get(f"{symbol}.{market}")
+        if symbol in prices:
+            breaker.record_success()
+        else:
+            breaker.record_failure("no price in bulk ticker response")
+
+    unresolved = [s for s in missing if s not in prices]
+    if unresolved:
+        logger.warning(f"Unable to get real-time prices for {market} symbols: {unresolved}")
+
+
+def get_last_prices(symbols: List[str], market: str = "CRYPTO", allow_stale: bool = False,
+                    max_age: MaxAge = None) -> Dict[str, float]:
+    """
+    Get latest prices for several symbols
+
+    Cached prices are returned as-is and all misses are fetched with a single
+    bulk ticker request. Symbols whose price cannot be obtained are omitted.
+    max_age and allow_stale behave as in get_last_price.
+    """
+    prices, missing = _split_cached(symbols, market, allow_stale, max_age)
+    missing = _admit_fetch(missing, market)
+    if not missing:
+        return prices
+
+    logger.info(f"Getting real-time prices for {len(missing)} symbols from API: {missing}")
+
+    try:
+        fetched = _source.get_tickers(missing)
+    except (RateLimitExceeded, CircuitOpenError) as e:
+        # Shed or short-circuited, the symbols' breakers learn nothing from it
+        logger.warning(f"Bulk price request not sent: {e}")
+        _cancel_fetch(missing, market)
+        return prices
+    except Exception as e:
+        logger.error(f"Bulk price request failed: {e}")
+        fetched = {}
+    _cache_fetched(fetched, missing, market, prices)
+    return prices
+
+
+def get_ticker(symbol: str, market: str = "CRYPTO", max_age: MaxAge = None) -> Ticker:
+    """
+    Get the full ticker (bid/ask/mark/volume/funding) for a symbol
+
+    Served from the ticker cache when it is at most max_age old, otherwise
+    fetched together with the price through the same single-flight lookup
+    get_last_price uses. Raises if no ticker can be obtained.
+    """
+    ticker = ticker_cache.get(symbol, market, resolve_max_age(max_age))
+    if ticker is not None:
+        return ticker
+
+    _price_flight.do((symbol, market), _fetch_last_price, symbol, market)
+    ticker = ticker_cache.get(symbol, market, resolve_max_age(max_age))
+    if ticker is None:
+        raise Exception(f"Unable to get ticker for {symbol}.{market}")
+    return ticker
+
+
+def get_tickers(symbols: List[str], market: str = "CRYPTO", max_age: MaxAge = None) -> Dict[str, Ticker]:
+    """Get full tickers for several symbols, misses are fetched with one bulk request"""
+    tickers, missing = _split_cached_tickers(symbols, market, max_age)
+    if missing:
+        get_last_prices(missing, market, max_age=0)
+        tickers.update(_split_cached_tickers(missing, market, None)[0])
+    return tickers
+
+
+def _split_cached_tickers(symbols: List[str], market: str,
+                          max_age: MaxAge) -> Tuple[Dict[str, Ticker], List[str]]:
+    fresh_age = resolve_max_age(max_age)
+    tickers: Dict[str, Ticker] = {}
+    missing: List[str] = []
+    for symbol in dict.fromkeys(symbols):
+        ticker = ticker_cache.get(symbol, market, fresh_age)
+        if ticker is not None:
+            tickers[symbol] = ticker
+        else:
+            missing.append(symbol)
+    return tickers, missing
+
+
 def get_kline_data(symbol: str, market: str = "CRYPTO", period: str = "1d", count: int = 100) -> List[Dict[str, Any]]:
     key = f"{symbol}.{market}"
 
+    rolled_up = kline_rollup.get_klines(symbol, market, period, count)
+    if rolled_up is not None:
+        return rolled_up
+
     try:
-        data = get_kline_data_from_hyperliquid(symbol, period, count)
+        data = kline_store.get_klines(symbol, period, count, _source.get_kline_data)
         if data:
-            logger.info(f"Got K-line data for {key} from Hyperliquid, total {len(data)} items")
+            # Upstream knows the symbol, roll it up from now on
+            if period in ROLLUP_PERIODS:
+                kline_rollup.track(symbol, market)
+            logger.info(f"Got K-line data for {key} from {_source.name}, total {len(data)} items")
             return data
-        raise Exception("Hyperliquid returned empty K-line data")
+        raise Exception(f"{_source.name} returned empty K-line data")
     except Exception as hl_err:
-        logger.error(f"Failed to get K-line data from Hyperliquid: {hl_err}")
+        logger.error(f"Failed to get K-line data from {_source.name}: {hl_err}")
         raise Exception(f"Unable to get K-line data for {key}: {hl_err}")
 
 
+async def get_last_price_async(symbol: str, market: str = "CRYPTO", allow_stale: bool = False,
+                               max_age: MaxAge = None) -> float:
+    """Awaitable get_last_price for async routes, never blocks the event loop"""
+    if allow_stale:
+        return (await get_last_price_with_age_async(symbol, market))[0]
+
+    cached_price = get_cached_price(symbol, market, max_age)
+    if cached_price is not None:
+        return cached_price
+
+    return await _async_price_flight.do((symbol, market), _fetch_last_price_async, symbol, market)
+
+
+async def get_last_price_with_age_async(symbol: str, market: str = "CRYPTO") -> Tuple[float, float]:
+    """Awaitable stale-while-revalidate lookup, see get_last_price_with_age"""
+    entry = get_cached_price_with_age(symbol, market)
+    if entry is not None:
+        price, age = entry
+        if age >= price_cache.ttl_seconds:
+            _schedule_refresh(symbol, market)
+        return price, age
+
+    return await get_last_price_async(symbol, market), 0.0
+
+
+async def _fetch_last_price_async(symbol: str, market: str) -> float:
+    """Fetch a price from upstream without blocking the event loop and cache it"""
+    key = f"{symbol}.{market}"
+
+    breaker = symbol_breakers.get(key)
+    breaker.before_call()
+
+    logger.info(f"Getting real-time price for {key} from async API...")
+
+    try:
+        ticker = await _source.get_ticker_async(symbol)
+        price = ticker.last if ticker else None
+        if price and price > 0:
+            ticker_cache.set(market, ticker)
+            cache_price(symbol, market, price)
+            breaker.record_success()
+            return price
+        raise Exception(f"{_source.name} returned invalid price: {price}")
+    except (RateLimitExceeded, CircuitOpenError):
+        # The request never reached upstream, not a failure of this symbol
+        breaker.cancel_call()
+        raise
+    except Exception as hl_err:
+        breaker.record_failure(hl_err)
+        logger.error(f"Failed to get price from {_source.name}: {hl_err}")
+        raise Exception(f"Unable to get real-time price for {key}: {hl_err}")
+
+
+async def get_last_prices_async(symbols: List[str], market: str = "CRYPTO", allow_stale: bool = False,
+                                max_age: MaxAge = None) -> Dict[str, float]:
+    """Awaitable get_last_prices for async routes, never blocks the event loop"""
+    prices, missing = _split_cached(symbols, market, allow_stale, max_age)
+    missing = _admit_fetch(missing, market)
+    if not missing:
+        return prices
+
+    try:
+        fetched = await _source.get_tickers_async(missing)
+    except (RateLimitExceeded, CircuitOpenError) as e:
+        # Shed or short-circuited, the symbols' breakers learn nothing from it
+        logger.warning(f"Bulk price request not sent: {e}")
+        _cancel_fetch(missing, market)
+        return prices
+    except Exception as e:
+        logger.error(f"Bulk price request failed: {e}")
+        fetched = {}
+    _cache_fetched(fetched, missing, market, prices)
+    return prices
+
+
+async def get_tickers_async(symbols: List[str], market: str = "CRYPTO",
+                            max_age: MaxAge = None) -> Dict[str, Ticker]:
+    """Awaitable get_tickers for async routes, never blocks the event loop"""
+    tickers, missing = _split_cached_tickers(symbols, market, max_age)
+    if missing:
+        await get_last_prices_async(missing, market, max_age=0)
+        tickers.update(_split_cached_tickers(missing, market, None)[0])
+    return tickers
+
+
+async def get_kline_data_async(symbol: str, market: str = "CRYPTO", period: str = "1d", count: int = 100) -> List[Dict[str, Any]]:
+    """Awaitable get_kline_data for async routes, never blocks the event loop"""
+    key = f"{symbol}.{market}"
+
+    rolled_up = kline_rollup.get_klines(symbol, market, period, count)
+    if rolled_up is not None:
+        return rolled_up
+
+    try:
+        data = kline_store.get_fresh(symbol, period, count)
+        if data is None:
+            since, limit = kline_store.plan_fetch(symbol, period, count)
+            klines = await _source.get_kline_data_async(symbol, period, limit, since)
+            if since is not None or klines:
+                kline_store.merge(symbol, period, klines, replace=since is None)
+            data = kline_store.snapshot(symbol, period, count)
+        if data:
+            # Upstream knows the symbol, roll it up from now on
+            if period in ROLLUP_PERIODS:
+                kline_rollup.track(symbol, market)
+            logger.info(f"Got K-line data for {key} from {_source.name}, total {len(data)} items")
+            return data
+        raise Exception(f"{_source.name} returned empty K-line data")
+    except Exception as hl_err:
+        logger.error(f"Failed to get K-line data from {_source.name}: {hl_err}")
+        raise Exception(f"Unable to get K-line data for {key}: {hl_err}")
+
+
+def refresh_kline_rollup(market: str = "CRYPTO"):
+    """Fetch new 1m candles of the symbols the rollup tracks and roll them up into higher periods"""
+    for symbol in kline_rollup.tracked(market):
+        since, limit = kline_rollup.plan_fetch(symbol, market)
+        try:
+            klines = _source.get_kline_data(symbol, '1m', limit, since)
+            written = kline_rollup.ingest(symbol, market, klines)
+            logger.debug(f"Rolled {len(klines)} 1m candles of {symbol}.{market} up into {written} candles")
+        except Exception as e:
+            logger.warning(f"Kline rollup failed for {symbol}.{market}: {e}")
+
+
+async def close_async_clients():
+    """Close async exchange sessions on shutdown"""
+    await _source.close()
+
+
+def get_price_fetch_stats() -> Dict[str, Dict[str, int]]:
+    """Get single-flight statistics for upstream price fetches"""
+    return {
+        "sync": _price_flight.get_stats(),
+        "async": _async_price_flight.get_stats(),
+    }
+
+
+_FETCHES = registry.counter("price_fetches_total", "Upstream price fetches by single-flight outcome",
+                            ("path", "result"))
+_FETCHES_IN_FLIGHT = registry.gauge("price_fetches_in_flight", "Upstream price fetches in progress", ("path",))
+
+
+def _collect_price_fetch_metrics():
+    for path, stats in get_price_fetch_stats().items():
+        _FETCHES.set_total(stats["executed"], path, "executed")
+        _FETCHES.set_total(stats["deduplicated"], path, "deduplicated")
+        _FETCHES_IN_FLIGHT.set(stats["in_flight"], path)
+
+
+registry.add_collector(_collect_price_fetch_metrics)
+
+
 def get_market_status(symbol: str, market: str = "CRYPTO") -> Dict[str, Any]:
     key = f"{symbol}.{market}"
 
     try:
-        status = get_market_status_from_hyperliquid(symbol)
-        logger.info(f"Retrieved market status for {key} from Hyperliquid: {status.get('market_status')}")
+        status = _source.get_market_status(symbol)
+        logger.info(f"Retrieved market status for {key} from {_source.name}: {status.get('market_status')}")
         return status
     except Exception as hl_err:
         logger.error(f"Failed to get market status: {hl_err}")
@@ -65,8 +469,8 @@ def get_market_status(symbol: str, market: str = "CRYPTO") -> Dict[str, Any]:
 def get_all_symbols() -> List[str]:
     """Get all available trading pairs"""
     try:
-        symbols = get_all_symbols_from_hyperliquid()
-        logger.info(f"Got {len(symbols)} trading pairs from Hyperliquid")
+        symbols = _source.get_all_symbols()
+        logger.info(f"Got {len(symbols)} trading pairs from {_source.name}")
         return symbols
     except Exception as hl_err:
         logger.error(f"Failed to get trading pairs list: {hl_err}")
@@ -0,0 +1,74 @@
+"""
+Market data source interface
+Everything services/market_data.py needs from an upstream, implemented by the
+Hyperliquid client and by the file-backed replay source
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+from .ticker_cache import Ticker
+
+
+class MarketDataSource(ABC):
+    """Upstream market data provider"""
+
+    name = "base"
+
+    @abstractmethod
+    def get_last_price(self, symbol: str) -> Optional[float]:
+        """Last price for a symbol, None when unavailable"""
+
+    @abstractmethod
+    def get_last_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """Last prices for several symbols, unavailable symbols are omitted"""
+
+    def get_ticker(self, symbol: str) -> Optional[Ticker]:
+        """Full ticker for a symbol, sources without one only report the last price"""
+        price = self.get_last_price(symbol)
+        return Ticker(symbol=symbol, last=price) if price else None
+
+    def get_tickers(self, symbols: List[str]) -> Dict[str, Ticker]:
+        """Full tickers for several symbols, unavailable symbols are omitted"""
+        return {symbol: Ticker(symbol=symbol, last=price) for symbol, price in self.get_last_prices(symbols).items()}
+
+    @abstractmethod
+    def get_kline_data(self, symbol: str, period: str = '1d', count: int = 100,
+                       since: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Candles in kline format, optionally starting at since (seconds)"""
+
+    def fetch_kline_data(self, symbol: str, period: str = '1d', count: int = 100,
+                         since: Optional[int] = None) -> List[Dict[str, Any]]:
+        """get_kline_data that raises upstream errors instead of returning no candles"""
+        return self.get_kline_data(symbol, period, count, since)
+
+    @abstractmethod
+    def get_market_status(self, symbol: str) -> Dict[str, Any]:
+        """Market status for a symbol"""
+
+    @abstractmethod
+    def get_all_symbols(self) -> List[str]:
+        """All tradable symbols"""
+
+    # Awaitable variants used by async routes. The defaults call the sync
+    # methods directly, which is fine for in-memory sources; network-backed
+    # sources override them with non-blocking implementations.
+
+    async def get_last_price_async(self, symbol: str) -> Optional[float]:
+        return self.get_last_price(symbol)
+
+    async def get_last_prices_async(self, symbols: List[str]) -> Dict[str, float]:
+        return self.get_last_prices(symbols)
+
+    async def get_ticker_async(self, symbol: str) -> Optional[Ticker]:
+        return self.get_ticker(symbol)
+
+    async def get_tickers_async(self, symbols: List[str]) -> Dict[str, Ticker]:
+        return self.get_tickers(symbols)
+
+    async def get_kline_data_async(self, symbol: str, period: str = '1d', count: int = 100,
+                                   since: Optional[int] = None) -> List[Dict[str, Any]]:
+        return self.get_kline_data(symbol, period, count, since)
+
+    async def close(self):
+        """Release resources held by the source"""
@@ -0,0 +1,324 @@
+"""
+Metrics registry
+Counters, gauges and histograms rendered in the Prometheus text exposition
+format. Updates are a dict lookup plus an add under a per-metric lock, cheap
+enough to leave on in production; anything derived from other state is
+computed by collectors at scrape time only.
+"""
+
+import bisect
+import logging
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+
+def _format_labels(names: Sequence[str], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric(ABC):
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+    @abstractmethod
+    def _samples(self) -> Iterable[str]:
+        """Sample lines of the metric, without HELP and TYPE"""
+
+
+class Counter(_Metric):
+    """Monotonically increasing count"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def set_total(self, value: float, *labels: str):
+        """Publish a total maintained elsewhere, used by scrape-time collectors"""
+        with self._lock:
+            self._values[labels] = value
+
+    def _samples(self) -> Iterable[str]:
+        with self._lock:
+            items = list(self._values.items())
+        for labels, value in items:
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class Gauge(_Metric):
+    """Value that can go up and down"""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def set(self, value: float, *labels: str):
+        with self._lock:
+            self._values[labels] = value
+
+    def replace(self, values: Dict[LabelValues, float]):
+        """Swap in a complete set of samples, used by scrape-time collectors"""
+        with self._lock:
+            self._values = dict(values)
+
+    def _samples(self) -> Iterable[str]:
+        with self._lock:
+            items = list(self._values.items())
+        for labels, value in items:
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class Histogram(_Metric):
+    """Distribution of observations over fixed buckets"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (+Inf last), sum, count]
+        self._values: Dict[LabelValues, list] = {}
+
+    def observe(self, value: float, *labels: str):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                state = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, *labels: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def _samples(self) -> Iterable[str]:
+        with self._lock:
+            items = [(labels, (list(state[0]), state[1], state[2])) for labels, state in self._values.items()]
+        for labels, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(float(bound))}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, labels)} {count}"
+
+
+class MetricsRegistry:
+    """Holds metrics and scrape-time collectors"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def add_collector(self, collector: Callable[[], None]):
+        """Register a callable that refreshes gauges right before each scrape"""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Render all metrics in the text exposition format"""
+        with self._lock:
+            collectors = list(self._collectors)
+            metrics = list(self._metrics.values())
+        for collector in collectors:
+            try:
+                collector()
+            except Exception as e:
+                logger.warning(f"Metrics collector {collector.__name__} failed: {e}")
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Global metrics registry
+registry = MetricsRegistry()
+
+
+# Upstream market data calls
+UPSTREAM_CALLS = registry.counter(
+    "upstream_requests_total", "Upstream market data requests", ("source", "endpoint"))
+UPSTREAM_ERRORS = registry.counter(
+    "upstream_errors_total", "Upstream market data requests that raised", ("source", "endpoint"))
+UPSTREAM_LATENCY = registry.histogram(
+    "upstream_request_duration_seconds", "Upstream market data request latency", ("source", "endpoint"))
+
+
+@contextmanager
+def observe_upstream(endpoint: str, source: str = "hyperliquid"):
+    """Count and time one upstream request, works around awaits as well"""
+    start = time.perf_counter()
+    UPSTREAM_CALLS.inc(source, endpoint)
+    try:
+        yield
+    except Exception:
+        UPSTREAM_ERRORS.inc(source, endpoint)
+        raise
+    finally:
+        UPSTREAM_LATENCY.observe(time.perf_counter() - start, source, endpoint)
+
+
+# Database queries
+DB_QUERIES = registry.counter("db_queries_total", "SQL statements executed", ("statement",))
+DB_ERRORS = registry.counter("db_query_errors_total", "SQL statements that raised", ("statement",))
+DB_LATENCY = registry.histogram(
+    "db_query_duration_seconds", "SQL statement latency", ("statement",), buckets=DB_BUCKETS)
+
+_STATEMENT_TYPES = ("SELECT", "INSERT", "UPDATE", "DELETE")
+
+
+def _statement_type(statement: str) -> str:
+    head = statement.lstrip()[:6].upper()
+    return head if head in _STATEMENT_TYPES else "OTHER"
+
+
+def instrument_engine(engine):
+    """Attach query count/latency listeners to a SQLAlchemy engine"""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("metrics_query_start")
+        if not starts:
+            return
+        statement_type = _statement_type(statement)
+        DB_QUERIES.inc(statement_type)
+        DB_LATENCY.observe(time.perf_counter() - starts.pop(), statement_type)
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(context):
+        starts = context.connection.info.get("metrics_query_start") if context.connection is not None else None
+        if starts:
+            starts.pop()
+        DB_ERRORS.inc(_statement_type(context.statement or ""))
+
+
+# Scheduled jobs
+JOB_RUNS = registry.counter("scheduler_job_runs_total", "Scheduled job executions", ("job", "status"))
+JOB_MISFIRES = registry.counter("scheduler_job_misfires_total", "Scheduled runs missed past their grace time", ("job",))
+JOB_OVERLAPS = registry.counter(
+    "scheduler_job_overlaps_total", "Runs skipped because the previous run was still executing", ("job",))
+JOB_DURATION = registry.histogram("scheduler_job_duration_seconds", "Scheduled job run time", ("job",))
+
+# Per-account job ids would make one series per account
+_JOB_ID_SUFFIX = re.compile(r"_\d+$")
+
+
+def _job_label(job_id: str) -> str:
+    return _JOB_ID_SUFFIX.sub("", job_id)
+
+
+def instrument_scheduler(scheduler):
+    """Attach job duration/misfire/overlap listeners to an APScheduler scheduler"""
+    from apscheduler.events import (
+        EVENT_JOB_ERROR,
+        EVENT_JOB_EXECUTED,
+        EVENT_JOB_MAX_INSTANCES,
+        EVENT_JOB_MISSED,
+        EVENT_JOB_SUBMITTED,
+    )
+
+    started: Dict[Tuple[str, object], float] = {}
+    lock = threading.Lock()
+
+    def _listener(event):
+        job = _job_label(event.job_id)
+        if event.code == EVENT_JOB_SUBMITTED:
+            now = time.perf_counter()
+            with lock:
+                for run_time in event.scheduled_run_times:
+                    started[(event.job_id, run_time)] = now
+        elif event.code in (EVENT_JOB_EXECUTED, EVENT_JOB_ERROR):
+            with lock:
+                start: Optional[float] = started.pop((event.job_id, event.scheduled_run_time), None)
+            JOB_RUNS.inc(job, "error" if event.code == EVENT_JOB_ERROR else "success")
+            if start is not None:
+                JOB_DURATION.observe(time.perf_counter() - start, job)
+        elif event.code == EVENT_JOB_MISSED:
+            with lock:
+                started.pop((event.job_id, event.scheduled_run_time), None)
+            JOB_MISFIRES.inc(job)
+        elif event.code == EVENT_JOB_MAX_INSTANCES:
+            JOB_OVERLAPS.inc(job)
+
+    scheduler.add_listener(
+        _listener,
+        EVENT_JOB_SUBMITTED | EVENT_JOB_EXECUTED | EVENT_JOB_ERROR | EVENT_JOB_MISSED | EVENT_JOB_MAX_INSTANCES,
+    )
+
+
+def render_metrics() -> str:
+    """Render the global registry"""
+    return registry.render()
@@ -7,7 +7,8 @@ from database.models import (
     CRYPTO_TAKER_FEE_RATE, CRYPTO_INTEREST_RATE_HOURLY, CRYPTO_MAX_LEVERAGE,
     CRYPTO_MIN_ORDER_QUANTITY, CRYPTO_LOT_SIZE, CRYPTO_MAINTENANCE_MARGIN_RATIO
 )
-from .market_data import get_last_price
+from .price_snapshot import PriceSnapshot, snapshot_price
+from .rate_limiter import Priority, request_priority
 
 
 def _calc_crypto_fee(notional: Decimal, leverage: int = 1) -> Decimal:
@@ -43,7 +44,8 @@ def place_and_execute_crypto(
     order_type: str,
     price: float | None,
     quantity: float,
-    leverage: int = 1
+    leverage: int = 1,
+    snapshot: PriceSnapshot | None = None
 ) -> Order:
     """
     Place and execute a CRYPTO order with leverage support.
@@ -54,6 +56,7 @@ def place_and_execute_crypto(
         side: 'LONG' (open long) / 'SHORT' (open short) / 'BUY' (close short) / 'SELL' (close long)
         leverage: Leverage multiplier (1 = spot, 2-50 = leveraged)
         quantity: Amount in base currency (e.g., BTC amount for BTC/USDT)
+        snapshot: Price snapshot of the current cycle, used for market orders while fresh enough for execution
     
     Returns:
         Executed Order
@@ -66,7 +69,11 @@ def place_and_execute_crypto(
         raise ValueError(f"Quantity must be >= {CRYPTO_MIN_ORDER_QUANTITY}")
     
     # Get execution price
-    exec_price = Decimal(str(price if (order_type == "LIMIT" and price) else get_last_price(symbol, "CRYPTO")))
+    if order_type == "LIMIT" and price:
+        exec_price = Decimal(str(price))
+    else:
+        with request_priority(Priority.EXECUTION):
+            exec_price = Decimal(str(snapshot_price(snapshot, symbol, "CRYPTO", max_age="execution")))
     notional = exec_price * Decimal(str(quantity))
     
     # Calculate fees
@@ -11,6 +11,8 @@ import logging
 
 from database.models import Order, Position, Trade, Account, User, CRYPTO_MIN_COMMISSION, CRYPTO_COMMISSION_RATE, CRYPTO_MIN_ORDER_QUANTITY, CRYPTO_LOT_SIZE
 from .market_data import get_last_price
+from .price_snapshot import PriceSnapshot, capture_price_snapshot, snapshot_price
+from .rate_limiter import Priority, request_priority
 
 logger = logging.getLogger(__name__)
 
@@ -61,7 +63,8 @@ def create_order(db: Session, account: Account, symbol: str, name: str,
     if order_type == "MARKET":
         # Market order: get current price for fund validation
         try:
-            current_market_price = get_last_price(symbol)
+            with request_priority(Priority.EXECUTION):
+                current_market_price = get_last_price(symbol, max_age="execution")
         except Exception as err:
             raise ValueError(f"Unable to get market price for market order: {err}")
         check_price = Decimal(str(current_market_price))
@@ -121,7 +124,7 @@ def create_order(db: Session, account: Account, symbol: str, name: str,
     return order
 
 
-def check_and_execute_order(db: Session, order: Order) -> bool:
+def check_and_execute_order(db: Session, order: Order, snapshot: Optional[PriceSnapshot] = None) -> bool:
     """
     Check and execute limit order
 
@@ -132,6 +135,7 @@ def check_and_execute_order(db: Session, order: Order) -> bool:
     Args:
         db: Database session
         order: Order to check
+        snapshot: Price snapshot of the current tick, used while fresh enough for execution
 
     Returns:
         Whether order was executed
@@ -142,7 +146,8 @@ def check_and_execute_order(db: Session, order: Order) -> bool:
     # Check if cookie is configured, skip order checking if not
     try:
         # Get current market price
-        current_price = get_last_price(order.symbol, order.market)
+        with request_priority(Priority.EXECUTION):
+            current_price = snapshot_price(snapshot, order.symbol, order.market, max_age="execution")
         current_price_decimal = Decimal(str(current_price))
 
         # Get user information
@@ -422,9 +427,19 @@ def process_all_pending_orders(db: Session) -> Tuple[int, int]:
     """
     pending_orders = get_pending_orders(db)
     executed_count = 0
-    
+
+    # One bulk price lookup per market for the whole tick
+    snapshots = {}
+    for market in {order.market for order in pending_orders}:
+        symbols = [order.symbol for order in pending_orders if order.market == market]
+        try:
+            with request_priority(Priority.EXECUTION):
+                snapshots[market] = capture_price_snapshot(symbols, market, max_age="execution")
+        except Exception as e:
+            logger.warning(f"Failed to capture {market} price snapshot, checking orders one by one: {e}")
+
     for order in pending_orders:
-        if check_and_execute_order(db, order):
+        if check_and_execute_order(db, order, snapshots.get(order.market)):
             executed_count += 1
     
     logger.info(f"Processing pending orders: checked {len(pending_orders)} orders, executed {executed_count} orders")
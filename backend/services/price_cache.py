@@ -3,95 +3,253 @@ Price caching service to reduce API calls and improve performance
 """
 
 import time
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 import logging
 from threading import Lock
 
+from .metrics import registry
+from .tick_buffer import record_tick
+from .tick_log import log_tick
+from .shared_price_table import publish_shared_price, read_shared_price
+
 logger = logging.getLogger(__name__)
 
+# Named freshness classes: maximum acceptable price age (seconds) per consumer
+PRICE_FRESHNESS: Dict[str, float] = {
+    "margin": 2.0,      # margin monitor / liquidation checks
+    "execution": 5.0,   # order execution and matching
+    "trading": 15.0,    # AI decision cycle
+    "display": 30.0,    # UI, snapshots, rankings
+}
+
+MaxAge = Union[float, str, None]
+
+
+def resolve_max_age(max_age: MaxAge) -> Optional[float]:
+    """Resolve a max_age given in seconds or as a named freshness class"""
+    if max_age is None or isinstance(max_age, (int, float)):
+        return max_age
+    try:
+        return PRICE_FRESHNESS[max_age]
+    except KeyError:
+        raise ValueError(f"Unknown freshness class '{max_age}', expected one of {list(PRICE_FRESHNESS)}")
+
 
 class PriceCache:
-    """Simple in-memory price cache with TTL"""
-    
-    def __init__(self, ttl_seconds: int = 30):
-        self.cache: Dict[Tuple[str, str], Tuple[float, float]] = {}  # key: (symbol, market), value: (price, timestamp)
+    """
+    In-memory price cache with TTL and stale-while-revalidate support
+
+    Entries are fresh for ttl_seconds. Past that they are kept as stale until
+    max_staleness_seconds so display paths can still be served while a refresh
+    runs in the background.
+
+    Reads are lock-free: entries are immutable (price, timestamp) tuples and a
+    single dict lookup is atomic. Writers and lazy expiry take the lock of the
+    key's shard only, so there is no global lock and no periodic sweep.
+    """
+
+    def __init__(self, ttl_seconds: int = 30, max_staleness_seconds: int = 300, shards: int = 16):
         self.ttl_seconds = ttl_seconds
-        self.lock = Lock()
-    
-    def get(self, symbol: str, market: str) -> Optional[float]:
-        """Get cached price if still valid"""
+        self.max_staleness_seconds = max(max_staleness_seconds, ttl_seconds)
+        self._shards: List[Dict[Tuple[str, str], Tuple[float, float]]] = [{} for _ in range(shards)]
+        self._locks = [Lock() for _ in range(shards)]
+        # Unsynchronized counters: a rare lost increment is fine for metrics and
+        # keeps the read path free of locks
+        self.hits = 0
+        self.misses = 0
+        # Bumped on every write so persistence can tell whether anything changed
+        self.version = 0
+
+    def _shard(self, key: Tuple[str, str]) -> int:
+        return hash(key) % len(self._shards)
+
+    def get(self, symbol: str, market: str, max_age: Optional[float] = None) -> Optional[float]:
+        """
+        Get cached price if still fresh
+
+        Args:
+            max_age: Freshness required by the caller in seconds, defaults to the cache TTL
+        """
+        if max_age is None:
+            max_age = self.ttl_seconds
+        entry = self._lookup(symbol, market)
+        if entry is not None and entry[1] < max_age:
+            self.hits += 1
+            return entry[0]
+        self.misses += 1
+        return None
+
+    def get_with_age(self, symbol: str, market: str) -> Optional[Tuple[float, float]]:
+        """Get cached (price, age in seconds), including stale entries within max staleness"""
+        entry = self._lookup(symbol, market)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def _lookup(self, symbol: str, market: str) -> Optional[Tuple[float, float]]:
         key = (symbol, market)
-        current_time = time.time()
-        
-        with self.lock:
-            if key in self.cache:
-                price, timestamp = self.cache[key]
-                if current_time - timestamp < self.ttl_seconds:
-                    logger.debug(f"Cache hit for {symbol}.{market}: {price}")
-                    return price
-                else:
-                    # Remove expired entry
-                    del self.cache[key]
-                    logger.debug(f"Cache expired for {symbol}.{market}")
-        
+        index = self._shard(key)
+        entry = self._shards[index].get(key)
+        if entry is None:
+            return None
+
+        age = time.time() - entry[1]
+        if age <= self.max_staleness_seconds:
+            return entry[0], age
+
+        # Too stale to serve at all, drop it unless a writer replaced it meanwhile
+        with self._locks[index]:
+            if self._shards[index].get(key) is entry:
+                del self._shards[index][key]
+        logger.debug("Cache expired for %s.%s", symbol, market)
         return None
-    
+
     def set(self, symbol: str, market: str, price: float):
         """Cache a price with current timestamp"""
         key = (symbol, market)
-        current_time = time.time()
-        
-        with self.lock:
-            self.cache[key] = (price, current_time)
-            logger.debug(f"Cached price for {symbol}.{market}: {price}")
-    
+        index = self._shard(key)
+        with self._locks[index]:
+            self._shards[index][key] = (price, time.time())
+            self.version += 1
+
+    def restore(self, symbol: str, market: str, price: float, timestamp: float) -> Tuple[float, float]:
+        """
+        Seed a price recovered from a previous run
+
+        The entry keeps the time the price was observed, so it ages and
+        expires like any other entry; prices already cached are not replaced.
+        """
+        key = (symbol, market)
+        index = self._shard(key)
+        with self._locks[index]:
+            return self._shards[index].setdefault(key, (price, min(timestamp, time.time())))
+
+    def clear(self):
+        """Drop all entries"""
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                shard.clear()
+
     def clear_expired(self):
-        """Remove all expired entries"""
+        """Remove all entries past the max staleness bound, one shard at a time"""
+        cutoff = time.time() - self.max_staleness_seconds
+        removed = 0
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                expired_keys = [key for key, (_, timestamp) in shard.items() if timestamp < cutoff]
+                for key in expired_keys:
+                    del shard[key]
+            removed += len(expired_keys)
+
+        if removed:
+            logger.debug("Cleared %d expired cache entries", removed)
+
+    def get_entries(self) -> Dict[Tuple[str, str], Tuple[float, float]]:
+        """Snapshot of every entry as (price, timestamp)"""
+        entries = {}
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                entries.update(shard)
+        return entries
+
+    def get_entry_ages(self) -> Dict[Tuple[str, str], float]:
+        """Age in seconds of every cached entry"""
         current_time = time.time()
-        expired_keys = []
-        
-        with self.lock:
-            for key, (price, timestamp) in self.cache.items():
-                if current_time - timestamp >= self.ttl_seconds:
-                    expired_keys.append(key)
-            
-            for key in expired_keys:
-                del self.cache[key]
-        
-        if expired_keys:
-            logger.debug(f"Cleared {len(expired_keys)} expired cache entries")
-    
+        ages = {}
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                items = list(shard.items())
+            for key, (_, timestamp) in items:
+                ages[key] = current_time - timestamp
+        return ages
+
     def get_cache_stats(self) -> Dict:
         """Get cache statistics"""
         current_time = time.time()
         total_entries = 0
         valid_entries = 0
-        
-        with self.lock:
-            total_entries = len(self.cache)
-            for price, timestamp in self.cache.values():
-                if current_time - timestamp < self.ttl_seconds:
+        stale_entries = 0
+
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                entries = list(shard.values())
+            total_entries += len(entries)
+            for price, timestamp in entries:
+                age = current_time - timestamp
+                if age < self.ttl_seconds:
                     valid_entries += 1
-        
+                elif age <= self.max_staleness_seconds:
+                    stale_entries += 1
+
         return {
             "total_entries": total_entries,
             "valid_entries": valid_entries,
-            "ttl_seconds": self.ttl_seconds
+            "stale_entries": stale_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "max_staleness_seconds": self.max_staleness_seconds,
+            "shards": len(self._shards),
+            "hits": self.hits,
+            "misses": self.misses,
         }
 
 
 # Global price cache instance
-price_cache = PriceCache(ttl_seconds=30)  # Cache prices for 30 seconds
+price_cache = PriceCache(ttl_seconds=30, max_staleness_seconds=300)  # Fresh for 30s, servable as stale for 5 minutes
+
+
+_CACHE_LOOKUPS = registry.counter("price_cache_lookups_total", "Price cache lookups", ("result",))
+_CACHE_ENTRIES = registry.gauge("price_cache_entries", "Price cache entries by freshness", ("state",))
+_CACHE_AGE = registry.gauge("price_cache_entry_age_seconds", "Age of each cached price", ("symbol", "market"))
+
+
+def _collect_price_cache_metrics():
+    _CACHE_LOOKUPS.set_total(price_cache.hits, "hit")
+    _CACHE_LOOKUPS.set_total(price_cache.misses, "miss")
+    ages = price_cache.get_entry_ages()
+    fresh = sum(1 for age in ages.values() if age < price_cache.ttl_seconds)
+    _CACHE_ENTRIES.replace({("fresh",): fresh, ("stale",): len(ages) - fresh})
+    _CACHE_AGE.replace({key: round(age, 3) for key, age in ages.items()})
+
+
+registry.add_collector(_collect_price_cache_metrics)
+
+
+def get_cached_price(symbol: str, market: str = "CRYPTO", max_age: MaxAge = None) -> Optional[float]:
+    """
+    Get price from cache if available and at most max_age old (seconds or freshness class)
+
+    Falls back to the price the leader worker published in the shared price
+    table, when that is enabled.
+    """
+    max_age = resolve_max_age(max_age)
+    price = price_cache.get(symbol, market, max_age)
+    if price is None:
+        shared = read_shared_price(symbol, market)
+        if shared is not None and shared[1] < (price_cache.ttl_seconds if max_age is None else max_age):
+            return shared[0]
+    return price
 
 
-def get_cached_price(symbol: str, market: str = "CRYPTO") -> Optional[float]:
-    """Get price from cache if available"""
-    return price_cache.get(symbol, market)
+def get_cached_price_with_age(symbol: str, market: str = "CRYPTO") -> Optional[Tuple[float, float]]:
+    """Get (price, age) from cache or the shared price table, including stale entries within max staleness"""
+    entry = price_cache.get_with_age(symbol, market)
+    if entry is None:
+        shared = read_shared_price(symbol, market)
+        if shared is not None and shared[1] <= price_cache.max_staleness_seconds:
+            return shared
+    return entry
 
 
-def cache_price(symbol: str, market: str, price: float):
-    """Cache a price"""
+def cache_price(symbol: str, market: str, price: float, timestamp: Optional[float] = None):
+    """Cache a price and record it in the tick history and tick log (timestamp defaults to now)"""
     price_cache.set(symbol, market, price)
+    publish_shared_price(symbol, market, price)
+    if timestamp is None:
+        timestamp = time.time()
+    record_tick(symbol, market, price, timestamp)
+    log_tick(symbol, market, price, timestamp)
 
 
 def clear_expired_prices():
@@ -0,0 +1,234 @@
+"""
+Streaming price hub
+Keeps the price cache continuously fresh from a streaming source so that
+get_last_price is served from memory instead of a REST round trip
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .price_cache import cache_price
+from .ticker_cache import Ticker, ticker_cache
+
+logger = logging.getLogger(__name__)
+
+# (symbol, price, timestamp in seconds, full ticker when the transport has one)
+TickCallback = Callable[[str, float, float, Optional[Ticker]], None]
+
+
+class PriceTransport(ABC):
+    """Streaming price transport consumed by PriceHub"""
+
+    name = "base"
+
+    @abstractmethod
+    def run(self, symbols: List[str], on_tick: TickCallback, stop_event: threading.Event) -> None:
+        """
+        Deliver ticks for symbols until stop_event is set
+
+        Implementations block while streaming and raise on connection errors,
+        the hub takes care of reconnecting.
+        """
+
+
+class HyperliquidStreamTransport(PriceTransport):
+    """Hyperliquid ticker stream via the CCXT Pro websocket API"""
+
+    name = "hyperliquid_ws"
+
+    def __init__(self, idle_timeout: float = 5.0):
+        """
+        Args:
+            idle_timeout: Seconds to wait for an update before re-checking the stop flag
+        """
+        self.idle_timeout = idle_timeout
+
+    def run(self, symbols: List[str], on_tick: TickCallback, stop_event: threading.Event) -> None:
+        asyncio.run(self._watch(symbols, on_tick, stop_event))
+
+    async def _watch(self, symbols: List[str], on_tick: TickCallback, stop_event: threading.Event) -> None:
+        import ccxt.pro as ccxtpro
+        from .hyperliquid_market_data import _normalize_ticker, hyperliquid_client
+
+        # Map CCXT market symbols back to the symbols used across the app
+        market_symbols = {hyperliquid_client._format_symbol(s): s for s in symbols}
+        exchange = ccxtpro.hyperliquid({'enableRateLimit': True})
+        try:
+            while not stop_event.is_set():
+                try:
+                    tickers = await asyncio.wait_for(
+                        exchange.watch_tickers(list(market_symbols.keys())),
+                        timeout=self.idle_timeout,
+                    )
+                except asyncio.TimeoutError:
+                    continue
+
+                for market_symbol, raw in tickers.items():
+                    symbol = market_symbols.get(market_symbol)
+                    if symbol is None:
+                        continue
+                    ticker = _normalize_ticker(symbol, raw)
+                    if ticker is not None:
+                        on_tick(symbol, ticker.last, ticker.timestamp, ticker)
+        finally:
+            await exchange.close()
+
+
+class ReplayTransport(PriceTransport):
+    """Replays recorded ticks locally, used as a stand-in for the exchange stream"""
+
+    name = "replay"
+
+    def __init__(self, ticks: Iterable[Tuple[float, str, float]], speed: float = 1.0, loop: bool = False):
+        """
+        Args:
+            ticks: Iterable of (timestamp, symbol, price)
+            speed: Replay speed multiplier, 0 replays as fast as possible
+            loop: Restart from the first tick when the recording is exhausted
+        """
+        self.ticks = sorted(ticks, key=lambda t: t[0])
+        self.speed = speed
+        self.loop = loop
+
+    @classmethod
+    def from_csv(cls, path: str, speed: float = 1.0, loop: bool = False) -> "ReplayTransport":
+        """Build a replay transport from a CSV or Parquet file with timestamp,symbol,price columns"""
+        return cls(load_tick_file(path), speed=speed, loop=loop)
+
+    def run(self, symbols: List[str], on_tick: TickCallback, stop_event: threading.Event) -> None:
+        wanted = set(symbols)
+        while not stop_event.is_set():
+            previous_ts: Optional[float] = None
+            for timestamp, symbol, price in self.ticks:
+                if stop_event.is_set():
+                    return
+                if previous_ts is not None and self.speed > 0:
+                    delay = (timestamp - previous_ts) / self.speed
+                    if delay > 0 and stop_event.wait(timeout=delay):
+                        return
+                previous_ts = timestamp
+                if symbol in wanted:
+                    on_tick(symbol, price, time.time())
+            if not self.loop:
+                # Keep the thread parked so the hub does not treat the end of the recording as a disconnect
+                stop_event.wait()
+                return
+
+
+def load_tick_file(path: str) -> List[Tuple[float, str, float]]:
+    """Load recorded ticks from a CSV or Parquet file with timestamp,symbol,price columns"""
+    from .replay_market_data import load_ticks
+    return load_ticks(path)
+
+
+class PriceHub:
+    """Background subscriber that pushes streamed prices into the price cache"""
+
+    def __init__(self, transport: PriceTransport, market: str = "CRYPTO",
+                 reconnect_delay: float = 1.0, max_reconnect_delay: float = 30.0):
+        """
+        Args:
+            transport: Streaming transport to subscribe through
+            market: Market the streamed prices are cached under
+            reconnect_delay: Initial delay before reconnecting after a transport error
+            max_reconnect_delay: Upper bound for the exponential reconnect delay
+        """
+        self.transport = transport
+        self.market = market
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.symbols: List[str] = []
+        self.thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self._tick_count = 0
+        self._reconnect_count = 0
+        self._last_tick: Dict[str, float] = {}  # symbol -> wall-clock time of last update
+
+    @property
+    def running(self) -> bool:
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self, symbols: List[str]):
+        """Start streaming prices for symbols"""
+        if self.running:
+            logger.warning("Price hub is already running")
+            return
+
+        self.symbols = list(dict.fromkeys(symbols))
+        self._stop_event.clear()
+        self.thread = threading.Thread(target=self._run, name="price_hub", daemon=True)
+        self.thread.start()
+        logger.info(f"Price hub started with {self.transport.name} transport for {len(self.symbols)} symbols")
+
+    def stop(self):
+        """Stop streaming"""
+        if not self.running:
+            return
+
+        self._stop_event.set()
+        self.thread.join(timeout=10)
+        logger.info("Price hub stopped")
+
+    def _run(self):
+        delay = self.reconnect_delay
+        while not self._stop_event.is_set():
+            try:
+                self.transport.run(self.symbols, self._on_tick, self._stop_event)
+                delay = self.reconnect_delay
+            except Exception as e:
+                if self._stop_event.is_set():
+                    break
+                self._reconnect_count += 1
+                logger.warning(f"Price hub transport {self.transport.name} failed: {e}, reconnecting in {delay:.0f}s")
+                if self._stop_event.wait(timeout=delay):
+                    break
+                delay = min(delay * 2, self.max_reconnect_delay)
+
+    def _on_tick(self, symbol: str, price: float, timestamp: float, ticker: Optional[Ticker] = None):
+        if price <= 0:
+            return
+        if ticker is not None:
+            ticker_cache.set(self.market, ticker)
+        cache_price(symbol, self.market, price, timestamp)
+        with self._lock:
+            self._tick_count += 1
+            self._last_tick[symbol] = time.time()
+
+    def get_status(self) -> Dict:
+        """Get hub status"""
+        now = time.time()
+        with self._lock:
+            last_update_age = {s: round(now - ts, 3) for s, ts in self._last_tick.items()}
+            tick_count = self._tick_count
+        return {
+            "running": self.running,
+            "transport": self.transport.name,
+            "symbols": self.symbols,
+            "tick_count": tick_count,
+            "reconnect_count": self._reconnect_count,
+            "last_update_age_seconds": last_update_age,
+        }
+
+
+# Global price hub instance
+price_hub = PriceHub(HyperliquidStreamTransport())
+
+
+def start_price_hub(symbols: List[str]):
+    """Start global price hub"""
+    price_hub.start(symbols)
+
+
+def stop_price_hub():
+    """Stop global price hub"""
+    price_hub.stop()
+
+
+def get_price_hub_status() -> Dict:
+    """Get global price hub status"""
+    return price_hub.get_status()
@@ -0,0 +1,126 @@
+"""
+Persisted last-known prices
+Writes the price cache to a local JSON file behind the updates and reloads it
+at startup with the original observation times, so snapshots can be served right after a restart
+while fresh prices stream in
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Optional
+
+from .price_cache import PriceCache, price_cache
+
+logger = logging.getLogger(__name__)
+
+PRICE_SNAPSHOT_PATH = os.environ.get("PRICE_SNAPSHOT_PATH", "./price_snapshot.json")
+
+
+class PricePersister:
+    """Write-behind persistence of the price cache"""
+
+    def __init__(self, cache: PriceCache, path: str = PRICE_SNAPSHOT_PATH,
+                 flush_interval: float = 1.0, max_restore_age: Optional[float] = None):
+        """
+        Args:
+            cache: Price cache to persist
+            path: JSON file holding the last known prices
+            flush_interval: Seconds between checks for changed prices, updates in between are coalesced
+            max_restore_age: Prices older than this (seconds) are not restored,
+                defaults to the cache's max staleness
+        """
+        self.cache = cache
+        self.path = path
+        self.flush_interval = flush_interval
+        self.max_restore_age = cache.max_staleness_seconds if max_restore_age is None else max_restore_age
+        self.thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._written_version = -1
+
+    def load(self) -> int:
+        """Restore persisted prices into the cache with their own age, returns how many were restored"""
+        try:
+            with open(self.path) as f:
+                records = json.load(f)
+        except FileNotFoundError:
+            return 0
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable price snapshot {self.path}: {e}")
+            return 0
+
+        cutoff = time.time() - self.max_restore_age
+        restored = 0
+        for record in records:
+            try:
+                if record["timestamp"] < cutoff or record["price"] <= 0:
+                    continue
+                self.cache.restore(record["symbol"], record["market"], float(record["price"]),
+                                   float(record["timestamp"]))
+                restored += 1
+            except (KeyError, TypeError, ValueError):
+                continue
+        self._written_version = self.cache.version
+        logger.info(f"Restored {restored} last-known prices from {self.path}")
+        return restored
+
+    def flush(self):
+        """Write the cache to disk if it changed since the last write"""
+        version = self.cache.version
+        if version == self._written_version:
+            return
+
+        records = []
+        for (symbol, market), (price, timestamp) in self.cache.get_entries().items():
+            records.append({"symbol": symbol, "market": market, "price": price, "timestamp": timestamp})
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(records, f)
+            # Atomic swap so a crash mid-write never leaves a truncated snapshot
+            os.replace(tmp_path, self.path)
+            self._written_version = version
+        except OSError as e:
+            logger.warning(f"Failed to persist prices to {self.path}: {e}")
+
+    def start(self):
+        """Start the background writer"""
+        if self.thread is not None and self.thread.is_alive():
+            return
+        self._stop_event.clear()
+        self.thread = threading.Thread(target=self._run, name="price_persister", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop the writer after a final flush"""
+        if self.thread is None:
+            return
+        self._stop_event.set()
+        self.thread.join(timeout=5)
+        self.thread = None
+        self.flush()
+
+    def _run(self):
+        while not self._stop_event.wait(timeout=self.flush_interval):
+            self.flush()
+
+
+# Global price persister instance
+price_persister = PricePersister(price_cache)
+
+
+def restore_persisted_prices() -> int:
+    """Reload last-known prices into the global cache"""
+    return price_persister.load()
+
+
+def start_price_persistence():
+    """Start persisting the global cache"""
+    price_persister.start()
+
+
+def stop_price_persistence():
+    """Flush and stop persisting the global cache"""
+    price_persister.stop()
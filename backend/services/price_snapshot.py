@@ -0,0 +1,148 @@
+"""
+Price snapshots
+An immutable, versioned price vector captured once per trading cycle or
+monitor tick and passed to every calculation in it, so valuation, execution
+and margin checks agree on prices and do not repeat lookups
+"""
+
+import itertools
+import logging
+import time
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Dict, Iterable, Iterator, Optional
+
+from .price_cache import MaxAge, resolve_max_age
+
+logger = logging.getLogger(__name__)
+
+# Monotonic snapshot versions, next() on a count is atomic under the GIL
+_versions = itertools.count(1)
+
+
+class PriceSnapshot(Mapping):
+    """
+    Read-only symbol -> price mapping with a version and capture time
+
+    Behaves like the plain price dicts it replaces (prices.get(symbol) keeps
+    working), but cannot be modified after capture. Freshness checks use the
+    time each price was observed, which for cached prices is before capture.
+    """
+
+    __slots__ = ("_prices", "_observed_at", "market", "version", "captured_at", "source")
+
+    def __init__(self, prices: Dict[str, float], market: str = "CRYPTO",
+                 captured_at: Optional[float] = None, source: str = "last",
+                 observed_at: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            prices: Prices by symbol, copied on construction
+            market: Market the prices belong to
+            captured_at: Capture time in seconds, defaults to now
+            source: Which price the vector holds ("last" or "mark")
+            observed_at: When each price was observed, symbols left out count as observed at capture
+        """
+        captured_at = time.time() if captured_at is None else captured_at
+        object.__setattr__(self, "_prices", MappingProxyType(dict(prices)))
+        object.__setattr__(self, "_observed_at", MappingProxyType(
+            {s: min((observed_at or {}).get(s, captured_at), captured_at) for s in prices}))
+        object.__setattr__(self, "market", market)
+        object.__setattr__(self, "version", next(_versions))
+        object.__setattr__(self, "captured_at", captured_at)
+        object.__setattr__(self, "source", source)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("PriceSnapshot is immutable")
+
+    def __getitem__(self, symbol: str) -> float:
+        return self._prices[symbol]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._prices)
+
+    def __len__(self) -> int:
+        return len(self._prices)
+
+    def __repr__(self) -> str:
+        return f"PriceSnapshot(v{self.version}, {self.market}, {len(self)} prices, age={self.age:.1f}s)"
+
+    @property
+    def age(self) -> float:
+        """Age of the oldest price in the snapshot"""
+        return time.time() - min(self._observed_at.values(), default=self.captured_at)
+
+    def price_age(self, symbol: str) -> Optional[float]:
+        """Seconds since the price of symbol was observed, None when not covered"""
+        observed_at = self._observed_at.get(symbol)
+        return time.time() - observed_at if observed_at is not None else None
+
+    def is_fresh(self, max_age: MaxAge = None) -> bool:
+        """Whether every price is at most max_age old, any age when max_age is None"""
+        limit = resolve_max_age(max_age)
+        return limit is None or self.age < limit
+
+    def price_for(self, symbol: str, market: str, max_age: MaxAge = None) -> Optional[float]:
+        """Price of symbol if this snapshot covers it and that price is fresh enough for max_age"""
+        if market != self.market:
+            return None
+        age = self.price_age(symbol)
+        limit = resolve_max_age(max_age)
+        if age is None or (limit is not None and age >= limit):
+            return None
+        return self._prices[symbol]
+
+
+def capture_price_snapshot(symbols: Iterable[str], market: str = "CRYPTO", max_age: MaxAge = "trading",
+                           mark: bool = False) -> PriceSnapshot:
+    """
+    Capture one snapshot for symbols with a single bulk lookup
+
+    Symbols whose price cannot be obtained are left out. With mark=True the
+    vector holds mark prices (falling back to last), as used for margin.
+    """
+    from .market_data import get_last_prices, get_tickers
+    from .price_cache import get_cached_price_with_age
+    from .ticker_cache import ticker_cache
+
+    symbols = list(dict.fromkeys(symbols))
+    if mark:
+        prices = {s: t.mark_or_last for s, t in get_tickers(symbols, market, max_age).items()}
+    else:
+        prices = get_last_prices(symbols, market, max_age=max_age)
+    prices = {s: float(p) for s, p in prices.items() if p and p > 0}
+
+    # Cached prices were observed before this capture, keep their real age
+    now = time.time()
+    observed_at = {}
+    for symbol in prices:
+        if mark:
+            age = ticker_cache.get_age(symbol, market)
+        else:
+            entry = get_cached_price_with_age(symbol, market)
+            age = entry[1] if entry is not None else None
+        if age is not None:
+            observed_at[symbol] = now - age
+    snapshot = PriceSnapshot(prices, market, captured_at=now, source="mark" if mark else "last",
+                             observed_at=observed_at)
+
+    missing = [s for s in symbols if s not in prices]
+    if missing:
+        logger.warning(f"Price snapshot v{snapshot.version} has no price for {missing}")
+    return snapshot
+
+
+def snapshot_price(snapshot: Optional[PriceSnapshot], symbol: str, market: str = "CRYPTO",
+                   max_age: MaxAge = None, allow_stale: bool = False) -> float:
+    """
+    Price from the snapshot, or a regular lookup when there is no usable one
+
+    Falls back to get_last_price when no snapshot is given, it does not cover
+    the symbol, or it is older than max_age allows.
+    """
+    if snapshot is not None:
+        price = snapshot.price_for(symbol, market, max_age)
+        if price is not None:
+            return price
+
+    from .market_data import get_last_price
+    return get_last_price(symbol, market, allow_stale=allow_stale, max_age=max_age)
@@ -0,0 +1,250 @@
+"""
+Priority-aware upstream rate limiter
+Process-wide token bucket in front of the Hyperliquid REST clients. Requests
+are granted by priority class so that margin checks are never stuck behind a
+burst of UI traffic, and low priority work is delayed or shed first.
+"""
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from enum import IntEnum
+from typing import Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Upstream request priority classes, lower value is served first"""
+    MARGIN = 0      # margin monitoring and liquidation
+    EXECUTION = 1   # order placement and matching
+    AI = 2          # AI trading cycle
+    UI = 3          # API routes, websocket snapshots, rankings
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a request is shed instead of waiting for upstream budget"""
+
+
+class PriorityBoost:
+    """
+    Priority that can be raised while a request is under way
+
+    A single-flight leader runs with one of these so callers joining its
+    flight lift it to their own priority, even while it waits for budget.
+    """
+
+    def __init__(self, priority: Priority):
+        self.priority = priority
+        self._lock = threading.Lock()
+
+    def raise_to(self, priority: Priority):
+        with self._lock:
+            if priority < self.priority:
+                self.priority = priority
+
+
+_current_priority: contextvars.ContextVar[Union[Priority, PriorityBoost]] = contextvars.ContextVar(
+    "upstream_priority", default=Priority.UI
+)
+
+
+@contextmanager
+def request_priority(priority: Union[Priority, PriorityBoost]):
+    """Run upstream requests made inside the block with the given priority"""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def get_request_priority() -> Priority:
+    priority = _current_priority.get()
+    return priority.priority if isinstance(priority, PriorityBoost) else priority
+
+
+# Fraction of the bucket each class must leave untouched for higher classes
+RESERVE_FRACTION = {
+    Priority.MARGIN: 0.0,
+    Priority.EXECUTION: 0.0,
+    Priority.AI: 0.2,
+    Priority.UI: 0.4,
+}
+
+# Longest a class waits for budget before being shed, None waits indefinitely
+MAX_WAIT_SECONDS = {
+    Priority.MARGIN: None,
+    Priority.EXECUTION: 10.0,
+    Priority.AI: 30.0,
+    Priority.UI: 2.0,
+}
+
+_POLL_INTERVAL = 0.05
+
+
+class _ClassStats:
+    __slots__ = ("queued", "granted", "shed", "total_wait", "max_wait")
+
+    def __init__(self):
+        self.queued = 0
+        self.granted = 0
+        self.shed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+
+class PriorityRateLimiter:
+    """Token bucket that grants waiting requests strictly by priority"""
+
+    def __init__(self, rate: float = 10.0, burst: int = 20):
+        """
+        Args:
+            rate: Tokens added per second
+            burst: Bucket capacity
+        """
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._waiters: List[list] = []  # heap of [priority, seq, active]
+        self._seq = itertools.count()
+        self._stats: Dict[Priority, _ClassStats] = {p: _ClassStats() for p in Priority}
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _enqueue(self, priority: Priority) -> list:
+        entry = [int(priority), next(self._seq), True]
+        with self._lock:
+            heapq.heappush(self._waiters, entry)
+            self._stats[priority].queued += 1
+        return entry
+
+    def _try_acquire(self, entry: list, cost: float) -> Optional[float]:
+        """Take tokens for entry if it is at the head of the queue, else return the suggested wait"""
+        priority = Priority(entry[0])
+        with self._lock:
+            while self._waiters and not self._waiters[0][2]:
+                heapq.heappop(self._waiters)
+            if self._waiters[0] is not entry:
+                return _POLL_INTERVAL
+
+            now = time.monotonic()
+            self._refill(now)
+            needed = cost + RESERVE_FRACTION[priority] * self.burst
+            if self._tokens < needed:
+                return min(max((needed - self._tokens) / self.rate, 0.001), _POLL_INTERVAL)
+
+            self._tokens -= cost
+            heapq.heappop(self._waiters)
+            entry[2] = False
+            return None
+
+    def _finish(self, entry: list, waited: float, granted: bool):
+        priority = Priority(entry[0])
+        with self._lock:
+            entry[2] = False
+            stats = self._stats[priority]
+            stats.queued -= 1
+            if granted:
+                stats.granted += 1
+                stats.total_wait += waited
+                stats.max_wait = max(stats.max_wait, waited)
+            else:
+                stats.shed += 1
+
+    def _requeue(self, entry: list, priority: Priority) -> list:
+        """Move a waiting entry to a higher priority class"""
+        with self._lock:
+            entry[2] = False
+            self._stats[Priority(entry[0])].queued -= 1
+        return self._enqueue(priority)
+
+    def _shed(self, entry: list, waited: float, delay: float) -> bool:
+        max_wait = MAX_WAIT_SECONDS[Priority(entry[0])]
+        return max_wait is not None and waited + delay > max_wait
+
+    def acquire(self, cost: float = 1.0, priority: Optional[Priority] = None):
+        """Block until budget is available, raises RateLimitExceeded when shed"""
+        boostable = priority is None
+        priority = get_request_priority() if priority is None else priority
+        entry = self._enqueue(priority)
+        start = time.monotonic()
+        granted = False
+        try:
+            while True:
+                delay = self._try_acquire(entry, cost)
+                waited = time.monotonic() - start
+                if delay is None:
+                    granted = True
+                    return
+                if self._shed(entry, waited, delay):
+                    raise RateLimitExceeded(f"Upstream budget exhausted for {priority.name} request")
+                time.sleep(delay)
+                if boostable and get_request_priority() < priority:
+                    # A higher-priority caller joined the flight this request leads
+                    priority = get_request_priority()
+                    entry = self._requeue(entry, priority)
+        finally:
+            self._finish(entry, time.monotonic() - start, granted)
+
+    async def acquire_async(self, cost: float = 1.0, priority: Optional[Priority] = None):
+        """Awaitable acquire, waits without blocking the event loop"""
+        boostable = priority is None
+        priority = get_request_priority() if priority is None else priority
+        entry = self._enqueue(priority)
+        start = time.monotonic()
+        granted = False
+        try:
+            while True:
+                delay = self._try_acquire(entry, cost)
+                waited = time.monotonic() - start
+                if delay is None:
+                    granted = True
+                    return
+                if self._shed(entry, waited, delay):
+                    raise RateLimitExceeded(f"Upstream budget exhausted for {priority.name} request")
+                await asyncio.sleep(delay)
+                if boostable and get_request_priority() < priority:
+                    # A higher-priority caller joined the flight this request leads
+                    priority = get_request_priority()
+                    entry = self._requeue(entry, priority)
+        finally:
+            self._finish(entry, time.monotonic() - start, granted)
+
+    def get_stats(self) -> Dict:
+        """Get per-class queue depth and wait statistics"""
+        with self._lock:
+            self._refill(time.monotonic())
+            classes = {}
+            for priority, stats in self._stats.items():
+                classes[priority.name.lower()] = {
+                    "queue_depth": stats.queued,
+                    "granted": stats.granted,
+                    "shed": stats.shed,
+                    "avg_wait_ms": round(stats.total_wait / stats.granted * 1000, 2) if stats.granted else 0.0,
+                    "max_wait_ms": round(stats.max_wait * 1000, 2),
+                }
+            return {
+                "rate": self.rate,
+                "burst": self.burst,
+                "tokens": round(self._tokens, 2),
+                "classes": classes,
+            }
+
+
+# Global limiter shared by all Hyperliquid REST clients
+upstream_limiter = PriorityRateLimiter()
+
+
+def get_rate_limiter_stats() -> Dict:
+    """Get global upstream limiter statistics"""
+    return upstream_limiter.get_stats()
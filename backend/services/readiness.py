@@ -0,0 +1,182 @@
+"""
+Market data readiness gate
+Prefetches the prices trading depends on in the background and runs deferred
+work (such as scheduling the AI trading job) once they are all available,
+so application startup never waits on the exchange
+"""
+
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from .rate_limiter import Priority, request_priority
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+READY = "ready"
+FAILED = "failed"
+
+
+class MarketDataReadiness:
+    """Background prefetch of required symbols with readiness callbacks"""
+
+    def __init__(self, market: str = "CRYPTO", max_workers: int = 8,
+                 retry_delay: float = 2.0, max_retry_delay: float = 30.0):
+        """
+        Args:
+            market: Market the symbols are priced in
+            max_workers: Parallel price fetches per round
+            retry_delay: Initial delay before retrying symbols that failed
+            max_retry_delay: Upper bound for the exponential retry delay
+        """
+        self.market = market
+        self.max_workers = max_workers
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._ready_event = threading.Event()
+        self._symbols: Dict[str, Dict] = {}
+        self._callbacks: Dict[str, Callable[[], None]] = {}
+        self._started_at: Optional[float] = None
+        self._ready_at: Optional[float] = None
+
+    def start(self, symbols: List[str]):
+        """Start prefetching symbols in the background"""
+        if self.thread is not None and self.thread.is_alive():
+            logger.warning("Market data readiness check is already running")
+            return
+
+        with self._lock:
+            self._symbols = {
+                symbol: {"status": PENDING, "price": None, "error": None, "attempts": 0}
+                for symbol in dict.fromkeys(symbols)
+            }
+        self._ready_event.clear()
+        self._stop_event.clear()
+        self._started_at = time.time()
+        self._ready_at = None
+        self.thread = threading.Thread(target=self._run, name="market_data_readiness", daemon=True)
+        self.thread.start()
+        logger.info(f"Market data readiness check started for {len(self._symbols)} symbols")
+
+    def stop(self):
+        self._stop_event.set()
+
+    def is_ready(self) -> bool:
+        return self._ready_event.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until ready or timeout, returns readiness"""
+        return self._ready_event.wait(timeout)
+
+    def on_ready(self, name: str, callback: Callable[[], None]):
+        """
+        Run callback once market data is ready
+
+        Runs immediately when already ready. Registering the same name again
+        while waiting replaces the earlier callback, so repeated requests
+        collapse into one deferred run.
+        """
+        with self._lock:
+            if not self._ready_event.is_set():
+                self._callbacks[name] = callback
+                logger.info(f"Deferred '{name}' until market data is ready")
+                return
+        self._invoke(name, callback)
+
+    def _run(self):
+        # Trading jobs wait on this prefetch, it goes ahead of UI traffic
+        with request_priority(Priority.AI):
+            self._prefetch_until_ready()
+
+    def _prefetch_until_ready(self):
+        delay = self.retry_delay
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="readiness_prefetch") as pool:
+            while not self._stop_event.is_set():
+                with self._lock:
+                    pending = [s for s, state in self._symbols.items() if state["status"] != READY]
+                if not pending:
+                    break
+
+                # Each prefetch runs in a copy of this thread's context, keeping its upstream priority
+                futures = [pool.submit(contextvars.copy_context().run, self._prefetch, symbol) for symbol in pending]
+                for future in futures:
+                    future.result()
+
+                with self._lock:
+                    failed = [s for s, state in self._symbols.items() if state["status"] != READY]
+                if not failed:
+                    break
+                logger.warning(f"Market data not ready for {failed}, retrying in {delay:.1f}s")
+                if self._stop_event.wait(timeout=delay):
+                    return
+                delay = min(delay * 2, self.max_retry_delay)
+
+        if self._stop_event.is_set():
+            return
+
+        with self._lock:
+            self._ready_at = time.time()
+            self._ready_event.set()
+            callbacks = list(self._callbacks.items())
+            self._callbacks.clear()
+        logger.info(f"Market data ready after {self._ready_at - self._started_at:.1f}s")
+
+        for name, callback in callbacks:
+            self._invoke(name, callback)
+
+    def _prefetch(self, symbol: str):
+        from .market_data import get_last_price
+
+        try:
+            price = get_last_price(symbol, self.market)
+            error = None if price and price > 0 else f"invalid price {price}"
+        except Exception as e:
+            price, error = None, str(e)
+
+        with self._lock:
+            state = self._symbols[symbol]
+            state["attempts"] += 1
+            if error is None:
+                state.update(status=READY, price=price, error=None)
+            else:
+                state.update(status=FAILED, error=error)
+
+    def _invoke(self, name: str, callback: Callable[[], None]):
+        try:
+            callback()
+        except Exception as e:
+            logger.error(f"Readiness callback '{name}' failed: {e}")
+
+    def get_status(self) -> Dict:
+        """Readiness with per-symbol status"""
+        with self._lock:
+            symbols = {symbol: dict(state) for symbol, state in self._symbols.items()}
+            deferred = list(self._callbacks)
+        return {
+            "ready": self.is_ready(),
+            "started_at": self._started_at,
+            "ready_at": self._ready_at,
+            "deferred": deferred,
+            "symbols": symbols,
+        }
+
+
+# Global readiness gate for the trading symbols
+market_data_readiness = MarketDataReadiness()
+
+
+def start_market_data_readiness(symbols: List[str]):
+    """Start the global readiness check"""
+    market_data_readiness.start(symbols)
+
+
+def get_readiness_status() -> Dict:
+    """Get global readiness status"""
+    return market_data_readiness.get_status()
@@ -0,0 +1,174 @@
+"""
+File-backed replay market data source
+Serves recorded ticks and candles from local CSV/Parquet files on a replay
+clock, so snapshots, order matching and margin checks can be exercised
+reproducibly without network access
+"""
+
+import bisect
+import csv
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .hyperliquid_market_data import _convert_ohlcv
+from .market_data_source import MarketDataSource
+
+logger = logging.getLogger(__name__)
+
+
+def read_records(path: str) -> List[Dict[str, Any]]:
+    """Read rows from a CSV or Parquet file as dicts"""
+    if path.endswith('.parquet'):
+        try:
+            import pandas as pd
+            return pd.read_parquet(path).to_dict('records')
+        except ImportError as e:
+            raise ImportError(f"Reading {path} requires pandas with a Parquet engine (pyarrow): {e}")
+
+    with open(path, newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def load_ticks(path: str) -> List[Tuple[float, str, float]]:
+    """Load recorded ticks (timestamp, symbol, price) from a CSV or Parquet file or a tick log directory"""
+    if os.path.isdir(path):
+        from .tick_log import TickLogReader
+        return TickLogReader(path).replay_ticks()
+    return [(float(row['timestamp']), str(row['symbol']), float(row['price'])) for row in read_records(path)]
+
+
+class ReplayClock:
+    """
+    Maps wall-clock time onto the recording
+
+    With speed > 0 the recording plays at that multiple of real time. With
+    speed 0 the clock only moves through advance()/seek(), which gives fully
+    deterministic runs.
+    """
+
+    def __init__(self, start: float, speed: float = 1.0):
+        self.speed = speed
+        self._position = start
+        self._anchor = time.time()
+        self._lock = threading.Lock()
+
+    def now(self) -> float:
+        with self._lock:
+            if self.speed > 0:
+                return self._position + (time.time() - self._anchor) * self.speed
+            return self._position
+
+    def seek(self, timestamp: float):
+        with self._lock:
+            self._position = timestamp
+            self._anchor = time.time()
+
+    def advance(self, seconds: float):
+        self.seek(self.now() + seconds)
+
+
+class ReplayMarketDataSource(MarketDataSource):
+    """Market data source replaying recorded ticks and candles"""
+
+    name = "replay"
+
+    def __init__(self, ticks: List[Tuple[float, str, float]],
+                 candles: Optional[List[Dict[str, Any]]] = None, speed: float = 1.0):
+        """
+        Args:
+            ticks: Recorded (timestamp, symbol, price) ticks
+            candles: Recorded candles with symbol, period, timestamp, open, high, low, close, volume
+            speed: Replay speed multiplier, 0 freezes the clock until advanced manually
+        """
+        self._tick_times: Dict[str, List[float]] = {}
+        self._tick_prices: Dict[str, List[float]] = {}
+        for timestamp, symbol, price in sorted(ticks):
+            self._tick_times.setdefault(symbol, []).append(timestamp)
+            self._tick_prices.setdefault(symbol, []).append(price)
+
+        # (symbol, period) -> candles ordered by timestamp as OHLCV rows in milliseconds
+        self._candles: Dict[Tuple[str, str], List[List[float]]] = {}
+        for row in candles or []:
+            key = (str(row['symbol']), str(row['period']))
+            self._candles.setdefault(key, []).append([
+                int(float(row['timestamp'])) * 1000,
+                float(row['open']), float(row['high']), float(row['low']),
+                float(row['close']), float(row.get('volume') or 0),
+            ])
+        for rows in self._candles.values():
+            rows.sort(key=lambda r: r[0])
+
+        # Candles recorded before the first tick are history available from the start
+        starts = [times[0] for times in self._tick_times.values()]
+        if not starts:
+            starts = [rows[0][0] / 1000 for rows in self._candles.values()]
+        self.clock = ReplayClock(min(starts) if starts else time.time(), speed)
+        logger.info(f"Replay source loaded {len(ticks)} ticks for {len(self._tick_times)} symbols "
+                    f"and {sum(len(r) for r in self._candles.values())} candles")
+
+    @classmethod
+    def from_files(cls, ticks_path: str, candles_path: Optional[str] = None,
+                   speed: float = 1.0) -> "ReplayMarketDataSource":
+        """Build a replay source from tick and (optional) candle files"""
+        candles = read_records(candles_path) if candles_path else None
+        return cls(load_ticks(ticks_path), candles, speed)
+
+    def get_last_price(self, symbol: str) -> Optional[float]:
+        times = self._tick_times.get(symbol)
+        if not times:
+            return None
+        index = bisect.bisect_right(times, self.clock.now()) - 1
+        return self._tick_prices[symbol][index] if index >= 0 else None
+
+    def get_last_prices(self, symbols: List[str]) -> Dict[str, float]:
+        prices = {}
+        for symbol in symbols:
+            price = self.get_last_price(symbol)
+            if price:
+                prices[symbol] = price
+        return prices
+
+    def get_kline_data(self, symbol: str, period: str = '1d', count: int = 100,
+                       since: Optional[int] = None) -> List[Dict[str, Any]]:
+        rows = self._candles.get((symbol, period))
+        if not rows:
+            return []
+        end = bisect.bisect_right(rows, [self.clock.now() * 1000, float('inf')])
+        if since is not None:
+            start = bisect.bisect_left(rows, [since * 1000])
+            return _convert_ohlcv(rows[start:min(end, start + count)])
+        return _convert_ohlcv(rows[max(0, end - count):end])
+
+    def get_market_status(self, symbol: str) -> Dict[str, Any]:
+        known = symbol in self._tick_times
+        return {
+            'market_status': 'OPEN' if known else 'CLOSED',
+            'is_trading': known,
+            'symbol': symbol,
+            'exchange': 'Replay',
+            'market_type': 'crypto',
+        }
+
+    def get_all_symbols(self) -> List[str]:
+        return sorted(self._tick_times)
+
+
+def replay_source_from_env() -> Optional[ReplayMarketDataSource]:
+    """
+    Build a replay source when MARKET_DATA_SOURCE=replay
+
+    Reads REPLAY_TICKS_PATH (required), REPLAY_CANDLES_PATH and REPLAY_SPEED.
+    """
+    if os.environ.get('MARKET_DATA_SOURCE', '').lower() != 'replay':
+        return None
+    ticks_path = os.environ.get('REPLAY_TICKS_PATH')
+    if not ticks_path:
+        raise ValueError("MARKET_DATA_SOURCE=replay requires REPLAY_TICKS_PATH")
+    return ReplayMarketDataSource.from_files(
+        ticks_path,
+        os.environ.get('REPLAY_CANDLES_PATH'),
+        float(os.environ.get('REPLAY_SPEED', '1.0')),
+    )
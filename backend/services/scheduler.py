@@ -13,6 +13,8 @@ from datetime import date, datetime
 
 from database.connection import SessionLocal
 from database.models import Position, CryptoPrice, Account, Order
+from services.metrics import instrument_scheduler
+from services.price_snapshot import PriceSnapshot, capture_price_snapshot
 from decimal import Decimal
 
 logger = logging.getLogger(__name__)
@@ -30,6 +32,7 @@ class TaskScheduler:
         """Start the scheduler"""
         if not self._started:
             self.scheduler = BackgroundScheduler()
+            instrument_scheduler(self.scheduler)
             self.scheduler.start()
             self._started = True
             logger.info("Scheduler started")
@@ -300,10 +303,13 @@ class TaskScheduler:
             
             if not accounts_with_positions:
                 return
-            
+
+            # Value every account at the same mark prices, fetched in one bulk lookup
+            snapshot = self._capture_margin_snapshot(db)
+
             for account in accounts_with_positions:
                 try:
-                    self._check_account_margin(db, account)
+                    self._check_account_margin(db, account, snapshot)
                 except Exception as e:
                     logger.error(f"Error checking margin for account {account.name} (ID: {account.id}): {e}")
             
@@ -315,15 +321,34 @@ class TaskScheduler:
         finally:
             db.close()
     
-    def _check_account_margin(self, db: Session, account: Account):
+    def _capture_margin_snapshot(self, db: Session) -> Optional[PriceSnapshot]:
+        """Capture mark prices for all leveraged position symbols, None when that fails"""
+        from services.rate_limiter import Priority, request_priority
+
+        symbols = [
+            row[0] for row in db.query(Position.symbol)
+            .filter(Position.quantity > 0, Position.leverage > 1, Position.market == "CRYPTO")
+            .distinct()
+            .all()
+        ]
+        try:
+            with request_priority(Priority.MARGIN):
+                return capture_price_snapshot(symbols, "CRYPTO", max_age="margin", mark=True)
+        except Exception as e:
+            logger.warning(f"Failed to capture margin price snapshot, pricing positions one by one: {e}")
+            return None
+
+    def _check_account_margin(self, db: Session, account: Account, snapshot: Optional[PriceSnapshot] = None):
         """
         Check margin level for a specific account and liquidate if necessary
         
         Args:
             db: Database session
             account: Account to check
+            snapshot: Mark price snapshot of the current tick
         """
-        from services.market_data import get_last_price
+        from services.market_data import get_ticker
+        from services.rate_limiter import Priority, request_priority
         
         # Get all leveraged positions
         positions = db.query(Position).filter(
@@ -341,8 +366,12 @@ class TaskScheduler:
         
         for position in positions:
             try:
-                # Get current market price
-                current_price = get_last_price(position.symbol, position.market)
+                # Value positions at the mark price, falling back to last
+                # Liquidation decisions need near-real-time prices
+                current_price = snapshot.price_for(position.symbol, position.market, "margin") if snapshot else None
+                if current_price is None:
+                    with request_priority(Priority.MARGIN):
+                        current_price = get_ticker(position.symbol, position.market, max_age="margin").mark_or_last
                 if not current_price or current_price <= 0:
                     logger.warning(f"Invalid price for {position.symbol}, skipping margin check")
                     continue
@@ -506,36 +535,6 @@ def setup_market_tasks():
     logger.info("Crypto markets run 24/7 - no market hours tasks needed")
 
 
-def _ensure_market_data_ready() -> None:
-    """Prefetch required market data before enabling trading tasks"""
-    try:
-        from services.trading_commands import AI_TRADING_SYMBOLS
-        from services.market_data import get_last_price
-
-        missing_symbols: List[str] = []
-
-        for symbol in AI_TRADING_SYMBOLS:
-            try:
-                price = get_last_price(symbol, "CRYPTO")
-                if price is None or price <= 0:
-                    missing_symbols.append(symbol)
-                    logger.warning(f"Prefetch returned invalid price for {symbol}: {price}")
-                else:
-                    logger.debug(f"Prefetched market data for {symbol}: {price}")
-            except Exception as fetch_err:
-                missing_symbols.append(symbol)
-                logger.warning(f"Failed to prefetch price for {symbol}: {fetch_err}")
-
-        if missing_symbols:
-            raise RuntimeError(
-                "Market data not ready for symbols: " + ", ".join(sorted(set(missing_symbols)))
-            )
-
-    except Exception as err:
-        logger.error(f"Market data readiness check failed: {err}")
-        raise
-
-
 def reset_auto_trading_job():
     """Reset the auto trading job after account configuration changes"""
     try:
@@ -546,8 +545,12 @@ def reset_auto_trading_job():
         # Define interval (5 minutes)
         AI_TRADE_INTERVAL_SECONDS = 300
         
-        # Ensure market data is ready before scheduling trading tasks
-        _ensure_market_data_ready()
+        # Schedule trading only once market data is ready, the readiness gate
+        # prefetches in the background and calls back here when done
+        from services.readiness import market_data_readiness
+        if not market_data_readiness.is_ready():
+            market_data_readiness.on_ready("reset_auto_trading_job", reset_auto_trading_job)
+            return
 
         # Ensure scheduler is started
         if not task_scheduler.is_running():
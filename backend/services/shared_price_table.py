@@ -0,0 +1,268 @@
+"""
+Shared price table for multi-worker deployments
+With several uvicorn workers, one of them (the leader, elected through a
+file lock) streams and fetches prices and publishes them into a shared
+memory table; the other workers read prices from there instead of polling
+the exchange themselves. Enabled with SHARED_PRICE_TABLE=1.
+"""
+
+import fcntl
+import logging
+import os
+import tempfile
+import threading
+import time
+import zlib
+from multiprocessing import resource_tracker, shared_memory
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SHARED_PRICE_TABLE_ENABLED = os.environ.get("SHARED_PRICE_TABLE", "").lower() in ("1", "true", "yes")
+SHARED_PRICE_TABLE_NAME = os.environ.get("SHARED_PRICE_TABLE_NAME", "price_table")
+SHARED_PRICE_TABLE_SLOTS = int(os.environ.get("SHARED_PRICE_TABLE_SLOTS", "256"))
+
+MAGIC = b"PRICETB1"
+HEADER_SIZE = 64
+KEY_SIZE = 40
+# One 64-byte slot per symbol: seqlock counter, write time, price, "symbol.market"
+SLOT_DTYPE = np.dtype([("seq", "<u8"), ("written_at", "<f8"), ("price", "<f8"), ("key", f"S{KEY_SIZE}")])
+READ_RETRIES = 16
+
+
+class SharedPriceTable:
+    """
+    Fixed-slot price table in shared memory with seqlock versioning
+
+    Slots are found by hashing "symbol.market" with linear probing. Only the
+    leader writes: it makes a slot's sequence number odd, updates the slot and
+    makes it even again. Readers retry while the number is odd or changed
+    under them, so they never see a price paired with another write's time.
+    """
+
+    def __init__(self, name: str = SHARED_PRICE_TABLE_NAME, slots: int = SHARED_PRICE_TABLE_SLOTS,
+                 lock_path: Optional[str] = None, election_interval: float = 5.0):
+        """
+        Args:
+            name: Shared memory segment name, shared by all workers
+            slots: Number of symbol slots, fixed for the segment's lifetime
+            lock_path: File lock deciding the leader, defaults to one next to the temp dir
+            election_interval: Seconds between followers' attempts to take over leadership
+        """
+        self.name = name
+        self.slots = slots
+        self.lock_path = lock_path or os.path.join(tempfile.gettempdir(), f"{name}.lock")
+        self.election_interval = election_interval
+        self.is_leader = False
+        self.thread: Optional[threading.Thread] = None
+        self._shm: Optional[shared_memory.SharedMemory] = None
+        self._table: Optional[np.ndarray] = None
+        self._lock_file = None
+        self._write_lock = threading.Lock()
+        self._slot_index: Dict[str, int] = {}
+        self._on_leader: Optional[Callable[[], None]] = None
+        self._stop_event = threading.Event()
+        self.full_misses = 0
+
+    @property
+    def attached(self) -> bool:
+        return self._table is not None
+
+    def start(self, on_leader: Optional[Callable[[], None]] = None) -> bool:
+        """
+        Join the table, returns whether this process became the leader
+
+        on_leader runs once this process is the leader, immediately or after a
+        later takeover when the current leader exits.
+        """
+        self._on_leader = on_leader
+        self._stop_event.clear()
+        if not self._try_lead():
+            self._attach(create=False)
+        self.thread = threading.Thread(target=self._run, name="shared_price_table", daemon=True)
+        self.thread.start()
+        return self.is_leader
+
+    def stop(self):
+        self._stop_event.set()
+        if self.thread is not None:
+            self.thread.join(timeout=5)
+            self.thread = None
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+        self.is_leader = False
+
+    def _run(self):
+        while not self._stop_event.wait(timeout=self.election_interval):
+            if not self.is_leader:
+                if self._try_lead():
+                    continue
+                if not self.attached:
+                    self._attach(create=False)
+
+    def _try_lead(self) -> bool:
+        lock_file = open(self.lock_path, "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+
+        if not self._attach(create=True):
+            lock_file.close()
+            return False
+        # The lock is held until this process exits, which frees it for a follower
+        self._lock_file = lock_file
+        self.is_leader = True
+        logger.info(f"Shared price table {self.name}: this process (pid {os.getpid()}) is the leader")
+        if self._on_leader is not None:
+            try:
+                self._on_leader()
+            except Exception as e:
+                logger.error(f"Shared price table leader callback failed: {e}")
+        return True
+
+    def _attach(self, create: bool) -> bool:
+        if self.attached:
+            return True
+        size = HEADER_SIZE + self.slots * SLOT_DTYPE.itemsize
+        try:
+            if create:
+                try:
+                    shm = shared_memory.SharedMemory(self.name, create=True, size=size)
+                    shm.buf[:len(MAGIC)] = MAGIC
+                except FileExistsError:
+                    # Left behind by an earlier leader, its prices are still usable
+                    shm = shared_memory.SharedMemory(self.name)
+            else:
+                shm = shared_memory.SharedMemory(self.name)
+        except FileNotFoundError:
+            logger.info(f"Shared price table {self.name} not created yet, waiting for the leader")
+            return False
+
+        # The segment outlives any single worker; without this the first
+        # process to exit would unlink it from under the others
+        resource_tracker.unregister(shm._name, "shared_memory")
+
+        if bytes(shm.buf[:len(MAGIC)]) != MAGIC or shm.size < size:
+            logger.error(f"Shared memory {self.name} is not a price table with {self.slots} slots, not using it")
+            shm.close()
+            return False
+        self._shm = shm
+        self._table = np.ndarray((self.slots,), dtype=SLOT_DTYPE, buffer=shm.buf, offset=HEADER_SIZE)
+        return True
+
+    def _find_slot(self, key: bytes, claim: bool) -> Optional[int]:
+        table = self._table
+        start = zlib.crc32(key) % self.slots
+        for probe in range(self.slots):
+            index = (start + probe) % self.slots
+            slot_key = table["key"][index]
+            if slot_key == key:
+                return index
+            if slot_key == b"":
+                if not claim:
+                    return None
+                table["key"][index] = key
+                return index
+        return None
+
+    def write(self, symbol: str, market: str, price: float):
+        """Publish a price, only the leader writes"""
+        if not self.is_leader:
+            return
+        name = f"{symbol}.{market}"
+        with self._write_lock:
+            index = self._slot_index.get(name)
+            if index is None:
+                index = self._find_slot(name.encode()[:KEY_SIZE], claim=True)
+                if index is None:
+                    self.full_misses += 1
+                    return
+                self._slot_index[name] = index
+            table = self._table
+            seq = int(table["seq"][index])
+            table["seq"][index] = seq + 1 if seq % 2 == 0 else seq + 2
+            table["written_at"][index] = time.time()
+            table["price"][index] = price
+            table["seq"][index] = int(table["seq"][index]) + 1
+
+    def read(self, symbol: str, market: str) -> Optional[Tuple[float, float]]:
+        """Get (price, age in seconds) for a symbol, None when not published"""
+        if self._table is None:
+            return None
+        name = f"{symbol}.{market}"
+        index = self._slot_index.get(name)
+        if index is None:
+            index = self._find_slot(name.encode()[:KEY_SIZE], claim=False)
+            if index is None:
+                return None
+            self._slot_index[name] = index
+
+        table = self._table
+        for _ in range(READ_RETRIES):
+            seq = int(table["seq"][index])
+            if seq == 0:
+                return None
+            if seq % 2:
+                continue
+            price = float(table["price"][index])
+            written_at = float(table["written_at"][index])
+            if int(table["seq"][index]) == seq:
+                return price, time.time() - written_at
+        return None
+
+    def get_status(self) -> Dict:
+        published = 0
+        if self._table is not None:
+            published = int(np.count_nonzero(self._table["seq"]))
+        return {
+            "enabled": True,
+            "name": self.name,
+            "leader": self.is_leader,
+            "attached": self.attached,
+            "slots": self.slots,
+            "published": published,
+            "table_full_misses": self.full_misses,
+        }
+
+
+# Global shared table, only used when SHARED_PRICE_TABLE is set
+shared_prices = SharedPriceTable()
+
+
+def start_shared_price_table(on_leader: Callable[[], None]) -> bool:
+    """
+    Join the shared price table when enabled
+
+    Returns whether this process feeds prices: the leader, or any process
+    when the table is disabled. on_leader runs whenever this process takes
+    over leadership.
+    """
+    if not SHARED_PRICE_TABLE_ENABLED:
+        on_leader()
+        return True
+    return shared_prices.start(on_leader)
+
+
+def read_shared_price(symbol: str, market: str) -> Optional[Tuple[float, float]]:
+    """Get (price, age) published by the leader, None when disabled or not published"""
+    if not SHARED_PRICE_TABLE_ENABLED:
+        return None
+    return shared_prices.read(symbol, market)
+
+
+def publish_shared_price(symbol: str, market: str, price: float):
+    """Publish a price when this process is the leader"""
+    if SHARED_PRICE_TABLE_ENABLED:
+        shared_prices.write(symbol, market, price)
+
+
+def get_shared_price_table_status() -> Dict:
+    """Get shared table status"""
+    if not SHARED_PRICE_TABLE_ENABLED:
+        return {"enabled": False}
+    return shared_prices.get_status()
@@ -0,0 +1,132 @@
+"""
+Single-flight request coalescing
+Concurrent calls for the same key share one in-flight execution and its result.
+The execution runs at the highest upstream priority among the callers sharing it.
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from .rate_limiter import PriorityBoost, get_request_priority, request_priority
+
+
+class _Call:
+    """In-flight call shared by the leader and its waiters"""
+
+    __slots__ = ("event", "result", "error", "priority")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.priority = PriorityBoost(get_request_priority())
+
+
+class SingleFlight:
+    """Thread-based single-flight group"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.executed = 0       # upstream executions
+        self.deduplicated = 0   # callers that joined an in-flight execution
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run fn once per key at a time
+
+        The first caller for a key executes fn, callers arriving while it runs
+        wait and receive the same result (or exception).
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.deduplicated += 1
+                call.priority.raise_to(get_request_priority())
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            with request_priority(call.priority):
+                call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get coalescing statistics"""
+        with self._lock:
+            return {
+                "executed": self.executed,
+                "deduplicated": self.deduplicated,
+                "in_flight": len(self._calls),
+            }
+
+
+class AsyncSingleFlight:
+    """Asyncio single-flight group, must be used from a single event loop"""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self._priorities: Dict[Hashable, PriorityBoost] = {}
+        self.executed = 0
+        self.deduplicated = 0
+
+    async def do(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """Await fn once per key at a time, concurrent callers share the result"""
+        future = self._calls.get(key)
+        if future is not None:
+            self.deduplicated += 1
+            self._priorities[key].raise_to(get_request_priority())
+            # shield so a cancelled waiter does not cancel the shared execution
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        priority = PriorityBoost(get_request_priority())
+        self._calls[key] = future
+        self._priorities[key] = priority
+        self.executed += 1
+        try:
+            with request_priority(priority):
+                result = await fn(*args, **kwargs)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so an exception without waiters is not reported as unhandled
+            future.exception()
+            raise
+        finally:
+            del self._calls[key]
+            del self._priorities[key]
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get coalescing statistics"""
+        return {
+            "executed": self.executed,
+            "deduplicated": self.deduplicated,
+            "in_flight": len(self._calls),
+        }
@@ -13,6 +13,9 @@ from services.scheduler import start_scheduler, setup_market_tasks, task_schedul
 
 logger = logging.getLogger(__name__)
 
+KLINE_ROLLUP_JOB_ID = "kline_rollup"
+KLINE_ROLLUP_INTERVAL_SECONDS = 20
+
 
 def initialize_services():
     """Initialize all services"""
@@ -25,7 +28,29 @@ def initialize_services():
         setup_market_tasks()
         logger.info("Market scheduled tasks have been set up")
 
-        # Start automatic cryptocurrency trading task via reset to ensure market data & proper job ID
+        # Offline runs replay recorded market data instead of talking to Hyperliquid
+        from services.replay_market_data import replay_source_from_env
+        replay_source = replay_source_from_env()
+        if replay_source is not None:
+            from services.market_data import set_market_data_source
+            set_market_data_source(replay_source)
+            logger.info("Replay market data source enabled, price hub not started")
+        else:
+            # Load market metadata in the background so symbol/status endpoints answer from memory
+            threading.Thread(target=_warm_up_market_index, name="markets_warmup", daemon=True).start()
+
+            # With several workers only the elected one feeds prices, the
+            # others read them from the shared price table
+            from services.shared_price_table import start_shared_price_table
+            if not start_shared_price_table(_start_price_feeds):
+                logger.info("Reading prices from the shared price table fed by the leader worker")
+
+        # Prefetch trading symbols in the background, trading jobs wait for it
+        from services.readiness import start_market_data_readiness
+        from services.trading_commands import AI_TRADING_SYMBOLS
+        start_market_data_readiness(AI_TRADING_SYMBOLS)
+
+        # Start automatic cryptocurrency trading task via reset, deferred until market data is ready
         from services.scheduler import reset_auto_trading_job
         try:
             reset_auto_trading_job()
@@ -42,15 +67,6 @@ def initialize_services():
             except Exception as e2:
                 logger.error(f"Failed to schedule fallback random trading task: {e2}")
         
-        # Add price cache cleanup task (every 2 minutes)
-        from services.price_cache import clear_expired_prices
-        task_scheduler.add_interval_task(
-            task_func=clear_expired_prices,
-            interval_seconds=120,  # Clean every 2 minutes
-            task_id="price_cache_cleanup"
-        )
-        logger.info("Price cache cleanup task started (2-minute interval)")
-        
         # Start margin monitoring for leveraged positions (every 5 seconds)
         start_margin_monitor(interval_seconds=5)
         logger.info("Margin monitor started (5-second interval)")
@@ -62,9 +78,67 @@ def initialize_services():
         raise
 
 
+def _start_price_feeds():
+    """Start the services that observe market data, run by the process that feeds the price cache"""
+    # Serve last-known prices (as stale) until the stream catches up
+    from services.price_persistence import restore_persisted_prices, start_price_persistence
+    restore_persisted_prices()
+    start_price_persistence()
+
+    # Keep every observed price on disk for audits and replays
+    from services.tick_log import start_tick_log
+    start_tick_log()
+
+    # Stream prices into the price cache so lookups are served from memory
+    from services.price_hub import start_price_hub
+    from services.trading_commands import AI_TRADING_SYMBOLS
+    start_price_hub(AI_TRADING_SYMBOLS)
+    logger.info("Price hub started")
+
+    # Serve 5m/15m/30m/1h/1d candles from rolled-up 1m candles
+    _start_kline_rollup()
+
+    # Keep crypto_klines filled with closed candles of all symbols for rankings
+    from services.kline_ingestion import KLINE_INGEST_INTERVAL_SECONDS, KLINE_INGEST_JOB_ID, run_kline_ingestion
+    task_scheduler.add_interval_task(run_kline_ingestion, KLINE_INGEST_INTERVAL_SECONDS, KLINE_INGEST_JOB_ID)
+    threading.Thread(target=run_kline_ingestion, name="kline_ingest_seed", daemon=True).start()
+
+
+def _start_kline_rollup():
+    """Roll up 1m candles of the trading symbols, and of any symbol whose candles are requested"""
+    from services.kline_rollup import kline_rollup
+    from services.market_data import refresh_kline_rollup
+    from services.trading_commands import AI_TRADING_SYMBOLS
+    for symbol in AI_TRADING_SYMBOLS:
+        kline_rollup.track(symbol, pinned=True)
+    task_scheduler.add_interval_task(refresh_kline_rollup, KLINE_ROLLUP_INTERVAL_SECONDS, KLINE_ROLLUP_JOB_ID)
+    threading.Thread(target=refresh_kline_rollup, name="kline_rollup_seed", daemon=True).start()
+
+
+def _warm_up_market_index():
+    """Load the Hyperliquid market index ahead of the first request"""
+    try:
+        from services.hyperliquid_market_data import hyperliquid_client
+        hyperliquid_client.get_market_index()
+    except Exception as e:
+        logger.warning(f"Market index warm-up failed, will retry on first request: {e}")
+
+
 def shutdown_services():
     """Shut down all services"""
     try:
+        from services.price_hub import stop_price_hub
+        stop_price_hub()
+
+        from services.price_persistence import stop_price_persistence
+        stop_price_persistence()
+
+        from services.tick_log import stop_tick_log
+        stop_tick_log()
+
+        from services.shared_price_table import shared_prices
+        shared_prices.stop()
+
         from services.scheduler import stop_scheduler
         stop_scheduler()
         logger.info("All services have been shut down")
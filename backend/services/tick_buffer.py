@@ -0,0 +1,141 @@
+"""
+In-memory tick history
+Fixed-size NumPy ring buffers per symbol holding every price the market data
+layer observes, so sparklines and short-horizon indicators can be computed
+from memory instead of fetching klines
+"""
+
+import os
+import time
+from threading import Lock
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+TICK_BUFFER_CAPACITY = int(os.environ.get("TICK_BUFFER_CAPACITY", "4096"))
+
+
+class TickRingBuffer:
+    """
+    Ring buffer of (timestamp, price) samples for one symbol
+
+    Every sample is written twice, at i and i + capacity, so the latest n
+    samples are always one contiguous slice and windows are returned as
+    read-only views without copying. Memory is fixed at
+    2 * capacity * 16 bytes. A view of n samples stays valid for the next
+    capacity - n appends; copy it if it must outlive that.
+    """
+
+    def __init__(self, capacity: int = TICK_BUFFER_CAPACITY):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self._timestamps = np.zeros(2 * capacity, dtype=np.float64)
+        self._prices = np.zeros(2 * capacity, dtype=np.float64)
+        self._written = 0
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return min(self._written, self.capacity)
+
+    def append(self, price: float, timestamp: Optional[float] = None):
+        """Record a sample, timestamps are kept non-decreasing"""
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._lock:
+            i = self._written % self.capacity
+            if self._written:
+                timestamp = max(timestamp, self._timestamps[(self._written - 1) % self.capacity])
+            self._timestamps[i] = self._timestamps[i + self.capacity] = timestamp
+            self._prices[i] = self._prices[i + self.capacity] = price
+            self._written += 1
+
+    def window(self, count: Optional[int] = None, since: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Latest samples as read-only (timestamps, prices) views, oldest first
+
+        Args:
+            count: At most this many samples, all retained samples when None
+            since: Only samples with timestamp >= since
+        """
+        written = self._written
+        size = min(written, self.capacity)
+        if count is not None:
+            size = min(size, max(count, 0))
+        end = written % self.capacity + self.capacity if written else 0
+        timestamps = self._timestamps[end - size:end]
+        prices = self._prices[end - size:end]
+        if since is not None:
+            start = int(np.searchsorted(timestamps, since, side="left"))
+            timestamps, prices = timestamps[start:], prices[start:]
+        timestamps.flags.writeable = False
+        prices.flags.writeable = False
+        return timestamps, prices
+
+    def latest(self) -> Optional[Tuple[float, float]]:
+        timestamps, prices = self.window(1)
+        if not len(prices):
+            return None
+        return float(timestamps[0]), float(prices[0])
+
+
+class TickBufferRegistry:
+    """Tick ring buffers per (symbol, market), created on first tick"""
+
+    def __init__(self, capacity: int = TICK_BUFFER_CAPACITY):
+        self.capacity = capacity
+        self._buffers: Dict[Tuple[str, str], TickRingBuffer] = {}
+        self._lock = Lock()
+
+    def get(self, symbol: str, market: str) -> Optional[TickRingBuffer]:
+        return self._buffers.get((symbol, market))
+
+    def record(self, symbol: str, market: str, price: float, timestamp: Optional[float] = None):
+        key = (symbol, market)
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            with self._lock:
+                buffer = self._buffers.get(key)
+                if buffer is None:
+                    buffer = self._buffers[key] = TickRingBuffer(self.capacity)
+        buffer.append(price, timestamp)
+
+    def window(self, symbol: str, market: str, count: Optional[int] = None,
+               since: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        buffer = self._buffers.get((symbol, market))
+        if buffer is None:
+            empty = np.empty(0, dtype=np.float64)
+            return empty, empty
+        return buffer.window(count, since)
+
+    def clear(self):
+        with self._lock:
+            self._buffers.clear()
+
+    def get_stats(self) -> Dict:
+        buffers = dict(self._buffers)
+        return {
+            "symbols": len(buffers),
+            "capacity_per_symbol": self.capacity,
+            "bytes_per_symbol": 2 * self.capacity * 2 * np.dtype(np.float64).itemsize,
+            "samples": {f"{symbol}.{market}": len(buffer) for (symbol, market), buffer in buffers.items()},
+        }
+
+
+# Global tick history, fed by cache_price
+tick_buffers = TickBufferRegistry()
+
+
+def record_tick(symbol: str, market: str, price: float, timestamp: Optional[float] = None):
+    """Record an observed price"""
+    tick_buffers.record(symbol, market, price, timestamp)
+
+
+def get_recent_ticks(symbol: str, market: str = "CRYPTO", count: Optional[int] = None,
+                     since: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Get recent (timestamps, prices) views for a symbol, empty when none were observed"""
+    return tick_buffers.window(symbol, market, count, since)
+
+
+def get_tick_buffer_stats() -> Dict:
+    """Get tick history statistics"""
+    return tick_buffers.get_stats()
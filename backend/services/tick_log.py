@@ -0,0 +1,283 @@
+"""
+Binary tick log
+Append-only record of every price the system observed, so fills and
+liquidations can be audited and sessions replayed after the price cache has
+long forgotten them. One file per UTC day of fixed-width records
+(symbol id, timestamp, price) that readers map into memory.
+"""
+
+import datetime
+import json
+import logging
+import os
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .metrics import registry
+
+logger = logging.getLogger(__name__)
+
+TICK_LOG_DIR = os.environ.get("TICK_LOG_DIR", "./tick_log")
+
+MAGIC = b"TICKLOG1"
+RECORD_DTYPE = np.dtype([("symbol_id", "<u4"), ("timestamp", "<f8"), ("price", "<f8")])  # 20 bytes, packed
+SYMBOLS_FILE = "symbols.json"
+
+_RECORDS = registry.counter("tick_log_records_total", "Ticks written to the binary tick log")
+_DROPPED = registry.counter("tick_log_dropped_total", "Ticks dropped because the write buffer was full")
+
+
+def _day_of(timestamp: float) -> str:
+    return datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc).strftime("%Y%m%d")
+
+
+def _day_path(directory: str, day: str) -> str:
+    return os.path.join(directory, f"ticks-{day}.bin")
+
+
+def _load_symbols(directory: str) -> List[str]:
+    try:
+        with open(os.path.join(directory, SYMBOLS_FILE)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return []
+
+
+class TickLogWriter:
+    """Buffered writer, appends are memory-only and a background thread writes them out"""
+
+    def __init__(self, directory: str = TICK_LOG_DIR, flush_interval: float = 1.0, max_pending: int = 100_000):
+        """
+        Args:
+            directory: Directory holding the daily files and the symbol table
+            flush_interval: Seconds between writes of buffered ticks
+            max_pending: Buffered ticks kept while writes fail, newer ones are dropped
+        """
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending: List[Tuple[int, float, float]] = []
+        self._symbol_ids: Dict[str, int] = {}
+        self._symbols: List[str] = []
+        self._symbols_written = 0
+
+    @property
+    def running(self) -> bool:
+        return self.thread is not None and self.thread.is_alive()
+
+    def append(self, symbol: str, market: str, price: float, timestamp: float):
+        """Buffer a tick, a no-op while the writer is not running"""
+        if self.thread is None:
+            return
+        key = f"{symbol}.{market}"
+        with self._lock:
+            symbol_id = self._symbol_ids.get(key)
+            if symbol_id is None:
+                symbol_id = self._symbol_ids[key] = len(self._symbols)
+                self._symbols.append(key)
+            if len(self._pending) >= self.max_pending:
+                _DROPPED.inc()
+                return
+            self._pending.append((symbol_id, timestamp, price))
+
+    def flush(self):
+        """Write buffered ticks to their daily files"""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, []
+                symbols = list(self._symbols)
+            if not pending:
+                return
+
+            records = np.array(pending, dtype=RECORD_DTYPE)
+            days = np.array([_day_of(ts) for ts in records["timestamp"]])
+            unwritten = np.ones(len(records), dtype=bool)
+            try:
+                # The symbol table goes first so every id on disk can be resolved
+                if len(symbols) > self._symbols_written:
+                    tmp_path = os.path.join(self.directory, f"{SYMBOLS_FILE}.tmp")
+                    with open(tmp_path, "w") as f:
+                        json.dump(symbols, f)
+                    os.replace(tmp_path, os.path.join(self.directory, SYMBOLS_FILE))
+                    self._symbols_written = len(symbols)
+
+                for day in np.unique(days):
+                    self._append_day(day, records[days == day])
+                    unwritten &= days != day
+            except OSError as e:
+                logger.warning(f"Failed to write tick log to {self.directory}: {e}")
+                with self._lock:
+                    # Keep the unwritten ticks for the next attempt, within the buffer bound
+                    retry = [pending[i] for i in np.flatnonzero(unwritten)]
+                    self._pending = (retry + self._pending)[-self.max_pending:]
+            _RECORDS.inc(amount=int(len(records) - unwritten.sum()))
+
+    def _append_day(self, day: str, records: np.ndarray):
+        """Append records to a day file, leaving it on a record boundary even when the write fails"""
+        path = _day_path(self.directory, day)
+        with open(path, "r+b" if os.path.exists(path) else "w+b") as f:
+            size = f.seek(0, os.SEEK_END)
+            if size < len(MAGIC):
+                f.truncate(0)
+                f.seek(0)
+                f.write(MAGIC)
+                size = len(MAGIC)
+            else:
+                # Drop a torn trailing record left by a crash before appending behind it
+                size = len(MAGIC) + (size - len(MAGIC)) // RECORD_DTYPE.itemsize * RECORD_DTYPE.itemsize
+                f.truncate(size)
+                f.seek(size)
+            try:
+                f.write(records.tobytes())
+                f.flush()
+            except OSError:
+                try:
+                    f.truncate(size)
+                except OSError:
+                    pass
+                raise
+
+    def start(self):
+        """Start the background writer, continuing the existing symbol table"""
+        if self.running:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        with self._lock:
+            self._symbols = _load_symbols(self.directory)
+            self._symbol_ids = {key: i for i, key in enumerate(self._symbols)}
+            self._symbols_written = len(self._symbols)
+        self._stop_event.clear()
+        self.thread = threading.Thread(target=self._run, name="tick_log_writer", daemon=True)
+        self.thread.start()
+        logger.info(f"Tick log writing to {self.directory}")
+
+    def stop(self):
+        """Stop the writer after a final flush"""
+        if self.thread is None:
+            return
+        self._stop_event.set()
+        self.thread.join(timeout=5)
+        self.thread = None
+        self.flush()
+
+    def _run(self):
+        while not self._stop_event.wait(timeout=self.flush_interval):
+            self.flush()
+
+
+class TickLogReader:
+    """Memory-mapped access to the daily tick files for audit and replay"""
+
+    def __init__(self, directory: str = TICK_LOG_DIR):
+        self.directory = directory
+        self.symbols = _load_symbols(directory)
+
+    def days(self) -> List[str]:
+        """Days with a tick file, oldest first (YYYYMMDD)"""
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return sorted(name[6:14] for name in names if name.startswith("ticks-") and name.endswith(".bin"))
+
+    def read_day(self, day: str) -> np.ndarray:
+        """All records of a day as a read-only memory map, a torn trailing record is ignored"""
+        path = _day_path(self.directory, day)
+        size = os.path.getsize(path) - len(MAGIC)
+        count = size // RECORD_DTYPE.itemsize if size > 0 else 0
+        if count == 0:
+            return np.empty(0, dtype=RECORD_DTYPE)
+        return np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=len(MAGIC), shape=(count,))
+
+    def _symbol_id(self, symbol: str, market: str) -> Optional[int]:
+        try:
+            return self.symbols.index(f"{symbol}.{market}")
+        except ValueError:
+            return None
+
+    def iter_ticks(self, start: Optional[float] = None, end: Optional[float] = None,
+                   symbols: Optional[List[str]] = None, market: str = "CRYPTO") -> Iterator[Tuple[float, str, str, float]]:
+        """
+        Yield (timestamp, symbol, market, price) in write order
+
+        Args:
+            start: Only ticks at or after this time (seconds)
+            end: Only ticks before this time (seconds)
+            symbols: Restrict to these symbols of market, all symbols when None
+        """
+        wanted = None
+        if symbols is not None:
+            wanted = [i for i in (self._symbol_id(s, market) for s in symbols) if i is not None]
+            if not wanted:
+                return
+
+        first_day = _day_of(start) if start is not None else None
+        last_day = _day_of(end) if end is not None else None
+        for day in self.days():
+            if (first_day and day < first_day) or (last_day and day > last_day):
+                continue
+            records = self.read_day(day)
+            mask = np.ones(len(records), dtype=bool)
+            if start is not None:
+                mask &= records["timestamp"] >= start
+            if end is not None:
+                mask &= records["timestamp"] < end
+            if wanted is not None:
+                mask &= np.isin(records["symbol_id"], wanted)
+            for symbol_id, timestamp, price in records[mask].tolist():
+                symbol, _, symbol_market = self.symbols[symbol_id].rpartition(".")
+                yield timestamp, symbol, symbol_market, price
+
+    def price_at(self, symbol: str, market: str, timestamp: float,
+                 lookback: Optional[float] = None) -> Optional[Tuple[float, float]]:
+        """
+        Last (timestamp, price) observed for a symbol at or before timestamp, for audits
+
+        Args:
+            lookback: Only consider ticks at most this many seconds before timestamp, all days when None
+        """
+        symbol_id = self._symbol_id(symbol, market)
+        if symbol_id is None:
+            return None
+        day = _day_of(timestamp)
+        first_day = _day_of(timestamp - lookback) if lookback is not None else ""
+        for candidate in reversed([d for d in self.days() if first_day <= d <= day]):
+            records = self.read_day(candidate)
+            mask = (records["symbol_id"] == symbol_id) & (records["timestamp"] <= timestamp)
+            if lookback is not None:
+                mask &= records["timestamp"] >= timestamp - lookback
+            matches = records[mask]
+            if len(matches):
+                last = matches[np.argmax(matches["timestamp"])]
+                return float(last["timestamp"]), float(last["price"])
+        return None
+
+    def replay_ticks(self, start: Optional[float] = None, end: Optional[float] = None,
+                     market: str = "CRYPTO") -> List[Tuple[float, str, float]]:
+        """Ticks of market as (timestamp, symbol, price), the format replay sources load"""
+        return [(ts, symbol, price) for ts, symbol, m, price in self.iter_ticks(start, end) if m == market]
+
+
+# Global tick log writer, fed by cache_price
+tick_log = TickLogWriter()
+
+
+def log_tick(symbol: str, market: str, price: float, timestamp: float):
+    """Append a tick to the log if it is running"""
+    tick_log.append(symbol, market, price, timestamp)
+
+
+def start_tick_log():
+    """Start writing the global tick log"""
+    tick_log.start()
+
+
+def stop_tick_log():
+    """Flush and stop the global tick log"""
+    tick_log.stop()
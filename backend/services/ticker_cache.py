@@ -0,0 +1,81 @@
+"""
+Ticker cache
+Keeps the full normalized ticker per symbol (bid/ask/mark/volume/funding) so
+every consumer is served from the one fetch that also yields the last price
+"""
+
+import time
+from threading import Lock
+from typing import Dict, NamedTuple, Optional, Tuple
+
+
+class Ticker(NamedTuple):
+    """Normalized ticker record, fields the exchange does not report are None"""
+    symbol: str
+    last: float
+    bid: Optional[float] = None
+    ask: Optional[float] = None
+    mark: Optional[float] = None
+    index: Optional[float] = None
+    volume_24h: Optional[float] = None          # quote (USD) notional
+    change_24h_percent: Optional[float] = None
+    funding_rate: Optional[float] = None
+    open_interest: Optional[float] = None
+    timestamp: Optional[float] = None           # exchange time in seconds
+
+    @property
+    def spread(self) -> Optional[float]:
+        if self.bid is None or self.ask is None:
+            return None
+        return self.ask - self.bid
+
+    @property
+    def mark_or_last(self) -> float:
+        """Mark price when reported, used for margin valuation"""
+        return self.mark if self.mark else self.last
+
+    def to_dict(self) -> Dict:
+        data = self._asdict()
+        data["spread"] = self.spread
+        return data
+
+
+class TickerCache:
+    """
+    In-memory ticker cache with TTL
+
+    Reads are lock-free dict lookups of immutable (Ticker, timestamp) tuples,
+    writes take a lock. Entries past the TTL are simply not returned and get
+    replaced by the next fetch.
+    """
+
+    def __init__(self, ttl_seconds: int = 30):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[Tuple[str, str], Tuple[Ticker, float]] = {}
+        self._lock = Lock()
+
+    def get(self, symbol: str, market: str, max_age: Optional[float] = None) -> Optional[Ticker]:
+        """Get cached ticker if at most max_age old (defaults to the TTL)"""
+        entry = self._entries.get((symbol, market))
+        if entry is None:
+            return None
+        if time.time() - entry[1] >= (self.ttl_seconds if max_age is None else max_age):
+            return None
+        return entry[0]
+
+    def get_age(self, symbol: str, market: str) -> Optional[float]:
+        """Seconds since the cached ticker was stored, None when not cached"""
+        entry = self._entries.get((symbol, market))
+        return time.time() - entry[1] if entry is not None else None
+
+    def set(self, market: str, ticker: Ticker):
+        with self._lock:
+            self._entries[(ticker.symbol, market)] = (ticker, time.time())
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Global ticker cache instance
+ticker_cache = TickerCache(ttl_seconds=30)
@@ -4,7 +4,7 @@ Trading Commands Service - Handles order execution and trading logic
 import logging
 import random
 from decimal import Decimal
-from typing import Dict, Optional, Tuple, List
+from typing import Optional, Tuple, List
 
 from sqlalchemy.orm import Session
 
@@ -12,6 +12,8 @@ from database.connection import SessionLocal
 from database.models import Position, Account
 from services.asset_calculator import calc_positions_value
 from services.market_data import get_last_price
+from services.price_snapshot import PriceSnapshot, capture_price_snapshot
+from services.rate_limiter import Priority, request_priority
 from services.order_matching import create_order, check_and_execute_order
 from services.order_executor_leverage import place_and_execute_crypto
 from services.ai_decision_service import (
@@ -28,24 +30,37 @@ logger = logging.getLogger(__name__)
 AI_TRADING_SYMBOLS: List[str] = ["BTC", "ETH", "SOL", "BNB", "XRP", "DOGE"]
 
 
-def _get_market_prices(symbols: List[str]) -> Dict[str, float]:
-    """Get latest prices for given symbols"""
-    prices = {}
-    for symbol in symbols:
-        try:
-            price = float(get_last_price(symbol, "CRYPTO"))
-            if price > 0:
-                prices[symbol] = price
-        except Exception as err:
-            logger.warning(f"Failed to get price for {symbol}: {err}")
-    return prices
+def _get_market_prices(symbols: List[str]) -> PriceSnapshot:
+    """Capture one price snapshot for given symbols, empty when prices are unavailable"""
+    try:
+        with request_priority(Priority.AI):
+            return capture_price_snapshot(symbols, "CRYPTO", max_age="trading")
+    except Exception as err:
+        logger.warning(f"Failed to get prices for {symbols}: {err}")
+        return PriceSnapshot({}, "CRYPTO")
+
+
+def _held_symbols(db: Session, accounts: List[Account]) -> List[str]:
+    """Symbols with open CRYPTO positions in any of the accounts"""
+    rows = (
+        db.query(Position.symbol)
+        .filter(
+            Position.account_id.in_([account.id for account in accounts]),
+            Position.market == "CRYPTO",
+            Position.quantity > 0,
+        )
+        .distinct()
+        .all()
+    )
+    return [row[0] for row in rows]
 
 
 def _select_side(db: Session, account: Account, symbol: str, max_value: float) -> Optional[Tuple[str, int]]:
     """Select random trading side and quantity for legacy random trading"""
     market = "CRYPTO"
     try:
-        price = float(get_last_price(symbol, market))
+        with request_priority(Priority.AI):
+            price = float(get_last_price(symbol, market, max_age="trading"))
     except Exception as err:
         logger.warning("Cannot get price for %s: %s", symbol, err)
         return None
@@ -89,8 +104,9 @@ def place_ai_driven_crypto_order(max_ratio: float = 0.2) -> None:
             logger.debug("No available accounts, skipping AI trading")
             return
 
-        # Get latest market prices once for all accounts
-        prices = _get_market_prices(AI_TRADING_SYMBOLS)
+        # Capture prices once for all accounts; the same snapshot values
+        # portfolios, feeds the AI prompt and prices the resulting orders
+        prices = _get_market_prices(AI_TRADING_SYMBOLS + _held_symbols(db, accounts))
         if not prices:
             logger.warning("Failed to fetch market prices, skipping AI trading")
             return
@@ -101,14 +117,16 @@ def place_ai_driven_crypto_order(max_ratio: float = 0.2) -> None:
                 logger.info(f"Processing AI trading for account: {account.name}")
                 
                 # Get portfolio data for this account
-                portfolio = _get_portfolio_data(db, account)
+                portfolio = _get_portfolio_data(db, account, prices)
                 
                 if portfolio['total_assets'] <= 0:
                     logger.debug(f"Account {account.name} has non-positive total assets, skipping")
                     continue
 
                 # Call AI for trading decision
-                decision = call_ai_for_decision(account, portfolio, prices)
+                decision = call_ai_for_decision(
+                    account, portfolio, {s: prices[s] for s in AI_TRADING_SYMBOLS if s in prices}
+                )
                 if not decision or not isinstance(decision, dict):
                     logger.warning(f"Failed to get AI decision for {account.name}, skipping")
                     continue
@@ -255,7 +273,8 @@ def place_ai_driven_crypto_order(max_ratio: float = 0.2) -> None:
                         order_type="MARKET",
                         price=None,
                         quantity=quantity,
-                        leverage=leverage
+                        leverage=leverage,
+                        snapshot=prices
                     )
                     
                     logger.info(